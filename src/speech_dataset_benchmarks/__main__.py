@@ -0,0 +1,75 @@
+import json
+import platform
+import sys
+from argparse import ArgumentParser
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Optional
+
+from speech_dataset_benchmarks.benchmarks import BENCHMARKS, run_benchmark
+from speech_dataset_benchmarks.corpora import DEFAULT_SEED
+from speech_dataset_converter_cli.argparse_helper import (get_optional, parse_path,
+                                                          parse_positive_integer)
+from speech_dataset_converter_cli.utils import LINK_MODE_COPY, LINK_MODES
+
+RESULTS_VERSION = 2
+
+
+def get_parser() -> ArgumentParser:
+  parser = ArgumentParser(
+    prog="python -m speech_dataset_benchmarks",
+    description="This command measures duration, files per second, peak RSS and read/write calls of `parse_dataset` and all converters on synthetic corpora and writes the results as JSON.",
+  )
+  parser.add_argument("-o", "--output", type=parse_path, metavar="FILE", default=Path("benchmark-results.json"),
+                      help="path of the JSON file for the results")
+  parser.add_argument("-b", "--benchmarks", type=str, nargs="+", choices=list(BENCHMARKS), metavar="NAME", default=list(BENCHMARKS),
+                      help=f"benchmarks which should be run; choices: {', '.join(BENCHMARKS)}")
+  parser.add_argument("-n", "--files", type=parse_positive_integer, metavar="N", default=1000,
+                      help="number of utterances of each synthetic corpus")
+  parser.add_argument("-r", "--repeats", type=parse_positive_integer, metavar="N", default=3,
+                      help="number of measurements per benchmark")
+  parser.add_argument("-l", "--link-mode", type=str, choices=LINK_MODES, metavar="MODE", default=LINK_MODE_COPY,
+                      help="how the converters place the audio files")
+  parser.add_argument("--seed", type=int, metavar="SEED", default=DEFAULT_SEED,
+                      help="seed for the random durations and texts")
+  parser.add_argument("-w", "--work-directory", type=get_optional(parse_path), metavar="DIRECTORY", default=None,
+                      help="directory for the corpora and outputs; defaults to a temporary directory which is removed afterwards")
+  return parser
+
+
+def run_benchmarks(names: List[str], work_directory: Path, file_count: int, repeats: int, link_mode: str, seed: int) -> Dict[str, Any]:
+  results = []
+  for name in names:
+    utterance_count, measurements = run_benchmark(name, work_directory, file_count, repeats, link_mode, seed)
+    for repeat_nr, measurement in enumerate(measurements):
+      print(f"{name} #{repeat_nr + 1}: {utterance_count} files in {measurement['duration_s']:.3f}s ({measurement['files_per_s']:.1f} files/s)")
+      results.append({"benchmark": name, "repeat": repeat_nr, **measurement})
+  return {
+    "version": RESULTS_VERSION,
+    "created": datetime.now().isoformat(),
+    "python": platform.python_version(),
+    "platform": platform.platform(),
+    "files": file_count,
+    "link_mode": link_mode,
+    "seed": seed,
+    "results": results,
+  }
+
+
+def main(args: Optional[List[str]] = None) -> None:
+  ns = get_parser().parse_args(args)
+  if ns.work_directory is None:
+    with TemporaryDirectory(prefix="speech-dataset-benchmarks-") as work_directory:
+      results = run_benchmarks(ns.benchmarks, Path(work_directory), ns.files, ns.repeats, ns.link_mode, ns.seed)
+  else:
+    results = run_benchmarks(ns.benchmarks, ns.work_directory, ns.files, ns.repeats, ns.link_mode, ns.seed)
+
+  ns.output.parent.mkdir(parents=True, exist_ok=True)
+  with open(ns.output, mode="w", encoding="UTF-8") as f:
+    json.dump(results, f, indent=2)
+  print(f"Saved results to: \"{ns.output.absolute()}\".")
+
+
+if __name__ == "__main__":
+  main(sys.argv[1:])
@@ -0,0 +1,121 @@
+import os
+from logging import getLogger
+from multiprocessing import get_context
+from pathlib import Path
+from shutil import rmtree
+from typing import Callable, Dict, Tuple
+
+from speech_dataset_benchmarks.corpora import (DEFAULT_SEED, create_generic_corpus,
+                                               create_l2arctic_corpus, create_ljs_corpus,
+                                               create_thchs_cslt_corpus, create_thchs_slr_corpus)
+from speech_dataset_benchmarks.measure import Measurement, measure
+from speech_dataset_converter_cli import (convert_l2arctic, convert_ljs, convert_thchs_cslt,
+                                          convert_thchs_slr)
+from speech_dataset_converter_cli.utils import LINK_MODE_COPY
+from speech_dataset_parser.parse import DEFAULT_N_DIGITS, DEFAULT_TIER_NAME, parse_dataset
+from speech_dataset_parser.scan import scan_dataset
+
+# progress bars are not shown in the benchmark processes
+TQDM_DISABLE_VAR = "TQDM_DISABLE"
+
+# creates the corpus (directory, number of files, seed) and returns the number of utterances
+CreateCorpus = Callable[[Path, int, int], int]
+# processes the corpus (corpus directory, output directory, link mode) and returns whether it was successful
+RunBenchmark = Callable[[Path, Path, str], bool]
+
+
+def run_parse_dataset(directory: Path, output_directory: Path, link_mode: str) -> bool:
+  for _ in parse_dataset(directory, DEFAULT_TIER_NAME, silent=True):
+    pass
+  return True
+
+
+def run_scan_dataset(directory: Path, output_directory: Path, link_mode: str) -> bool:
+  scan_dataset(directory, silent=True)
+  return True
+
+
+def run_convert_ljs(directory: Path, output_directory: Path, link_mode: str) -> bool:
+  logger = getLogger(__name__)
+  return convert_ljs.convert_to_generic(directory, link_mode, DEFAULT_N_DIGITS, DEFAULT_TIER_NAME, output_directory,
+                                        "UTF-8", False, logger, logger)
+
+
+def run_convert_l2arctic(directory: Path, output_directory: Path, link_mode: str) -> bool:
+  logger = getLogger(__name__)
+  return convert_l2arctic.convert_to_generic(directory, link_mode, DEFAULT_N_DIGITS, DEFAULT_TIER_NAME, output_directory,
+                                             "UTF-8", logger, logger)
+
+
+def run_convert_thchs_slr(directory: Path, output_directory: Path, link_mode: str) -> bool:
+  logger = getLogger(__name__)
+  return convert_thchs_slr.convert_to_generic(directory, link_mode, DEFAULT_N_DIGITS, DEFAULT_TIER_NAME, output_directory,
+                                              "UTF-8", False, logger, logger)
+
+
+def run_convert_thchs_cslt(directory: Path, output_directory: Path, link_mode: str) -> bool:
+  logger = getLogger(__name__)
+  return convert_thchs_cslt.convert_to_generic(directory, link_mode, DEFAULT_N_DIGITS, DEFAULT_TIER_NAME, False,
+                                               output_directory, "UTF-8", False, logger, logger)
+
+
+BENCHMARKS: Dict[str, Tuple[CreateCorpus, RunBenchmark]] = {
+  "parse_dataset": (create_generic_corpus, run_parse_dataset),
+  "scan_dataset": (create_generic_corpus, run_scan_dataset),
+  "convert_ljs": (create_ljs_corpus, run_convert_ljs),
+  "convert_l2arctic": (create_l2arctic_corpus, run_convert_l2arctic),
+  "convert_thchs_slr": (create_thchs_slr_corpus, run_convert_thchs_slr),
+  "convert_thchs_cslt": (create_thchs_cslt_corpus, run_convert_thchs_cslt),
+}
+
+
+def measure_benchmark(name: str, directory: Path, output_directory: Path, link_mode: str, file_count: int) -> Measurement:
+  _, run = BENCHMARKS[name]
+
+  def method() -> int:
+    if not run(directory, output_directory, link_mode):
+      raise ValueError(f"Benchmark '{name}' was not successful!")
+    return file_count
+
+  return measure(method)
+
+
+def run_benchmark(name: str, work_directory: Path, file_count: int, repeats: int = 1, link_mode: str = LINK_MODE_COPY, seed: int = DEFAULT_SEED) -> Tuple[int, Tuple[Measurement, ...]]:
+  """
+  Creates the corpus of the benchmark in `work_directory` and measures each repetition in a fresh process, so that the peak RSS only contains this repetition.
+  Returns the number of utterances of the corpus and the measurements.
+  """
+  if name not in BENCHMARKS:
+    raise ValueError(f"Parameter 'name': Value needs to be one of {', '.join(BENCHMARKS)}!")
+  create_corpus, _ = BENCHMARKS[name]
+  corpus_directory = work_directory / name / "corpus"
+  if corpus_directory.exists():
+    rmtree(corpus_directory)
+  utterance_count = create_corpus(corpus_directory, file_count, seed)
+
+  context = get_context("spawn")
+  measurements = []
+  for repeat_nr in range(repeats):
+    output_directory = work_directory / name / f"output-{repeat_nr}"
+    if output_directory.exists():
+      rmtree(output_directory)
+    # tqdm reads the variable on import, therefore it is set before the process is started
+    previous_tqdm_disable = os.environ.get(TQDM_DISABLE_VAR)
+    os.environ[TQDM_DISABLE_VAR] = "1"
+    try:
+      pool = context.Pool(processes=1)
+    finally:
+      if previous_tqdm_disable is None:
+        del os.environ[TQDM_DISABLE_VAR]
+      else:
+        os.environ[TQDM_DISABLE_VAR] = previous_tqdm_disable
+    try:
+      measurement = pool.apply(measure_benchmark, (name, corpus_directory,
+                               output_directory, link_mode, utterance_count))
+    finally:
+      pool.close()
+      pool.join()
+    measurements.append(measurement)
+    if output_directory.exists():
+      rmtree(output_directory)
+  return utterance_count, tuple(measurements)
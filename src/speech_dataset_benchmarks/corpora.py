@@ -0,0 +1,131 @@
+import wave
+from pathlib import Path
+from random import Random
+from typing import List
+
+from speech_dataset_converter_cli.grid_writer import get_grid_text, write_grid_text
+from speech_dataset_parser.parse import PARTS_SEP
+from speech_dataset_parser.types import GENDER_FEMALE, GENDER_MALE
+
+DEFAULT_SEED = 1234
+SAMPLE_RATE = 16000
+MIN_DURATION_S = 0.5
+MAX_DURATION_S = 2.0
+# number of speakers in the README of L2-ARCTIC which are read by the converter
+L2ARCTIC_SPEAKER_COUNT = 24
+# maximum number of utterances per speaker in THCHS-30
+THCHS_FILES_PER_SPEAKER = 250
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def write_silent_wav(path: Path, duration_s: float, sample_rate: int = SAMPLE_RATE) -> None:
+  path.parent.mkdir(parents=True, exist_ok=True)
+  with wave.open(str(path), "wb") as wav:
+    wav.setnchannels(1)
+    wav.setsampwidth(2)
+    wav.setframerate(sample_rate)
+    wav.writeframes(b"\x00\x00" * int(duration_s * sample_rate))
+
+
+def get_random_duration_s(random: Random) -> float:
+  return round(random.uniform(MIN_DURATION_S, MAX_DURATION_S), 3)
+
+
+def get_random_text(random: Random, min_words: int = 3, max_words: int = 12) -> str:
+  words = (
+    "".join(random.choice(LETTERS) for _ in range(random.randint(1, 8)))
+    for _ in range(random.randint(min_words, max_words))
+  )
+  return " ".join(words).capitalize() + "."
+
+
+def get_random_chinese_text(random: Random, min_words: int = 3, max_words: int = 12) -> str:
+  words = (
+    "".join(chr(random.randint(0x4E00, 0x9FA5)) for _ in range(random.randint(1, 3)))
+    for _ in range(random.randint(min_words, max_words))
+  )
+  return " ".join(words)
+
+
+def get_speaker_count(file_count: int, files_per_speaker: int) -> int:
+  return max(1, -(-file_count // files_per_speaker))
+
+
+def create_generic_corpus(directory: Path, file_count: int, seed: int = DEFAULT_SEED, files_per_speaker: int = 100) -> int:
+  """creates a generic dataset with silent audio files and one tier named 'transcription'; returns the number of utterances"""
+  random = Random(seed)
+  speaker_count = get_speaker_count(file_count, files_per_speaker)
+  z_fill = len(str(files_per_speaker))
+  for file_nr in range(file_count):
+    speaker_nr, utterance_nr = divmod(file_nr, files_per_speaker)
+    gender = GENDER_MALE if speaker_nr % 2 == 0 else GENDER_FEMALE
+    speaker_dir = directory / f"S{str(speaker_nr).zfill(len(str(speaker_count)))}{PARTS_SEP}{gender}{PARTS_SEP}eng"
+    stem = str(utterance_nr + 1).zfill(z_fill)
+    duration_s = get_random_duration_s(random)
+    write_silent_wav(speaker_dir / f"{stem}.wav", duration_s)
+    grid_text = get_grid_text(get_random_text(random), duration_s, "transcription", 16)
+    write_grid_text(speaker_dir / f"{stem}.TextGrid", grid_text, "UTF-8")
+  return file_count
+
+
+def create_ljs_corpus(directory: Path, file_count: int, seed: int = DEFAULT_SEED) -> int:
+  """creates the structure of LJ Speech; returns the number of utterances"""
+  random = Random(seed)
+  lines: List[str] = []
+  for file_nr in range(1, file_count + 1):
+    basename = f"LJ{str((file_nr - 1) // 1000 + 1).zfill(3)}-{str(file_nr).zfill(4)}"
+    write_silent_wav(directory / "wavs" / f"{basename}.wav", get_random_duration_s(random))
+    text = get_random_text(random)
+    lines.append(f"{basename}|{text}|{text}")
+  (directory / "metadata.csv").write_text("\n".join(lines) + "\n", "UTF-8")
+  return file_count
+
+
+def create_l2arctic_corpus(directory: Path, file_count: int, seed: int = DEFAULT_SEED) -> int:
+  """creates the structure of L2-ARCTIC with all 24 speakers of the README; returns the number of utterances"""
+  random = Random(seed)
+  files_per_speaker = get_speaker_count(file_count, L2ARCTIC_SPEAKER_COUNT)
+  # the converter reads the speaker table from line 35 to 58
+  readme_lines = ["" for _ in range(34)]
+  for speaker_nr in range(L2ARCTIC_SPEAKER_COUNT):
+    speaker_name = f"S{str(speaker_nr).zfill(2)}"
+    gender = "M" if speaker_nr % 2 == 0 else "F"
+    readme_lines.append(f"|{speaker_name}|{gender}|Arabic|{files_per_speaker}|{files_per_speaker}|")
+    for utterance_nr in range(1, files_per_speaker + 1):
+      stem = f"arctic_a{str(utterance_nr).zfill(4)}"
+      write_silent_wav(directory / speaker_name / "wav" / f"{stem}.wav", get_random_duration_s(random))
+      transcript_path = directory / speaker_name / "transcript" / f"{stem}.txt"
+      transcript_path.parent.mkdir(parents=True, exist_ok=True)
+      transcript_path.write_text(get_random_text(random)[:-1], "UTF-8")
+  (directory / "README.md").write_text("\n".join(readme_lines) + "\n", "UTF-8")
+  return files_per_speaker * L2ARCTIC_SPEAKER_COUNT
+
+
+def create_thchs_slr_corpus(directory: Path, file_count: int, seed: int = DEFAULT_SEED) -> int:
+  """creates the structure of THCHS-30 (OpenSLR version); returns the number of utterances"""
+  random = Random(seed)
+  data_dir = directory / "data"
+  for file_nr in range(file_count):
+    speaker_nr, utterance_nr = divmod(file_nr, THCHS_FILES_PER_SPEAKER)
+    name = f"A{speaker_nr + 1}_{utterance_nr + 1}"
+    write_silent_wav(data_dir / f"{name}.wav", get_random_duration_s(random))
+    (data_dir / f"{name}.wav.trn").write_text(f"{get_random_chinese_text(random)}\nlü4 shi4\n", "UTF-8")
+  return file_count
+
+
+def create_thchs_cslt_corpus(directory: Path, file_count: int, seed: int = DEFAULT_SEED) -> int:
+  """creates the structure of THCHS-30 (CSLT version) with all utterances in the train set; returns the number of utterances"""
+  random = Random(seed)
+  lines: List[str] = []
+  for file_nr in range(file_count):
+    speaker_nr, utterance_nr = divmod(file_nr, THCHS_FILES_PER_SPEAKER)
+    speaker_name = f"A{speaker_nr + 1}"
+    name = f"{speaker_name}_{utterance_nr + 1}"
+    write_silent_wav(directory / "wav" / "train" / speaker_name / f"{name}.wav", get_random_duration_s(random))
+    lines.append(f"{name} {get_random_chinese_text(random)}")
+  trans_dir = directory / "doc" / "trans"
+  trans_dir.mkdir(parents=True, exist_ok=True)
+  (trans_dir / "train.word.txt").write_text("\n".join(lines) + "\n", "UTF-8")
+  (trans_dir / "test.word.txt").write_text("", "UTF-8")
+  (directory / "wav" / "test").mkdir(parents=True, exist_ok=True)
+  return file_count
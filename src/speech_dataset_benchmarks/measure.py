@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, Optional, Union
+
+try:
+  import resource
+except ImportError:
+  # not available on Windows
+  resource = None
+
+PROC_IO_PATH = Path("/proc/self/io")
+
+Measurement = Dict[str, Optional[Union[int, float]]]
+
+
+def get_peak_rss_bytes() -> Optional[int]:
+  """returns the maximum resident set size of the current process so far"""
+  if resource is None:
+    return None
+  peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  # the value is given in bytes on macOS and in kilobytes on Linux and BSD
+  if sys.platform == "darwin":
+    return peak_rss
+  return peak_rss * 1024
+
+
+def get_io_counters() -> Dict[str, int]:
+  """returns the I/O counters of the current process (including all its threads), e.g., 'syscr' and 'syscw'; they are only available on Linux"""
+  try:
+    content = PROC_IO_PATH.read_text("ASCII")
+  except OSError:
+    return {}
+  result = {}
+  for line in content.splitlines():
+    name, value = line.split(":")
+    result[name.strip()] = int(value)
+  return result
+
+
+def get_io_difference(before: Dict[str, int], after: Dict[str, int], name: str) -> Optional[int]:
+  if name not in before or name not in after:
+    return None
+  return after[name] - before[name]
+
+
+def measure(method: Callable[[], int]) -> Measurement:
+  """
+  Calls `method` which returns the number of processed files and measures duration, peak RSS and the read and write counters of `/proc/self/io`.
+  The counters only contain read- and write-like system calls (e.g., `read`, `pread64`, `write`); other system calls like `stat`, `openat` or `getdents64` are not counted.
+  The peak RSS is the peak of the whole process, therefore each benchmark should run in a fresh process.
+  """
+  peak_rss_before = get_peak_rss_bytes()
+  io_before = get_io_counters()
+  start = perf_counter()
+  file_count = method()
+  duration_s = perf_counter() - start
+  io_after = get_io_counters()
+  peak_rss_after = get_peak_rss_bytes()
+
+  return {
+    "files": file_count,
+    "duration_s": duration_s,
+    "files_per_s": file_count / duration_s if duration_s > 0 else None,
+    "peak_rss_bytes": peak_rss_after,
+    "peak_rss_before_bytes": peak_rss_before,
+    "read_calls": get_io_difference(io_before, io_after, "syscr"),
+    "write_calls": get_io_difference(io_before, io_after, "syscw"),
+    "read_chars": get_io_difference(io_before, io_after, "rchar"),
+    "written_chars": get_io_difference(io_before, io_after, "wchar"),
+  }
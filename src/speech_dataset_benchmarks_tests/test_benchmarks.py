@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import pytest
+
+from speech_dataset_benchmarks.benchmarks import BENCHMARKS, run_benchmark
+from speech_dataset_benchmarks.corpora import create_generic_corpus
+from speech_dataset_benchmarks.measure import measure
+from speech_dataset_converter_cli.utils import LINK_MODE_COPY
+from speech_dataset_parser.parse import DEFAULT_TIER_NAME, parse_dataset
+
+
+def test_generic_corpus_is_parsed_completely(tmp_path: Path):
+  file_count = create_generic_corpus(tmp_path / "corpus", 25, files_per_speaker=10)
+
+  entries = list(parse_dataset(tmp_path / "corpus", DEFAULT_TIER_NAME, silent=True))
+
+  assert file_count == len(entries) == 25
+  assert len({entry.speaker_name for entry in entries}) == 3
+
+
+def get_files(directory: Path):
+  return {
+    path.relative_to(directory): path.read_bytes()
+    for path in directory.rglob("*") if path.is_file()
+  }
+
+
+@pytest.mark.parametrize("name", list(BENCHMARKS))
+def test_seed_changes_texts_but_not_layout(tmp_path: Path, name: str):
+  create_corpus, _ = BENCHMARKS[name]
+  create_corpus(tmp_path / "seed-1", 30, 1)
+  create_corpus(tmp_path / "seed-2", 30, 2)
+  create_corpus(tmp_path / "seed-1-again", 30, 1)
+
+  files_seed_1 = get_files(tmp_path / "seed-1")
+  files_seed_2 = get_files(tmp_path / "seed-2")
+
+  assert files_seed_1.keys() == files_seed_2.keys()
+  assert files_seed_1 != files_seed_2
+  assert files_seed_1 == get_files(tmp_path / "seed-1-again")
+
+
+@pytest.mark.parametrize("name", list(BENCHMARKS))
+def test_benchmark_is_successful_on_synthetic_corpus(tmp_path: Path, name: str):
+  create_corpus, run = BENCHMARKS[name]
+  file_count = create_corpus(tmp_path / "corpus", 30, seed=1)
+
+  successful = run(tmp_path / "corpus", tmp_path / "output", LINK_MODE_COPY)
+
+  assert successful
+  if name.startswith("convert_"):
+    entries = list(parse_dataset(tmp_path / "output", DEFAULT_TIER_NAME, silent=True))
+    assert len(entries) == file_count
+
+
+def test_measure_returns_files_per_second():
+  result = measure(lambda: 10)
+
+  assert result["files"] == 10
+  assert result["duration_s"] >= 0
+  assert set(result) >= {"files_per_s", "peak_rss_bytes", "read_calls", "write_calls"}
+
+
+def test_run_benchmark_measures_each_repeat(tmp_path: Path):
+  utterance_count, measurements = run_benchmark("parse_dataset", tmp_path, 10, repeats=2)
+
+  assert utterance_count == 10
+  assert len(measurements) == 2
+  assert all(measurement["files"] == 10 for measurement in measurements)
+  assert not (tmp_path / "parse_dataset" / "output-0").exists()
@@ -1,18 +1,26 @@
-import codecs
-import json
+import os
 from argparse import ArgumentParser, Namespace
-from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from logging import Logger
 from pathlib import Path
-from shutil import copy2
+from typing import List, Optional, Tuple
 
 from tqdm import tqdm
 
 from speech_dataset_converter_cli.argparse_helper import (parse_codec, parse_existing_directory,
-                                                          parse_non_empty_or_whitespace,
-                                                          parse_non_existing_directory)
-from speech_dataset_converter_cli.utils import create_grid
+                                                          parse_non_empty_or_whitespace, parse_path,
+                                                          parse_positive_integer)
+from speech_dataset_converter_cli.durations import (DurationCache, add_duration_cache_argument,
+                                                    try_load_duration_cache,
+                                                    try_save_duration_cache)
+from speech_dataset_converter_cli.grid_writer import get_grid_text, write_grid_text
+from speech_dataset_converter_cli.mapping import try_close_mapping_writer, try_open_mapping_writer
+from speech_dataset_converter_cli.utils import (LINK_MODE_COPY, LINK_MODE_SYMLINK, LINK_MODES,
+                                                get_grid_duration_s, place_file)
 from speech_dataset_parser import GENDER_FEMALE
+from speech_dataset_parser.grid_reader import read_tier
+from speech_dataset_parser.index import IndexEntry, get_index_path, write_index
 from speech_dataset_parser.parse import (DEFAULT_ENCODING, DEFAULT_N_DIGITS, DEFAULT_TIER_NAME,
                                          PARTS_SEP)
 
@@ -21,18 +29,25 @@ def get_convert_ljs_to_generic_parser(parser: ArgumentParser):
   parser.description = "This command converts the LJSpeech dataset to a generic one."
   parser.add_argument("directory", type=parse_existing_directory, metavar="LJ-SPEECH-DIRECTORY",
                       help="directory containing the LJSpeech content")
-  parser.add_argument("output_directory", type=parse_non_existing_directory, metavar="OUTPUT-DIRECTORY",
-                      help="output directory")
+  parser.add_argument("output_directory", type=parse_path, metavar="OUTPUT-DIRECTORY",
+                      help="output directory (needs to be non-existing unless --resume is used)")
   parser.add_argument("-t", "--tier", type=parse_non_empty_or_whitespace, metavar="TIER-NAME",
                       help="name of the output tier", default=DEFAULT_TIER_NAME)
   parser.add_argument("-e", "--encoding", type=parse_codec, metavar="CODEC",
                       help="encoding of output grids", default=DEFAULT_ENCODING)
   parser.add_argument("-d", "--n-digits", type=int, choices=range(17), metavar="DIGITS",
                       help="number of digits in textgrid", default=DEFAULT_N_DIGITS)
-  parser.add_argument("-s", "--symlink", action="store_true",
-                      help="create symbolic links to the audio files instead of copies")
+  parser.add_argument("-l", "--link-mode", type=str, choices=LINK_MODES, metavar="MODE", default=LINK_MODE_COPY,
+                      help="how the audio files are placed in the output directory: copy; symlink (symbolic link); hardlink (hard link, falls back to copy); reflink (copy-on-write clone, falls back to copy); auto (tries reflink, then hardlink, then copy)")
+  parser.add_argument("-s", "--symlink", dest="link_mode", action="store_const", const=LINK_MODE_SYMLINK,
+                      help="create symbolic links to the audio files instead of copies (same as '--link-mode symlink')")
   parser.add_argument("--use-un-normalized-text", action="store_true",
                       help="use un-normalized text, e.g., '1469, 1470;' instead of 'fourteen sixty-nine, fourteen seventy;'")
+  parser.add_argument("-j", "--jobs", type=parse_positive_integer, metavar="N",
+                      help="number of threads used for converting the files", default=1)
+  parser.add_argument("--resume", action="store_true",
+                      help="continue an interrupted conversion into an existing OUTPUT-DIRECTORY; files which were already written completely are skipped")
+  add_duration_cache_argument(parser)
   return convert_to_generic_ns
 
 
@@ -42,13 +57,19 @@ def convert_to_generic_ns(ns: Namespace, flogger: Logger, logger: Logger) -> boo
       "Parameter 'LJ-SPEECH-DIRECTORY' and 'OUTPUT-DIRECTORY': The two directories need to be distinct!")
     return False
 
-  successful = convert_to_generic(ns.directory, ns.symlink, ns.n_digits,
-                                  ns.tier, ns.output_directory, ns.encoding, ns.use_un_normalized_text, flogger, logger)
+  if ns.output_directory.exists() and not ns.resume:
+    logger.error("Parameter 'OUTPUT-DIRECTORY': Directory already exists! Use --resume to continue an interrupted conversion.")
+    return False
+
+  duration_cache = try_load_duration_cache(ns.duration_cache, flogger)
+  successful = convert_to_generic(ns.directory, ns.link_mode, ns.n_digits,
+                                  ns.tier, ns.output_directory, ns.encoding, ns.use_un_normalized_text, flogger, logger, ns.jobs, ns.resume, duration_cache)
+  try_save_duration_cache(duration_cache, ns.duration_cache, flogger)
 
   return successful
 
 
-def convert_to_generic(directory: Path, symlink: bool, n_digits: int, tier: str, output_directory: Path, encoding: str, use_un_normalized_text: bool, flogger: Logger, logger: Logger) -> bool:
+def convert_to_generic(directory: Path, link_mode: str, n_digits: int, tier: str, output_directory: Path, encoding: str, use_un_normalized_text: bool, flogger: Logger, logger: Logger, n_jobs: int = 1, resume: bool = False, duration_cache: Optional[DurationCache] = None) -> bool:
   speaker_name = 'Linda Johnson'
   accent_name = "North American"
   language = "eng"
@@ -56,7 +77,7 @@ def convert_to_generic(directory: Path, symlink: bool, n_digits: int, tier: str,
   file_count = 13100
   z_fill = len(str(file_count))
 
-  file_name_mapping = OrderedDict()
+  index_entries: List[IndexEntry] = []
 
   speaker_dir_name = f"{speaker_name}{PARTS_SEP}{gender}{PARTS_SEP}{language}{PARTS_SEP}{accent_name}"
   speaker_dir_out_abs = output_directory / speaker_dir_name
@@ -79,9 +100,12 @@ def convert_to_generic(directory: Path, symlink: bool, n_digits: int, tier: str,
   if use_un_normalized_text:
     text_column = 1
 
+  # the output names are assigned before converting so that they don't depend on the processing order
+  files: List[Tuple[Path, str, Path, Path]] = []
+
   # strip last empty line
   lines = metadata_content.strip().splitlines()
-  for line_nr, line in enumerate(tqdm(lines, desc="Converting", unit=" file(s)"), start=1):
+  for line_nr, line in enumerate(lines, start=1):
     parts = line.split('|')
     if not len(parts) == 3:
       flogger.error(f"Line {line_nr}: '{line}' couldn't be parsed! Ignored.")
@@ -106,80 +130,137 @@ def convert_to_generic(directory: Path, symlink: bool, n_digits: int, tier: str,
 
     # flogger.debug(f"Processing '{str(wav_file_relative)}'...")
     wav_file_in = directory / wav_file_relative
-    assert wav_file_in.is_file()
 
     # stem_out = f"{speaker_dir_name};{wav_file_relative.stem}"
     stem_out = str(file_counter).zfill(z_fill)
     wav_file_out = speaker_dir_out_abs / f"{stem_out}.wav"
     grid_file_out = speaker_dir_out_abs / f"{stem_out}.TextGrid"
     file_counter += 1
+    files.append((wav_file_in, text, wav_file_out, grid_file_out))
+
+  method = partial(
+    convert_file,
+    link_mode=link_mode,
+    n_digits=n_digits,
+    tier=tier,
+    encoding=encoding,
+    resume=resume,
+    duration_cache=duration_cache,
+    flogger=flogger,
+  )
+
+  # the mapping is written while converting, so that it contains all converted files if the conversion is interrupted
+  mapping_writer = try_open_mapping_writer(output_directory, flogger)
+  if mapping_writer is None:
+    return False
 
-    try:
-      grid = create_grid(wav_file_in, text, tier, n_digits)
-    except Exception as ex:
-      flogger.debug(ex)
-      flogger.error(f"Audio file \"{wav_file_in.absolute()}\" couldn't be read! Ignored.")
-      lines_with_errors += 1
-      continue
-
-    try:
-      grid_file_out.parent.mkdir(parents=True, exist_ok=True)
-    except Exception as ex:
-      flogger.debug(ex)
-      flogger.error(
-        f"Parent folder \"{grid_file_out.parent.absolute()}\" for grid \"{grid_file_out.absolute()}\" couldn't be created! Ignored.")
-      lines_with_errors += 1
-      continue
-
-    try:
-      with codecs.open(grid_file_out, 'w', encoding) as file:
-        grid.write(file)
-    except Exception as ex:
-      flogger.debug(ex)
-      flogger.error(f"Grid \"{grid_file_out.absolute()}\" couldn't be saved! Ignored.")
-      lines_with_errors += 1
-      continue
-
-    if symlink:
-      try:
-        wav_file_out.symlink_to(wav_file_in)
-      except Exception as ex:
-        flogger.debug(ex)
-        flogger.error(
-          f"Symbolic link to audio file \"{wav_file_in.absolute()}\" at \"{wav_file_out.absolute()}\" couldn't be created! Ignored.")
-        lines_with_errors += 1
-        continue
-    else:
-      try:
-        copy2(wav_file_in, wav_file_out)
-      except Exception as ex:
-        flogger.debug(ex)
-        flogger.error(
-          f"Audio file \"{wav_file_in.absolute()}\" couldn't be copied to \"{wav_file_out.absolute()}\"! Ignored.")
+  with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+    # results are returned in the order of the files
+    results = executor.map(method, files)
+    for (wav_file_in, text, wav_file_out, grid_file_out), duration_s in zip(files, tqdm(results, total=len(files), desc="Converting", unit=" file(s)")):
+      if duration_s is None:
         lines_with_errors += 1
         continue
 
-    hypothetical_grid_file_in = wav_file_in.parent / f"{wav_file_in.stem}.TextGrid"
-    file_name_mapping[str(grid_file_out.relative_to(
-      output_directory))] = str(hypothetical_grid_file_in.relative_to(directory))
-    file_name_mapping[str(wav_file_out.relative_to(
-      output_directory))] = str(wav_file_in.relative_to(directory))
+      hypothetical_grid_file_in = wav_file_in.parent / f"{wav_file_in.stem}.TextGrid"
+      mapping_writer.write(str(grid_file_out.relative_to(output_directory)),
+                           str(hypothetical_grid_file_in.relative_to(directory)))
+      mapping_writer.write(str(wav_file_out.relative_to(output_directory)), str(wav_file_in.relative_to(directory)))
+      index_entries.append(IndexEntry(speaker_dir_name, speaker_name, gender, language, accent_name,
+                                      grid_file_out.name, wav_file_out.name, duration_s, len(text)))
 
   if lines_with_errors > 0:
     logger.warning(f"{lines_with_errors} lines couldn't be parsed!")
 
   all_successful = lines_with_errors == 0
 
-  file_name_mapping_json_path = output_directory / "filename-mapping.json"
+  if not try_close_mapping_writer(mapping_writer, flogger):
+    all_successful = False
+
+  index_path = get_index_path(output_directory)
   try:
-    with open(file_name_mapping_json_path, mode="w", encoding="UTF-8") as f:
-      json.dump(file_name_mapping, f, indent=2)
+    write_index(index_path, index_entries)
   except Exception as ex:
     flogger.debug(ex)
-    flogger.error(
-      f"Mapping file \"{file_name_mapping_json_path.absolute()}\" couldn't be written!")
+    flogger.error(f"Index file \"{index_path.absolute()}\" couldn't be written!")
     all_successful = False
 
   logger.info(f"Saved output to: \"{output_directory.absolute()}\".")
 
   return all_successful
+
+
+def convert_file(file: Tuple[Path, str, Path, Path], link_mode: str, n_digits: int, tier: str, encoding: str, resume: bool, duration_cache: Optional[DurationCache], flogger: Logger) -> Optional[float]:
+  """returns the duration of the grid or `None` if the file couldn't be converted"""
+  wav_file_in, text, wav_file_out, grid_file_out = file
+  assert wav_file_in.is_file()
+
+  if resume:
+    duration_s = get_converted_duration_s(wav_file_in, text, wav_file_out,
+                                          grid_file_out, link_mode, n_digits, tier, encoding)
+    if duration_s is not None:
+      return duration_s
+
+  try:
+    duration_s = get_grid_duration_s(wav_file_in, n_digits, duration_cache)
+    grid_text = get_grid_text(text, duration_s, tier, n_digits)
+  except Exception as ex:
+    flogger.debug(ex)
+    flogger.error(f"Audio file \"{wav_file_in.absolute()}\" couldn't be read! Ignored.")
+    return None
+
+  try:
+    grid_file_out.parent.mkdir(parents=True, exist_ok=True)
+  except Exception as ex:
+    flogger.debug(ex)
+    flogger.error(
+      f"Parent folder \"{grid_file_out.parent.absolute()}\" for grid \"{grid_file_out.absolute()}\" couldn't be created! Ignored.")
+    return None
+
+  try:
+    write_grid_text(grid_file_out, grid_text, encoding)
+  except Exception as ex:
+    flogger.debug(ex)
+    flogger.error(f"Grid \"{grid_file_out.absolute()}\" couldn't be saved! Ignored.")
+    return None
+
+  if resume and (wav_file_out.is_symlink() or wav_file_out.exists()):
+    # remove incomplete output of the interrupted run
+    try:
+      wav_file_out.unlink()
+    except Exception as ex:
+      flogger.debug(ex)
+      flogger.error(f"Audio file \"{wav_file_out.absolute()}\" couldn't be removed! Ignored.")
+      return None
+
+  try:
+    place_file(wav_file_in, wav_file_out, link_mode)
+  except Exception as ex:
+    flogger.debug(ex)
+    flogger.error(
+      f"Audio file \"{wav_file_in.absolute()}\" couldn't be placed at \"{wav_file_out.absolute()}\" (link mode: {link_mode})! Ignored.")
+    return None
+
+  return duration_s
+
+
+def get_converted_duration_s(wav_file_in: Path, text: str, wav_file_out: Path, grid_file_out: Path, link_mode: str, n_digits: int, tier: str, encoding: str) -> Optional[float]:
+  """returns the duration of the grid if grid and audio file were completely written by a previous run, otherwise `None`"""
+  try:
+    content = read_tier(grid_file_out, tier, n_digits, encoding)
+  except Exception:
+    return None
+  if content is None:
+    return None
+  symbols, _, _, max_time = content
+  if "".join(symbols) != text or len(symbols) != len(text):
+    return None
+
+  if link_mode == LINK_MODE_SYMLINK:
+    audio_is_placed = wav_file_out.is_symlink() and Path(os.readlink(wav_file_out)) == wav_file_in
+  else:
+    audio_is_placed = wav_file_out.is_file() and not wav_file_out.is_symlink(
+    ) and wav_file_out.stat().st_size == wav_file_in.stat().st_size
+  if not audio_is_placed:
+    return None
+  return max_time
@@ -1,19 +1,26 @@
-import codecs
 import glob
-import json
 from argparse import ArgumentParser, Namespace
-from collections import OrderedDict
+from collections import deque
 from logging import Logger
 from pathlib import Path
-from shutil import copy2
+from typing import Deque, List, Optional
 
 from tqdm import tqdm
 
 from speech_dataset_converter_cli.argparse_helper import (parse_codec, parse_existing_directory,
                                                           parse_non_empty_or_whitespace,
-                                                          parse_non_existing_directory)
-from speech_dataset_converter_cli.utils import create_grid
+                                                          parse_non_existing_directory,
+                                                          parse_non_negative_integer)
+from speech_dataset_converter_cli.durations import (DurationCache, add_duration_cache_argument,
+                                                    try_load_duration_cache,
+                                                    try_save_duration_cache)
+from speech_dataset_converter_cli.grid_writer import (GridWriter, PendingGrid, add_written_grids,
+                                                      get_grid_text)
+from speech_dataset_converter_cli.mapping import try_close_mapping_writer, try_open_mapping_writer
+from speech_dataset_converter_cli.utils import (LINK_MODE_COPY, LINK_MODE_SYMLINK, LINK_MODES,
+                                                get_grid_duration_s, place_file)
 from speech_dataset_parser import GENDER_FEMALE
+from speech_dataset_parser.index import IndexEntry, get_index_path, write_index
 from speech_dataset_parser.parse import (DEFAULT_ENCODING, DEFAULT_N_DIGITS, DEFAULT_TIER_NAME,
                                          PARTS_SEP)
 from speech_dataset_parser.types import GENDER_MALE
@@ -31,10 +38,15 @@ def get_convert_thchs_slr_to_generic_parser(parser: ArgumentParser):
                       help="encoding of output grids", default=DEFAULT_ENCODING)
   parser.add_argument("-d", "--n-digits", type=int, choices=range(17), metavar="DIGITS",
                       help="number of digits in textgrid", default=DEFAULT_N_DIGITS)
-  parser.add_argument("-s", "--symlink", action="store_true",
-                      help="create symbolic links to the audio files instead of copies")
+  parser.add_argument("-l", "--link-mode", type=str, choices=LINK_MODES, metavar="MODE", default=LINK_MODE_COPY,
+                      help="how the audio files are placed in the output directory: copy; symlink (symbolic link); hardlink (hard link, falls back to copy); reflink (copy-on-write clone, falls back to copy); auto (tries reflink, then hardlink, then copy)")
+  parser.add_argument("-s", "--symlink", dest="link_mode", action="store_const", const=LINK_MODE_SYMLINK,
+                      help="create symbolic links to the audio files instead of copies (same as '--link-mode symlink')")
   parser.add_argument("-p", "--add-punctuation-marks", action="store_true",
                       help="add question marks (？) after particles 吗, 呢 and 吧, otherwise add a dot (。)")
+  parser.add_argument("--grid-writers", type=parse_non_negative_integer, metavar="N", default=0,
+                      help="number of background threads which write the grids while the audio files are placed; 0 writes them in the main thread")
+  add_duration_cache_argument(parser)
   return convert_to_generic_ns
 
 
@@ -44,8 +56,10 @@ def convert_to_generic_ns(ns: Namespace, flogger: Logger, logger: Logger) -> boo
       "Parameter 'THCHS-DIRECTORY' and 'OUTPUT-DIRECTORY': The two directories need to be distinct!")
     return False
 
-  successful = convert_to_generic(ns.directory, ns.symlink, ns.n_digits,
-                                  ns.tier, ns.output_directory, ns.encoding, ns.add_punctuation_marks, flogger, logger)
+  duration_cache = try_load_duration_cache(ns.duration_cache, flogger)
+  successful = convert_to_generic(ns.directory, ns.link_mode, ns.n_digits,
+                                  ns.tier, ns.output_directory, ns.encoding, ns.add_punctuation_marks, flogger, logger, duration_cache, ns.grid_writers)
+  try_save_duration_cache(duration_cache, ns.duration_cache, flogger)
 
   return successful
 
@@ -69,9 +83,7 @@ ACCENTS = {
 }
 
 
-def convert_to_generic(directory: Path, symlink: bool, n_digits: int, tier: str, output_directory: Path, encoding: str, add_punctuation: bool, flogger: Logger, logger: Logger) -> bool:
-  file_name_mapping = OrderedDict()
-
+def convert_to_generic(directory: Path, link_mode: str, n_digits: int, tier: str, output_directory: Path, encoding: str, add_punctuation: bool, flogger: Logger, logger: Logger, duration_cache: Optional[DurationCache] = None, n_grid_writers: int = 0) -> bool:
   lines_with_errors = 0
   max_file_count = 250
   z_fill = len(str(max_file_count))
@@ -94,6 +106,14 @@ def convert_to_generic(directory: Path, symlink: bool, n_digits: int, tier: str,
       f"Skipped: {len(skipped)} of {len(generated_sent_files)} because not both .txt and .wav files exist!")
     lines_with_errors = len(skipped)
 
+  # the mapping is written while converting, so that it contains all converted files if the conversion is interrupted
+  mapping_writer = try_open_mapping_writer(output_directory, flogger)
+  if mapping_writer is None:
+    return False
+  index_entries: List[IndexEntry] = []
+  pending_grids: Deque[PendingGrid] = deque()
+  grid_writer = GridWriter(n_grid_writers)
+
   lang = "chi"
 
   file_counters = {}
@@ -155,7 +175,8 @@ def convert_to_generic(directory: Path, symlink: bool, n_digits: int, tier: str,
     file_counters[speaker_name] += 1
 
     try:
-      grid = create_grid(wav_file_in, chinese, tier, n_digits)
+      duration_s = get_grid_duration_s(wav_file_in, n_digits, duration_cache)
+      grid_text = get_grid_text(chinese, duration_s, tier, n_digits)
     except Exception as ex:
       flogger.debug(ex)
       flogger.error(f"Audio file \"{wav_file_in.absolute()}\" couldn't be read! Ignored.")
@@ -172,52 +193,43 @@ def convert_to_generic(directory: Path, symlink: bool, n_digits: int, tier: str,
       continue
 
     try:
-      with codecs.open(grid_file_out, 'w', encoding) as file:
-        grid.write(file)
+      place_file(wav_file_in, wav_file_out, link_mode)
     except Exception as ex:
       flogger.debug(ex)
-      flogger.error(f"Grid \"{grid_file_out.absolute()}\" couldn't be saved! Ignored.")
+      flogger.error(
+        f"Audio file \"{wav_file_in.absolute()}\" couldn't be placed at \"{wav_file_out.absolute()}\" (link mode: {link_mode})! Ignored.")
       lines_with_errors += 1
       continue
 
-    if symlink:
-      try:
-        wav_file_out.symlink_to(wav_file_in)
-      except Exception as ex:
-        flogger.debug(ex)
-        flogger.error(
-          f"Symbolic link to audio file \"{wav_file_in.absolute()}\" at \"{wav_file_out.absolute()}\" couldn't be created! Ignored.")
-        lines_with_errors += 1
-        continue
-    else:
-      try:
-        copy2(wav_file_in, wav_file_out)
-      except Exception as ex:
-        flogger.debug(ex)
-        flogger.error(
-          f"Audio file \"{wav_file_in.absolute()}\" couldn't be copied to \"{wav_file_out.absolute()}\"! Ignored.")
-        lines_with_errors += 1
-        continue
+    # the grid is only written for placed audio files; background writers write it while the next audio file is placed
+    grid_future = grid_writer.submit(grid_file_out, grid_text, encoding)
 
     hypothetical_grid_file_in = wav_file_in.parent / f"{wav_file_in.stem}.TextGrid"
-    file_name_mapping[str(grid_file_out.relative_to(
-      output_directory))] = str(hypothetical_grid_file_in.relative_to(directory))
-    file_name_mapping[str(wav_file_out.relative_to(
-      output_directory))] = str(wav_file_in.relative_to(directory))
+    pending_grids.append((grid_future, grid_file_out, (
+      (str(grid_file_out.relative_to(output_directory)), str(hypothetical_grid_file_in.relative_to(directory))),
+      (str(wav_file_out.relative_to(output_directory)), str(wav_file_in.relative_to(directory))),
+    ), IndexEntry(speaker_dir_name, speaker_name, speaker_gender, lang, accent_name if speaker_name in ACCENTS else None,
+                 grid_file_out.name, wav_file_out.name, duration_s, len(chinese))))
+    lines_with_errors += add_written_grids(pending_grids, mapping_writer, index_entries, flogger, wait=False)
+
+  grid_writer.close()
+  # the mapping is in the same order as without background writers
+  lines_with_errors += add_written_grids(pending_grids, mapping_writer, index_entries, flogger)
 
   if lines_with_errors > 0:
     logger.warning(f"{lines_with_errors} lines couldn't be parsed!")
 
   all_successful = lines_with_errors == 0
 
-  file_name_mapping_json_path = output_directory / "filename-mapping.json"
+  if not try_close_mapping_writer(mapping_writer, flogger):
+    all_successful = False
+
+  index_path = get_index_path(output_directory)
   try:
-    with open(file_name_mapping_json_path, mode="w", encoding="UTF-8") as f:
-      json.dump(file_name_mapping, f, indent=2)
+    write_index(index_path, index_entries)
   except Exception as ex:
     flogger.debug(ex)
-    flogger.error(
-      f"Mapping file \"{file_name_mapping_json_path.absolute()}\" couldn't be written!")
+    flogger.error(f"Index file \"{index_path.absolute()}\" couldn't be written!")
     all_successful = False
 
   logger.info(f"Saved output to: \"{output_directory.absolute()}\".")
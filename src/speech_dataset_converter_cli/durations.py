@@ -0,0 +1,143 @@
+import json
+import os
+import struct
+from argparse import ArgumentParser
+from logging import Logger
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from speech_dataset_converter_cli.argparse_helper import parse_path
+
+# number of bytes which are read at once from the beginning of audio files, contains the 'fmt ' and 'data' chunk headers of common files
+WAV_HEADER_SIZE = 4096
+
+
+def get_wav_duration_s(wav_file: Path) -> float:
+  """
+  Reads the duration from the 'fmt ' and 'data' chunks of the RIFF header without reading the audio data.
+  The number of frames is computed like in `wave.Wave_read` but PCM, IEEE float and WAVE_FORMAT_EXTENSIBLE files are supported.
+  """
+  with open(wav_file, mode="rb", buffering=0) as f:
+    fd = f.fileno()
+    header = read_at(fd, 0, WAV_HEADER_SIZE)
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+      raise ValueError("File is not a RIFF WAVE file!")
+    frame_size = 0
+    frame_rate = 0
+    offset = 12
+    while True:
+      chunk_header = get_header_bytes(fd, header, offset, 8)
+      if len(chunk_header) < 8:
+        raise ValueError("Data chunk was not found!")
+      chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+      if chunk_id == b"fmt ":
+        fmt = get_header_bytes(fd, header, offset + 8, 16)
+        if len(fmt) < 16:
+          raise ValueError("Format chunk is incomplete!")
+        _, n_channels, frame_rate, _, _, bits_per_sample = struct.unpack("<HHIIHH", fmt)
+        frame_size = n_channels * ((bits_per_sample + 7) // 8)
+      elif chunk_id == b"data":
+        if frame_size == 0 or frame_rate == 0:
+          raise ValueError("Format chunk is missing or invalid!")
+        n_frames = chunk_size // frame_size
+        return n_frames / frame_rate
+      # chunks are aligned to two bytes
+      offset += 8 + chunk_size + (chunk_size & 1)
+
+
+def get_header_bytes(fd: int, header: bytes, offset: int, size: int) -> bytes:
+  if offset + size <= len(header):
+    return header[offset:offset + size]
+  # only needed if the chunks in front of the data chunk are larger than the header
+  return read_at(fd, offset, size)
+
+
+def read_at(fd: int, offset: int, size: int) -> bytes:
+  if hasattr(os, "pread"):
+    return os.pread(fd, size, offset)
+  os.lseek(fd, offset, os.SEEK_SET)
+  return os.read(fd, size)
+
+
+class DurationCache():
+  """
+  Stores the durations of audio files by their absolute path.
+  An entry is only valid as long as size and modification time of the file are unchanged, i.e., unchanged files are not opened again.
+  """
+
+  def __init__(self) -> None:
+    # size, modification time (ns), duration (s)
+    self.__entries: Dict[str, Tuple[int, int, float]] = {}
+    self.__lock = Lock()
+    self.__changed = False
+
+  @property
+  def changed(self) -> bool:
+    return self.__changed
+
+  def __len__(self) -> int:
+    return len(self.__entries)
+
+  def get_duration_s(self, wav_file: Path) -> float:
+    key = str(wav_file.absolute())
+    stat = wav_file.stat()
+    entry = self.__entries.get(key)
+    if entry is not None:
+      size, mtime_ns, duration_s = entry
+      if size == stat.st_size and mtime_ns == stat.st_mtime_ns:
+        return duration_s
+    duration_s = get_wav_duration_s(wav_file)
+    with self.__lock:
+      self.__entries[key] = (stat.st_size, stat.st_mtime_ns, duration_s)
+      self.__changed = True
+    return duration_s
+
+  @classmethod
+  def load(cls, path: Path) -> "DurationCache":
+    """loads the cache from a JSON file; returns an empty cache if the file doesn't exist"""
+    result = cls()
+    if not path.is_file():
+      return result
+    with open(path, mode="r", encoding="UTF-8") as f:
+      entries = json.load(f)
+    for key, (size, mtime_ns, duration_s) in entries.items():
+      result.__entries[key] = (size, mtime_ns, duration_s)
+    return result
+
+  def save(self, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # the file is replaced at once so that other runs never read an incomplete file
+    tmp_path = path.parent / f"{path.name}.{os.getpid()}.tmp"
+    with self.__lock:
+      with open(tmp_path, mode="w", encoding="UTF-8") as f:
+        json.dump(self.__entries, f)
+      os.replace(tmp_path, path)
+      self.__changed = False
+
+
+def add_duration_cache_argument(parser: ArgumentParser) -> None:
+  parser.add_argument("--duration-cache", type=parse_path, metavar="FILE", default=None,
+                      help="path of a cache for the durations of the audio files which can be shared between all commands; by default no cache is used")
+
+
+def try_load_duration_cache(path: Optional[Path], flogger: Logger) -> Optional[DurationCache]:
+  if path is None:
+    return None
+  try:
+    result = DurationCache.load(path)
+  except Exception as ex:
+    flogger.debug(ex)
+    flogger.warning(f"Duration cache \"{path.absolute()}\" couldn't be loaded! Ignored.")
+    result = DurationCache()
+  return result
+
+
+def try_save_duration_cache(duration_cache: Optional[DurationCache], path: Optional[Path], flogger: Logger) -> None:
+  if duration_cache is None or path is None or not duration_cache.changed:
+    return
+  try:
+    duration_cache.save(path)
+  except Exception as ex:
+    flogger.debug(ex)
+    flogger.warning(f"Duration cache \"{path.absolute()}\" couldn't be saved!")
@@ -0,0 +1,145 @@
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging import Logger
+from pathlib import Path
+from threading import BoundedSemaphore
+from typing import Deque, List, Optional, Sequence, Tuple
+
+from speech_dataset_converter_cli.mapping import MappingWriter
+from speech_dataset_parser.index import IndexEntry
+
+try:
+  import numpy as np
+except ImportError:
+  np = None
+
+# number of grids per thread which are rendered but not written yet
+MAX_PENDING_PER_THREAD = 64
+
+# future of the written grid, grid file, entries of the file name mapping, entry of the index
+PendingGrid = Tuple[Future, Path, Sequence[Tuple[str, str]], IndexEntry]
+
+
+def get_grid_text(symbols: Sequence[str], duration_s: float, tier_name: str, n_digits: int) -> str:
+  boundaries = get_boundaries(len(symbols), duration_s, n_digits)
+  intervals = list(zip(boundaries, boundaries[1:], symbols))
+  for min_time, max_time, _ in intervals:
+    if min_time >= max_time:
+      # same as in `Interval`, Praat does not support intervals with duration <= 0
+      raise ValueError(min_time, max_time)
+  last_max_time = boundaries[-1]
+  if last_max_time < duration_s:
+    # same as in `IntervalTier._fillInTheGaps`
+    intervals.append((last_max_time, duration_s, ""))
+
+  # same format as `TextGrid.write`
+  lines = [
+    'File type = "ooTextFile"',
+    'Object class = "TextGrid"',
+    '',
+    'xmin = 0',
+    f'xmax = {duration_s}',
+    'tiers? <exists>',
+    'size = 1',
+    'item []:',
+    '\titem [1]:',
+    '\t\tclass = "IntervalTier"',
+    f'\t\tname = "{tier_name}"',
+    '\t\txmin = 0',
+    f'\t\txmax = {duration_s}',
+    f'\t\tintervals: size = {len(intervals)}',
+  ]
+  for interval_nr, (min_time, max_time, mark) in enumerate(intervals, start=1):
+    lines.append(f'\t\t\tintervals [{interval_nr}]:')
+    lines.append(f'\t\t\t\txmin = {min_time}')
+    lines.append(f'\t\t\t\txmax = {max_time}')
+    mark = mark.replace('"', '""')
+    lines.append(f'\t\t\t\ttext = "{mark}"')
+  lines.append('')
+  return "\n".join(lines)
+
+
+def get_boundaries(symbols_count: int, total_duration_s: float, n_digits: int) -> List[float]:
+  """returns the rounded boundaries of `symbols_count` equally long intervals; each boundary is computed once and shared by the two adjacent intervals"""
+  if np is not None:
+    boundaries = (np.arange(symbols_count + 1) / symbols_count * total_duration_s).tolist()
+  else:
+    boundaries = array("d", (i / symbols_count * total_duration_s for i in range(symbols_count + 1)))
+  # numpy's rounding differs from Python's rounding in the last digit
+  return [round(boundary, n_digits) for boundary in boundaries]
+
+
+def write_grid_text(grid_file: Path, grid_text: str, encoding: str) -> None:
+  """writes the encoded grid with one system call (same content as writing it via `codecs.open`)"""
+  content = memoryview(grid_text.encode(encoding))
+  with open(grid_file, mode="wb", buffering=0) as f:
+    while len(content) > 0:
+      written = f.write(content)
+      content = content[written:]
+
+
+class GridWriter():
+  """
+  Writes grids in the calling thread (`n_threads` = 0) or in background threads, e.g., while the audio files are placed.
+  The futures are returned in the order of submission so that the results can be resolved in that order.
+  """
+
+  def __init__(self, n_threads: int = 0) -> None:
+    if not isinstance(n_threads, int) or n_threads < 0:
+      raise ValueError("Parameter 'n_threads': Value needs to be an integer greater than or equal to zero!")
+    self.__executor: Optional[ThreadPoolExecutor] = None
+    self.__semaphore: Optional[BoundedSemaphore] = None
+    if n_threads > 0:
+      self.__executor = ThreadPoolExecutor(max_workers=n_threads, thread_name_prefix="grid-writer")
+      # limits the memory of grids which are waiting to be written
+      self.__semaphore = BoundedSemaphore(n_threads * MAX_PENDING_PER_THREAD)
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback) -> None:
+    self.close()
+
+  def submit(self, grid_file: Path, grid_text: str, encoding: str) -> Future:
+    if self.__executor is None:
+      result = Future()
+      try:
+        write_grid_text(grid_file, grid_text, encoding)
+      except Exception as ex:
+        result.set_exception(ex)
+      else:
+        result.set_result(None)
+      return result
+    semaphore = self.__semaphore
+    semaphore.acquire()
+    result = self.__executor.submit(write_grid_text, grid_file, grid_text, encoding)
+    result.add_done_callback(lambda _: semaphore.release())
+    return result
+
+  def close(self) -> None:
+    """waits until all grids are written"""
+    if self.__executor is not None:
+      self.__executor.shutdown(wait=True)
+      self.__executor = None
+
+
+def add_written_grids(pending_grids: Deque[PendingGrid], mapping_writer: MappingWriter, index_entries: List[IndexEntry], flogger: Logger, wait: bool = True) -> int:
+  """
+  adds the mapping and index entries of the successfully written grids in the order of submission and removes them from `pending_grids`;
+  without `wait` only the grids up to the first grid which is not written yet are added; returns the number of grids which couldn't be saved
+  """
+  errors = 0
+  while len(pending_grids) > 0:
+    future, grid_file_out, mapping_entries, index_entry = pending_grids[0]
+    if not wait and not future.done():
+      break
+    pending_grids.popleft()
+    ex = future.exception()
+    if ex is not None:
+      flogger.debug(ex)
+      flogger.error(f"Grid \"{grid_file_out.absolute()}\" couldn't be saved! Ignored.")
+      errors += 1
+      continue
+    mapping_writer.update(mapping_entries)
+    index_entries.append(index_entry)
+  return errors
@@ -0,0 +1,94 @@
+import json
+from logging import Logger
+from pathlib import Path, PurePath
+from typing import Generator, Iterable, Optional, Tuple
+
+MAPPING_FILE_NAME = "filename-mapping.jsonl"
+# written by versions <= 0.0.4
+LEGACY_MAPPING_FILE_NAME = "filename-mapping.json"
+
+
+def get_mapping_path(directory: Path) -> Path:
+  return directory / MAPPING_FILE_NAME
+
+
+class MappingWriter():
+  """
+  Writes the path of each converted file in the generic dataset and its original path as one JSON array per line as soon as the file was converted; paths are stored with forward slashes.
+  The first error while writing is raised on `close` so that the conversion continues like with a mapping which is written at the end.
+  """
+
+  def __init__(self, path: Path) -> None:
+    self.__path = path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # line buffering keeps all converted files in the mapping if the conversion is interrupted
+    self.__file = open(path, mode="w", encoding="UTF-8", buffering=1)
+    self.__error: Optional[Exception] = None
+
+  @property
+  def path(self) -> Path:
+    return self.__path
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback) -> None:
+    self.close()
+
+  def write(self, file_rel_out: str, file_rel_in: str) -> None:
+    if self.__error is not None:
+      return
+    try:
+      self.__file.write(json.dumps([PurePath(file_rel_out).as_posix(), PurePath(file_rel_in).as_posix()], ensure_ascii=False))
+      self.__file.write("\n")
+    except Exception as ex:
+      self.__error = ex
+
+  def update(self, entries: Iterable[Tuple[str, str]]) -> None:
+    for file_rel_out, file_rel_in in entries:
+      self.write(file_rel_out, file_rel_in)
+
+  def close(self) -> None:
+    if not self.__file.closed:
+      self.__file.close()
+    if self.__error is not None:
+      error = self.__error
+      self.__error = None
+      raise error
+
+
+def try_open_mapping_writer(directory: Path, flogger: Logger) -> Optional[MappingWriter]:
+  path = get_mapping_path(directory)
+  try:
+    return MappingWriter(path)
+  except Exception as ex:
+    flogger.debug(ex)
+    flogger.error(f"Mapping file \"{path.absolute()}\" couldn't be created!")
+    return None
+
+
+def try_close_mapping_writer(mapping_writer: MappingWriter, flogger: Logger) -> bool:
+  try:
+    mapping_writer.close()
+  except Exception as ex:
+    flogger.debug(ex)
+    flogger.error(f"Mapping file \"{mapping_writer.path.absolute()}\" couldn't be written!")
+    return False
+  return True
+
+
+def read_mapping(directory: Path) -> Generator[Tuple[str, str], None, None]:
+  """yields the path of each file in the generic dataset and its original path; the mapping of older versions is read if no JSON lines mapping exists"""
+  path = get_mapping_path(directory)
+  if not path.is_file():
+    legacy_path = directory / LEGACY_MAPPING_FILE_NAME
+    with open(legacy_path, mode="r", encoding="UTF-8") as f:
+      yield from json.load(f).items()
+    return
+
+  with open(path, mode="r", encoding="UTF-8") as f:
+    for line in f:
+      if line.strip() == "":
+        continue
+      file_rel_out, file_rel_in = json.loads(line)
+      yield file_rel_out, file_rel_in
@@ -1,14 +1,22 @@
-import json
 from argparse import ArgumentParser, Namespace
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from logging import Logger
 from pathlib import Path
-from shutil import copy2
-from typing import Dict
+from typing import Callable, Deque, Generator, Iterable, Set, Tuple
 
 from tqdm import tqdm
 
 from speech_dataset_converter_cli.argparse_helper import (parse_existing_directory,
-                                                          parse_non_existing_directory)
+                                                          parse_non_existing_directory,
+                                                          parse_positive_integer)
+from speech_dataset_converter_cli.mapping import (LEGACY_MAPPING_FILE_NAME, get_mapping_path,
+                                                  read_mapping)
+from speech_dataset_converter_cli.utils import (LINK_MODE_COPY, LINK_MODE_SYMLINK, LINK_MODES,
+                                                place_file)
+
+PENDING_FILES_PER_JOB = 4
 
 
 def get_structure_restoring_parser(parser: ArgumentParser):
@@ -17,8 +25,12 @@ def get_structure_restoring_parser(parser: ArgumentParser):
                       help="directory containing the generic dataset")
   parser.add_argument("output_directory", type=parse_non_existing_directory, metavar="OUTPUT-DIRECTORY",
                       help="output directory")
-  parser.add_argument("-s", "--symlink", action="store_true",
-                      help="create symbolic links to the files instead of copies")
+  parser.add_argument("-l", "--link-mode", type=str, choices=LINK_MODES, metavar="MODE", default=LINK_MODE_COPY,
+                      help="how the files are placed in the output directory: copy; symlink (symbolic link); hardlink (hard link, falls back to copy); reflink (copy-on-write clone, falls back to copy); auto (tries reflink, then hardlink, then copy)")
+  parser.add_argument("-s", "--symlink", dest="link_mode", action="store_const", const=LINK_MODE_SYMLINK,
+                      help="create symbolic links to the files instead of copies (same as '--link-mode symlink')")
+  parser.add_argument("-j", "--jobs", type=parse_positive_integer, metavar="N",
+                      help="number of threads used for placing the files", default=1)
   return restore_structure_ns
 
 
@@ -27,54 +39,53 @@ def restore_structure_ns(ns: Namespace, flogger: Logger, logger: Logger) -> bool
     logger.error("Parameter 'DIRECTORY' and 'OUTPUT-DIRECTORY': The two directories need to be distinct!")
     return False
 
-  successful = restore_structure(ns.directory, ns.symlink, ns.output_directory, flogger, logger)
+  successful = restore_structure(ns.directory, ns.link_mode, ns.output_directory, flogger, logger, ns.jobs)
 
   return successful
 
 
-def restore_structure(directory: Path, symlink: bool, output_directory: Path, flogger: Logger, logger: Logger) -> bool:
-  file_name_mapping_json_path = directory / "filename-mapping.json"
+def restore_structure(directory: Path, link_mode: str, output_directory: Path, flogger: Logger, logger: Logger, n_jobs: int = 1) -> bool:
+  # the mapping is read twice line by line instead of being kept in memory: first for the parent folders, then for placing the files
+  parents: Set[Path] = set()
+  file_count = 0
   try:
-    with open(file_name_mapping_json_path, mode="r", encoding="UTF-8") as f:
-      file_name_mapping: Dict[str, str] = json.load(f)
+    for _, to_path_rel in read_mapping(directory):
+      parents.add((output_directory / to_path_rel).parent)
+      file_count += 1
   except Exception as ex:
     flogger.debug(ex)
     flogger.error(
-      f"Mapping file \"{file_name_mapping_json_path.absolute()}\" couldn't be read!")
+      f"Mapping file \"{get_mapping_path(directory).absolute()}\" (or \"{LEGACY_MAPPING_FILE_NAME}\") couldn't be read!")
     return False
 
+  # each parent folder is created once instead of once per file
+  failed_parents = create_folders(parents, flogger)
+
   lines_with_errors = 0
-  for from_path_rel, to_path_rel in tqdm(file_name_mapping.items()):
-    from_path = directory / from_path_rel
-    to_path = output_directory / to_path_rel
 
-    try:
-      to_path.parent.mkdir(parents=True, exist_ok=True)
-    except Exception as ex:
-      flogger.debug(ex)
-      flogger.error(
-        f"Parent folder \"{to_path.parent.absolute()}\" for file \"{to_path.absolute()}\" couldn't be created! Ignored.")
-      lines_with_errors += 1
-      continue
-
-    if symlink:
-      try:
-        to_path.symlink_to(from_path)
-      except Exception as ex:
-        flogger.debug(ex)
+  def get_files_to_place() -> Generator[Tuple[Path, Path], None, None]:
+    nonlocal lines_with_errors
+    for from_path_rel, to_path_rel in read_mapping(directory):
+      from_path, to_path = directory / from_path_rel, output_directory / to_path_rel
+      if to_path.parent in failed_parents:
         flogger.error(
-          f"Symbolic link to file \"{from_path.absolute()}\" at \"{to_path.absolute()}\" couldn't be created! Ignored.")
+          f"Parent folder \"{to_path.parent.absolute()}\" for file \"{to_path.absolute()}\" couldn't be created! Ignored.")
         lines_with_errors += 1
         continue
-    else:
-      try:
-        copy2(from_path, to_path)
-      except Exception as ex:
-        flogger.debug(ex)
-        flogger.error(
-          f"File \"{from_path.absolute()}\" couldn't be copied to \"{to_path.absolute()}\"! Ignored.")
+      yield from_path, to_path
+
+  method = partial(try_place_file, link_mode=link_mode, flogger=flogger)
+
+  try:
+    results = place_files(get_files_to_place(), method, n_jobs)
+    for successful in tqdm(results, total=file_count, desc="Restoring", unit=" file(s)"):
+      if not successful:
         lines_with_errors += 1
-        continue
+  except Exception as ex:
+    flogger.debug(ex)
+    flogger.error(
+      f"Mapping file \"{get_mapping_path(directory).absolute()}\" (or \"{LEGACY_MAPPING_FILE_NAME}\") couldn't be read!")
+    return False
 
   if lines_with_errors > 0:
     logger.warning(f"{lines_with_errors} files couldn't be copied!")
@@ -82,3 +93,40 @@ def restore_structure(directory: Path, symlink: bool, output_directory: Path, fl
   all_successful = lines_with_errors == 0
 
   return all_successful
+
+
+def place_files(files: Iterable[Tuple[Path, Path]], method: Callable[[Tuple[Path, Path]], bool], n_jobs: int) -> Generator[bool, None, None]:
+  """places the files in `n_jobs` threads and yields the results in order; only a few files per thread are submitted ahead (`executor.map` would submit all files at once)"""
+  with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+    pending: Deque[Future] = deque()
+    for file in files:
+      pending.append(executor.submit(method, file))
+      if len(pending) >= n_jobs * PENDING_FILES_PER_JOB:
+        yield pending.popleft().result()
+    while len(pending) > 0:
+      yield pending.popleft().result()
+
+
+def create_folders(folders: Iterable[Path], flogger: Logger) -> Set[Path]:
+  """creates the distinct folders and returns the folders which couldn't be created"""
+  failed_folders: Set[Path] = set()
+  # sorting creates each ancestor before its subfolders
+  for folder in sorted(set(folders)):
+    try:
+      folder.mkdir(parents=True, exist_ok=True)
+    except Exception as ex:
+      flogger.debug(ex)
+      failed_folders.add(folder)
+  return failed_folders
+
+
+def try_place_file(file: Tuple[Path, Path], link_mode: str, flogger: Logger) -> bool:
+  from_path, to_path = file
+  try:
+    place_file(from_path, to_path, link_mode)
+  except Exception as ex:
+    flogger.debug(ex)
+    flogger.error(
+      f"File \"{from_path.absolute()}\" couldn't be placed at \"{to_path.absolute()}\" (link mode: {link_mode})! Ignored.")
+    return False
+  return True
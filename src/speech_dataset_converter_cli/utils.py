@@ -1,12 +1,31 @@
+import errno
 import os
-import wave
+import sys
 from collections import OrderedDict
 from pathlib import Path
-from typing import Generator, List
+from shutil import copy2, copystat
+from typing import Generator, List, Optional
 from typing import OrderedDict as ODType
-from typing import Set, Tuple, cast
+from typing import Set, Tuple
 
-from textgrid import Interval, IntervalTier, TextGrid
+from speech_dataset_converter_cli.durations import DurationCache, get_wav_duration_s
+
+LINK_MODE_COPY = "copy"
+LINK_MODE_SYMLINK = "symlink"
+LINK_MODE_HARDLINK = "hardlink"
+LINK_MODE_REFLINK = "reflink"
+LINK_MODE_AUTO = "auto"
+
+LINK_MODES = (
+  LINK_MODE_COPY,
+  LINK_MODE_SYMLINK,
+  LINK_MODE_HARDLINK,
+  LINK_MODE_REFLINK,
+  LINK_MODE_AUTO,
+)
+
+# ioctl request code of FICLONE on Linux, see 'man ioctl_ficlone'
+FICLONE = 0x40049409
 
 
 def get_files_dict(directory: Path, filetypes: Set[str]) -> ODType[str, Path]:
@@ -72,30 +91,65 @@ def get_filenames(parent_dir: Path) -> List[str]:
   return filenames
 
 
-def get_wav_duration_s(wav_file: Path) -> float:
-  with open(wav_file, mode="rb") as f:
-    with cast(wave.Wave_read, wave.open(f, "rb")) as wav:
-      duration_s = wav.getnframes() / wav.getframerate()
-  return duration_s
-
-
-def create_grid(wav_file: Path, text: str, tier_name: str, n_digits: int) -> TextGrid:
-  assert wav_file.is_file()
-  assert len(text) > 0
-  duration_s = get_wav_duration_s(wav_file)
-  duration_s = round(duration_s, n_digits)
-  result = TextGrid(None, 0, duration_s)
-  tier = IntervalTier(tier_name, 0, duration_s)
-  symbols = list(text)
-  tier.intervals.extend(get_intervals(symbols, duration_s, n_digits))
-  result.append(tier)
-  return result
-
-
-def get_intervals(symbols: List[str], total_duration_s: float, n_digits: int) -> Generator[Interval, None, None]:
-  symbols_count = len(symbols)
-  for added_symbols_count, symbol in enumerate(symbols):
-    min_time = added_symbols_count / symbols_count * total_duration_s
-    max_time = (added_symbols_count + 1) / symbols_count * total_duration_s
-    symbol_interval = Interval(round(min_time, n_digits), round(max_time, n_digits), symbol)
-    yield symbol_interval
+def get_grid_duration_s(wav_file: Path, n_digits: int, duration_cache: Optional[DurationCache] = None) -> float:
+  """returns the duration of the audio file rounded like the max-time of its grid"""
+  if duration_cache is None:
+    duration_s = get_wav_duration_s(wav_file)
+  else:
+    duration_s = duration_cache.get_duration_s(wav_file)
+  return round(duration_s, n_digits)
+
+
+def place_file(source: Path, target: Path, link_mode: str) -> None:
+  """
+  Places `source` at `target` according to `link_mode`:
+  - copy: copies the file including its metadata
+  - symlink: creates a symbolic link to the file
+  - hardlink: creates a hard link to the file, copies it if this is not possible
+  - reflink: creates a copy-on-write clone of the file, copies it if this is not possible
+  - auto: tries reflink, then hardlink, then copies the file
+  """
+  if link_mode == LINK_MODE_COPY:
+    copy2(source, target)
+  elif link_mode == LINK_MODE_SYMLINK:
+    target.symlink_to(source)
+  elif link_mode == LINK_MODE_HARDLINK:
+    if not try_hardlink(source, target):
+      copy2(source, target)
+  elif link_mode == LINK_MODE_REFLINK:
+    if not try_reflink(source, target):
+      copy2(source, target)
+  elif link_mode == LINK_MODE_AUTO:
+    if not try_reflink(source, target) and not try_hardlink(source, target):
+      copy2(source, target)
+  else:
+    raise ValueError(f"Link mode '{link_mode}' is not supported!")
+
+
+def try_hardlink(source: Path, target: Path) -> bool:
+  try:
+    os.link(source, target)
+  except OSError as error:
+    if error.errno == errno.EEXIST:
+      raise
+    return False
+  return True
+
+
+def try_reflink(source: Path, target: Path) -> bool:
+  if not sys.platform.startswith("linux"):
+    return False
+  import fcntl
+  with open(source, mode="rb") as source_file:
+    # fails if the target exists
+    with open(target, mode="xb") as target_file:
+      try:
+        fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+        cloned = True
+      except OSError:
+        cloned = False
+  if not cloned:
+    os.remove(target)
+    return False
+  copystat(source, target)
+  return True
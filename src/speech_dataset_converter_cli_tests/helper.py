@@ -0,0 +1,23 @@
+import wave
+from pathlib import Path
+from typing import List
+
+
+def write_wav(path: Path, duration_s: float, sample_rate: int = 22050) -> None:
+  path.parent.mkdir(parents=True, exist_ok=True)
+  with wave.open(str(path), "wb") as wav:
+    wav.setnchannels(1)
+    wav.setsampwidth(2)
+    wav.setframerate(sample_rate)
+    wav.writeframes(b"\x00\x00" * int(duration_s * sample_rate))
+
+
+def create_ljs(directory: Path, file_count: int = 5) -> List[str]:
+  """creates a LJ Speech like dataset with silent audio files and returns the lines of the metadata"""
+  lines = []
+  for file_nr in range(1, file_count + 1):
+    basename = f"LJ001-{str(file_nr).zfill(4)}"
+    write_wav(directory / "wavs" / f"{basename}.wav", file_nr / 10)
+    lines.append(f"{basename}|Text {file_nr}, 1469.|Text {file_nr}, fourteen sixty-nine.")
+  (directory / "metadata.csv").write_text("\n".join(lines) + "\n", "UTF-8")
+  return lines
@@ -0,0 +1,122 @@
+import os
+import struct
+import wave
+from pathlib import Path
+
+import pytest
+
+from speech_dataset_converter_cli import durations
+from speech_dataset_converter_cli.durations import DurationCache, get_wav_duration_s
+from speech_dataset_converter_cli_tests.helper import write_wav
+
+
+def write_riff(path: Path, fmt: bytes, data_size: int, chunks_before_data: bytes = b"") -> None:
+  content = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt + chunks_before_data
+  content += b"data" + struct.pack("<I", data_size) + b"\x00" * data_size
+  path.write_bytes(b"RIFF" + struct.pack("<I", len(content)) + content)
+
+
+def get_fmt(format_tag: int, n_channels: int, sample_rate: int, bits_per_sample: int) -> bytes:
+  block_align = n_channels * bits_per_sample // 8
+  return struct.pack("<HHIIHH", format_tag, n_channels, sample_rate, sample_rate * block_align, block_align, bits_per_sample)
+
+
+@pytest.mark.parametrize("duration_s, sample_rate", [(0.0, 22050), (1.5, 22050), (0.33, 16000), (2.0, 44100)])
+def test_get_wav_duration_s__pcm__same_as_wave(tmp_path: Path, duration_s: float, sample_rate: int):
+  path = tmp_path / "test.wav"
+  write_wav(path, duration_s, sample_rate)
+  with wave.open(str(path), "rb") as wav:
+    expected = wav.getnframes() / wav.getframerate()
+
+  result = get_wav_duration_s(path)
+
+  assert result == expected
+
+
+def test_get_wav_duration_s__float_stereo(tmp_path: Path):
+  path = tmp_path / "test.wav"
+  write_riff(path, get_fmt(3, 2, 8000, 32), 8000 * 2 * 4 * 2)
+
+  result = get_wav_duration_s(path)
+
+  assert result == 2.0
+
+
+def test_get_wav_duration_s__extensible(tmp_path: Path):
+  path = tmp_path / "test.wav"
+  fmt = get_fmt(0xFFFE, 1, 16000, 24) + struct.pack("<HHI16s", 22, 24, 4, b"\x01" + b"\x00" * 15)
+  write_riff(path, fmt, 16000 * 3)
+
+  result = get_wav_duration_s(path)
+
+  assert result == 1.0
+
+
+def test_get_wav_duration_s__odd_chunk_larger_than_header(tmp_path: Path):
+  path = tmp_path / "test.wav"
+  list_chunk = b"LIST" + struct.pack("<I", 5001) + b"\x00" * 5001 + b"\x00"
+  write_riff(path, get_fmt(1, 1, 100, 16), 100 * 2, list_chunk)
+
+  result = get_wav_duration_s(path)
+
+  assert result == 1.0
+
+
+def test_get_wav_duration_s__no_wav__raises_value_error(tmp_path: Path):
+  path = tmp_path / "test.wav"
+  path.write_bytes(b"ID3" + b"\x00" * 100)
+
+  with pytest.raises(ValueError):
+    get_wav_duration_s(path)
+
+
+def test_duration_cache__unchanged_file__is_not_read_again(tmp_path: Path, monkeypatch):
+  path = tmp_path / "test.wav"
+  write_wav(path, 0.5)
+  cache = DurationCache()
+  first = cache.get_duration_s(path)
+
+  def fail(_):
+    raise AssertionError()
+  monkeypatch.setattr(durations, "get_wav_duration_s", fail)
+  second = cache.get_duration_s(path)
+
+  assert first == second == 0.5
+  assert len(cache) == 1
+
+
+def test_duration_cache__changed_file__is_read_again(tmp_path: Path):
+  path = tmp_path / "test.wav"
+  write_wav(path, 0.5)
+  cache = DurationCache()
+  cache.get_duration_s(path)
+  write_wav(path, 1.0)
+  stat = path.stat()
+  os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+  result = cache.get_duration_s(path)
+
+  assert result == 1.0
+
+
+def test_duration_cache__save_and_load(tmp_path: Path, monkeypatch):
+  path = tmp_path / "test.wav"
+  write_wav(path, 0.7)
+  cache_path = tmp_path / "cache" / "durations.json"
+  cache = DurationCache()
+  expected = cache.get_duration_s(path)
+  cache.save(cache_path)
+
+  monkeypatch.setattr(durations, "get_wav_duration_s", None)
+  loaded = DurationCache.load(cache_path)
+  result = loaded.get_duration_s(path)
+
+  assert result == expected
+  assert not loaded.changed
+  assert list(cache_path.parent.iterdir()) == [cache_path]
+
+
+def test_duration_cache__load_non_existing__is_empty(tmp_path: Path):
+  result = DurationCache.load(tmp_path / "durations.json")
+
+  assert len(result) == 0
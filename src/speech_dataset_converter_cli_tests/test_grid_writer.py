@@ -0,0 +1,182 @@
+import codecs
+from collections import deque
+from concurrent.futures import Future
+from logging import getLogger
+from pathlib import Path
+
+import pytest
+from textgrid import Interval, IntervalTier, TextGrid
+
+from speech_dataset_converter_cli import convert_thchs_slr
+from speech_dataset_converter_cli.convert_thchs_slr import convert_to_generic
+from speech_dataset_converter_cli.grid_writer import (GridWriter, add_written_grids, get_boundaries,
+                                                      get_grid_text, write_grid_text)
+from speech_dataset_converter_cli.mapping import MappingWriter, get_mapping_path, read_mapping
+from speech_dataset_converter_cli.utils import LINK_MODE_COPY
+from speech_dataset_converter_cli_tests.helper import write_wav
+from speech_dataset_parser.index import IndexEntry
+
+
+@pytest.mark.parametrize("encoding", ("UTF-8", "UTF-16", "GB18030"))
+def test_write_grid_text_same_as_codecs(tmp_path: Path, encoding: str):
+  grid_text = get_grid_text("绿 是 阳春", 1.5, "symbols", 16)
+  with codecs.open(tmp_path / "expected.TextGrid", 'w', encoding) as file:
+    file.write(grid_text)
+
+  write_grid_text(tmp_path / "result.TextGrid", grid_text, encoding)
+
+  assert (tmp_path / "result.TextGrid").read_bytes() == (tmp_path / "expected.TextGrid").read_bytes()
+
+
+def create_textgrid(text: str, duration_s: float, n_digits: int) -> TextGrid:
+  """creates the grid via `textgrid` objects like the converters did before rendering the text directly"""
+  grid = TextGrid(None, 0, duration_s)
+  tier = IntervalTier("symbols", 0, duration_s)
+  for symbol_nr, symbol in enumerate(text):
+    min_time = symbol_nr / len(text) * duration_s
+    max_time = (symbol_nr + 1) / len(text) * duration_s
+    tier.intervals.append(Interval(round(min_time, n_digits), round(max_time, n_digits), symbol))
+  grid.append(tier)
+  return grid
+
+
+@pytest.mark.parametrize("text, duration_s, n_digits", (
+  ("This is a \"test\".", 1.2345678, 16),
+  ("绿 是 阳春", 7.8, 16),
+  ("abc", 1 / 3, 16),
+  ("abcdefg", 9.655, 3),
+  ("ab", 2.0, 0),
+))
+def test_get_grid_text_matches_textgrid(tmp_path: Path, text: str, duration_s: float, n_digits: int):
+  grid = create_textgrid(text, duration_s, n_digits)
+  with codecs.open(tmp_path / "expected.TextGrid", 'w', "UTF-8") as file:
+    grid.write(file)
+
+  grid_text = get_grid_text(text, duration_s, "symbols", n_digits)
+
+  assert grid_text.encode("UTF-8") == (tmp_path / "expected.TextGrid").read_bytes()
+
+
+def test_get_grid_text_raises_error_on_empty_intervals():
+  with pytest.raises(ValueError):
+    get_grid_text("abcdef", 0.1, "symbols", 1)
+
+
+@pytest.mark.parametrize("symbols_count, duration_s, n_digits", ((1, 1.5, 16), (7, 9.655011337868481, 3), (3, 1 / 3, 16)))
+def test_get_boundaries_same_as_per_interval_computation(symbols_count: int, duration_s: float, n_digits: int):
+  expected = [round(nr / symbols_count * duration_s, n_digits) for nr in range(symbols_count + 1)]
+
+  assert get_boundaries(symbols_count, duration_s, n_digits) == expected
+
+
+@pytest.mark.parametrize("n_threads", (0, 3))
+def test_grid_writer_writes_all_grids(tmp_path: Path, n_threads: int):
+  with GridWriter(n_threads) as grid_writer:
+    futures = [
+      grid_writer.submit(tmp_path / f"{nr}.TextGrid", f"content {nr}", "UTF-8")
+      for nr in range(200)
+    ]
+
+  assert all(future.done() and future.exception() is None for future in futures)
+  assert all((tmp_path / f"{nr}.TextGrid").read_text("UTF-8") == f"content {nr}" for nr in range(200))
+
+
+@pytest.mark.parametrize("n_threads", (0, 2))
+def test_grid_writer_returns_errors_via_future(tmp_path: Path, n_threads: int):
+  with GridWriter(n_threads) as grid_writer:
+    future = grid_writer.submit(tmp_path / "missing" / "1.TextGrid", "content", "UTF-8")
+
+  assert isinstance(future.exception(), FileNotFoundError)
+
+
+def test_add_written_grids_keeps_order_and_skips_errors(tmp_path: Path):
+  successful = Future()
+  successful.set_result(None)
+  failed = Future()
+  failed.set_exception(OSError())
+  index_entries = [IndexEntry("A;1;eng", "A", 1, "eng", None, f"{nr}.TextGrid", f"{nr}.wav", 1.0, 3)
+                   for nr in range(3)]
+  added_index_entries = []
+  pending_grids = deque([
+    (successful, Path("2.TextGrid"), (("2.TextGrid", "b.TextGrid"), ("2.wav", "b.wav")), index_entries[2]),
+    (failed, Path("3.TextGrid"), (("3.TextGrid", "c.TextGrid"), ("3.wav", "c.wav")), index_entries[0]),
+    (successful, Path("1.TextGrid"), (("1.TextGrid", "a.TextGrid"), ("1.wav", "a.wav")), index_entries[1]),
+  ])
+
+  with MappingWriter(get_mapping_path(tmp_path)) as mapping_writer:
+    errors = add_written_grids(pending_grids, mapping_writer, added_index_entries, getLogger())
+
+  assert errors == 1
+  assert len(pending_grids) == 0
+  assert list(read_mapping(tmp_path)) == [
+    ("2.TextGrid", "b.TextGrid"), ("2.wav", "b.wav"), ("1.TextGrid", "a.TextGrid"), ("1.wav", "a.wav"),
+  ]
+  assert added_index_entries == [index_entries[2], index_entries[1]]
+
+
+def test_add_written_grids_without_wait_stops_at_pending_grid(tmp_path: Path):
+  successful = Future()
+  successful.set_result(None)
+  pending = Future()
+  index_entries = [IndexEntry("A;1;eng", "A", 1, "eng", None, f"{nr}.TextGrid", f"{nr}.wav", 1.0, 3)
+                   for nr in range(3)]
+  added_index_entries = []
+  pending_grids = deque([
+    (successful, Path("1.TextGrid"), (("1.TextGrid", "a.TextGrid"),), index_entries[0]),
+    (pending, Path("2.TextGrid"), (("2.TextGrid", "b.TextGrid"),), index_entries[1]),
+    (successful, Path("3.TextGrid"), (("3.TextGrid", "c.TextGrid"),), index_entries[2]),
+  ])
+
+  with MappingWriter(get_mapping_path(tmp_path)) as mapping_writer:
+    errors = add_written_grids(pending_grids, mapping_writer, added_index_entries, getLogger(), wait=False)
+
+  assert errors == 0
+  assert len(pending_grids) == 2
+  assert added_index_entries == [index_entries[0]]
+
+
+def test_convert_thchs_slr_with_background_writers_same_output(tmp_path: Path):
+  data_dir = tmp_path / "thchs" / "data"
+  for speaker in ("A11", "B8"):
+    for nr in range(1, 6):
+      write_wav(data_dir / f"{speaker}_{nr}.wav", nr / 10)
+      (data_dir / f"{speaker}_{nr}.wav.trn").write_text(f"绿 是 阳春 {nr}\nlü4 shi4\n", "UTF-8")
+
+  outputs = []
+  for n_grid_writers in (0, 2):
+    output_directory = tmp_path / f"output{n_grid_writers}"
+    successful = convert_to_generic(tmp_path / "thchs", LINK_MODE_COPY, 16, "symbols", output_directory, "UTF-8",
+                                    False, getLogger(), getLogger(), n_grid_writers=n_grid_writers)
+    assert successful
+    outputs.append(output_directory)
+
+  mapping_0 = (outputs[0] / "filename-mapping.jsonl").read_text("UTF-8")
+  assert mapping_0 == (outputs[1] / "filename-mapping.jsonl").read_text("UTF-8")
+  assert len(list(read_mapping(outputs[0]))) == 20
+  files_0 = sorted(path.relative_to(outputs[0]) for path in outputs[0].rglob("*.TextGrid"))
+  assert files_0 == sorted(path.relative_to(outputs[1]) for path in outputs[1].rglob("*.TextGrid"))
+  assert all((outputs[0] / file).read_bytes() == (outputs[1] / file).read_bytes() for file in files_0)
+
+
+def test_convert_thchs_slr_audio_not_placed__grid_not_written(tmp_path: Path, monkeypatch):
+  data_dir = tmp_path / "thchs" / "data"
+  for nr in range(1, 6):
+    write_wav(data_dir / f"A11_{nr}.wav", nr / 10)
+    (data_dir / f"A11_{nr}.wav.trn").write_text(f"绿 是 阳春 {nr}\nlü4 shi4\n", "UTF-8")
+
+  def place_file(wav_file_in: Path, wav_file_out: Path, link_mode: str) -> None:
+    if wav_file_in.name == "A11_3.wav":
+      raise OSError("test")
+    original_place_file(wav_file_in, wav_file_out, link_mode)
+
+  original_place_file = convert_thchs_slr.place_file
+  monkeypatch.setattr(convert_thchs_slr, "place_file", place_file)
+  output_directory = tmp_path / "output"
+  successful = convert_to_generic(tmp_path / "thchs", LINK_MODE_COPY, 16, "symbols", output_directory, "UTF-8",
+                                  False, getLogger(), getLogger(), n_grid_writers=2)
+
+  assert not successful
+  grid_files = sorted(output_directory.rglob("*.TextGrid"))
+  assert len(grid_files) == 4
+  assert all(grid_file.with_suffix(".wav").is_file() for grid_file in grid_files)
+  assert len(list(read_mapping(output_directory))) == 8
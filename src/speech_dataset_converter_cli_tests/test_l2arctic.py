@@ -5,6 +5,7 @@ from shutil import rmtree
 
 from speech_dataset_converter_cli.convert_l2arctic import convert_to_generic
 from speech_dataset_converter_cli.logging_configuration import configure_root_logger
+from speech_dataset_converter_cli.utils import LINK_MODE_SYMLINK
 
 LOCAL_PATH = Path('/data/datasets/l2arctic')
 configure_root_logger()
@@ -12,7 +13,7 @@ configure_root_logger()
 
 def xtest_all_utterances_are_included():
   output_path = Path(tempfile.mkdtemp("-tests", "sdc"))
-  success = convert_to_generic(LOCAL_PATH, True, 16, "test", output_path,
+  success = convert_to_generic(LOCAL_PATH, LINK_MODE_SYMLINK, 16, "test", output_path,
                                "UTF-8", getLogger(), getLogger())
   rmtree(output_path)
   assert success
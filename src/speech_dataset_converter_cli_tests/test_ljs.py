@@ -5,6 +5,10 @@ from shutil import rmtree
 
 from speech_dataset_converter_cli.convert_ljs import convert_to_generic
 from speech_dataset_converter_cli.logging_configuration import configure_root_logger
+from speech_dataset_converter_cli.utils import LINK_MODE_COPY, LINK_MODE_SYMLINK
+from speech_dataset_converter_cli_tests.helper import create_ljs
+from speech_dataset_parser.index import get_index_path, read_index
+from speech_dataset_parser.parse import parse_dataset
 
 LOCAL_PATH = Path('/data/datasets/LJSpeech-1.1')
 configure_root_logger()
@@ -12,7 +16,67 @@ configure_root_logger()
 
 def xtest_all_utterances_are_included():
   output_path = Path(tempfile.mkdtemp("-tests", "sdc"))
-  success = convert_to_generic(LOCAL_PATH, True, 16, "test", output_path,
+  success = convert_to_generic(LOCAL_PATH, LINK_MODE_SYMLINK, 16, "test", output_path,
                                "UTF-8", getLogger(), getLogger())
   rmtree(output_path)
   assert success
+
+
+def get_files(directory: Path):
+  return {
+    str(path.relative_to(directory)): path.read_bytes()
+    for path in sorted(directory.rglob("*")) if path.is_file()
+  }
+
+
+def test_jobs_create_same_output_as_serial_run(tmp_path: Path):
+  create_ljs(tmp_path / "ljs", 12)
+  (tmp_path / "ljs" / "wavs" / "LJ001-0003.wav").unlink()
+
+  success_serial = convert_to_generic(tmp_path / "ljs", LINK_MODE_COPY, 16, "test", tmp_path / "serial",
+                                      "UTF-8", False, getLogger(), getLogger())
+  success_parallel = convert_to_generic(tmp_path / "ljs", LINK_MODE_COPY, 16, "test", tmp_path / "parallel",
+                                        "UTF-8", False, getLogger(), getLogger(), n_jobs=4)
+
+  assert not success_serial
+  assert not success_parallel
+  assert get_files(tmp_path / "serial") == get_files(tmp_path / "parallel")
+  # grids, audio files, mapping and index
+  assert len(get_files(tmp_path / "serial")) == 2 * 11 + 2
+
+
+def test_resume_completes_interrupted_conversion(tmp_path: Path):
+  create_ljs(tmp_path / "ljs", 6)
+  convert_to_generic(tmp_path / "ljs", LINK_MODE_COPY, 16, "test", tmp_path / "expected",
+                     "UTF-8", False, getLogger(), getLogger())
+  convert_to_generic(tmp_path / "ljs", LINK_MODE_COPY, 16, "test", tmp_path / "resumed",
+                     "UTF-8", False, getLogger(), getLogger())
+  speaker_dir = tmp_path / "resumed" / "Linda Johnson;2;eng;North American"
+  (speaker_dir / "00002.TextGrid").write_text("incomplete")
+  (speaker_dir / "00004.wav").write_bytes(b"RIFF")
+  (speaker_dir / "00006.TextGrid").unlink()
+  (speaker_dir / "00006.wav").unlink()
+  (tmp_path / "resumed" / "filename-mapping.jsonl").unlink()
+  unchanged_grid_mtime = (speaker_dir / "00001.TextGrid").stat().st_mtime_ns
+
+  success = convert_to_generic(tmp_path / "ljs", LINK_MODE_COPY, 16, "test", tmp_path / "resumed",
+                               "UTF-8", False, getLogger(), getLogger(), n_jobs=2, resume=True)
+
+  assert success
+  assert get_files(tmp_path / "resumed") == get_files(tmp_path / "expected")
+  assert (speaker_dir / "00001.TextGrid").stat().st_mtime_ns == unchanged_grid_mtime
+
+
+def test_index_can_be_used_for_parsing(tmp_path: Path):
+  create_ljs(tmp_path / "ljs", 4)
+  convert_to_generic(tmp_path / "ljs", LINK_MODE_COPY, 16, "test", tmp_path / "output",
+                     "UTF-8", False, getLogger(), getLogger())
+
+  index_entries = list(read_index(get_index_path(tmp_path / "output")))
+  expected = list(parse_dataset(tmp_path / "output", "test", silent=True))
+  result = list(parse_dataset(tmp_path / "output", "test", silent=True, use_index=True))
+
+  assert result == expected
+  assert len(result) == 4
+  assert [entry.duration_s for entry in index_entries] == [entry.max_time for entry in expected]
+  assert [entry.symbols_count for entry in index_entries] == [len(entry.symbols) for entry in expected]
@@ -0,0 +1,36 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from speech_dataset_converter_cli.mapping import (LEGACY_MAPPING_FILE_NAME, MappingWriter,
+                                                  get_mapping_path, read_mapping)
+
+
+def test_written_mapping_is_read_in_same_order(tmp_path: Path):
+  with MappingWriter(get_mapping_path(tmp_path)) as mapping_writer:
+    mapping_writer.write("B;1;eng/1.wav", "wavs/b.wav")
+    mapping_writer.update([("A;1;eng/2.wav", "wavs/ä.wav"), ("A;1;eng/1.wav", "wavs/a.wav")])
+
+  assert list(read_mapping(tmp_path)) == [
+    ("B;1;eng/1.wav", "wavs/b.wav"), ("A;1;eng/2.wav", "wavs/ä.wav"), ("A;1;eng/1.wav", "wavs/a.wav"),
+  ]
+
+
+def test_written_lines_are_readable_before_close(tmp_path: Path):
+  with MappingWriter(get_mapping_path(tmp_path)) as mapping_writer:
+    mapping_writer.write("A;1;eng/1.wav", "wavs/a.wav")
+    assert list(read_mapping(tmp_path)) == [("A;1;eng/1.wav", "wavs/a.wav")]
+
+
+def test_legacy_mapping_is_read(tmp_path: Path):
+  mapping = {"A;1;eng/1.wav": "wavs/a.wav", "A;1;eng/2.wav": "wavs/b.wav"}
+  with open(tmp_path / LEGACY_MAPPING_FILE_NAME, mode="w", encoding="UTF-8") as f:
+    json.dump(mapping, f, indent=2)
+
+  assert list(read_mapping(tmp_path)) == list(mapping.items())
+
+
+def test_missing_mapping_raises_error(tmp_path: Path):
+  with pytest.raises(FileNotFoundError):
+    list(read_mapping(tmp_path))
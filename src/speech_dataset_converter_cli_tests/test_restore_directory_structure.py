@@ -0,0 +1,74 @@
+import json
+from logging import getLogger
+from pathlib import Path
+
+import pytest
+
+from speech_dataset_converter_cli.mapping import MappingWriter, get_mapping_path
+from speech_dataset_converter_cli.restore_directory_structure import restore_structure
+from speech_dataset_converter_cli.utils import LINK_MODE_COPY
+
+
+def create_generic_dataset(directory: Path, file_count: int = 20) -> dict:
+  """creates files in a generic structure and returns the mapping to their original paths"""
+  mapping = {}
+  for file_nr in range(file_count):
+    file_rel = f"A;1;eng/{str(file_nr).zfill(3)}.wav"
+    (directory / file_rel).parent.mkdir(parents=True, exist_ok=True)
+    (directory / file_rel).write_bytes(bytes([file_nr]))
+    mapping[file_rel] = f"speaker{file_nr % 3}/sub{file_nr % 2}/file{file_nr}.wav"
+  with open(directory / "filename-mapping.json", mode="w", encoding="UTF-8") as f:
+    json.dump(mapping, f, indent=2)
+  return mapping
+
+
+@pytest.mark.parametrize("n_jobs", (1, 4))
+def test_restore_structure_places_all_files(tmp_path: Path, n_jobs: int):
+  mapping = create_generic_dataset(tmp_path / "generic")
+
+  successful = restore_structure(tmp_path / "generic", LINK_MODE_COPY, tmp_path / "restored",
+                                 getLogger(), getLogger(), n_jobs)
+
+  assert successful
+  for from_path_rel, to_path_rel in mapping.items():
+    assert (tmp_path / "restored" / to_path_rel).read_bytes() == (tmp_path / "generic" / from_path_rel).read_bytes()
+
+
+def test_restore_structure_counts_failed_files(tmp_path: Path):
+  mapping = create_generic_dataset(tmp_path / "generic")
+  missing_file_rel = next(iter(mapping))
+  (tmp_path / "generic" / missing_file_rel).unlink()
+
+  successful = restore_structure(tmp_path / "generic", LINK_MODE_COPY, tmp_path / "restored",
+                                 getLogger(), getLogger(), 4)
+
+  assert not successful
+  assert not (tmp_path / "restored" / mapping[missing_file_rel]).exists()
+  assert sum(1 for path in (tmp_path / "restored").rglob("*.wav")) == len(mapping) - 1
+
+
+def test_restore_structure_counts_files_of_uncreatable_folders(tmp_path: Path):
+  mapping = create_generic_dataset(tmp_path / "generic")
+  # a file blocks the creation of the folder
+  (tmp_path / "restored").mkdir()
+  (tmp_path / "restored" / "speaker0").write_bytes(b"")
+
+  successful = restore_structure(tmp_path / "generic", LINK_MODE_COPY, tmp_path / "restored",
+                                 getLogger(), getLogger(), 4)
+
+  assert not successful
+  restored_count = sum(1 for path in (tmp_path / "restored").rglob("*.wav"))
+  assert restored_count == sum(1 for to_path_rel in mapping.values() if not to_path_rel.startswith("speaker0/"))
+
+
+def test_restore_structure_reads_json_lines_mapping(tmp_path: Path):
+  mapping = create_generic_dataset(tmp_path / "generic")
+  (tmp_path / "generic" / "filename-mapping.json").unlink()
+  with MappingWriter(get_mapping_path(tmp_path / "generic")) as mapping_writer:
+    mapping_writer.update(mapping.items())
+
+  successful = restore_structure(tmp_path / "generic", LINK_MODE_COPY, tmp_path / "restored",
+                                 getLogger(), getLogger(), 2)
+
+  assert successful
+  assert all((tmp_path / "restored" / to_path_rel).is_file() for to_path_rel in mapping.values())
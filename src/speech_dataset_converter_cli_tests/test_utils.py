@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import pytest
+
+from speech_dataset_converter_cli.utils import (LINK_MODE_AUTO, LINK_MODE_COPY, LINK_MODE_HARDLINK,
+                                                LINK_MODE_REFLINK, LINK_MODE_SYMLINK, LINK_MODES,
+                                                place_file)
+
+
+@pytest.mark.parametrize("link_mode", LINK_MODES)
+def test_place_file_creates_file_with_same_content(tmp_path: Path, link_mode: str):
+  source = tmp_path / "source.wav"
+  source.write_bytes(b"content")
+  target = tmp_path / "target.wav"
+
+  place_file(source, target, link_mode)
+
+  assert target.read_bytes() == b"content"
+  assert target.is_symlink() == (link_mode == LINK_MODE_SYMLINK)
+
+
+def test_place_file_hardlink_shares_inode(tmp_path: Path):
+  source = tmp_path / "source.wav"
+  source.write_bytes(b"content")
+  target = tmp_path / "target.wav"
+
+  place_file(source, target, LINK_MODE_HARDLINK)
+
+  assert target.stat().st_ino == source.stat().st_ino
+
+
+@pytest.mark.parametrize("link_mode", (LINK_MODE_COPY, LINK_MODE_HARDLINK, LINK_MODE_REFLINK, LINK_MODE_AUTO))
+def test_place_file_fails_if_target_exists(tmp_path: Path, link_mode: str):
+  source = tmp_path / "source.wav"
+  source.write_bytes(b"content")
+  target = tmp_path / "target.wav"
+  target.write_bytes(b"existing")
+
+  if link_mode == LINK_MODE_COPY:
+    # copy2 overwrites existing files like before
+    place_file(source, target, link_mode)
+    assert target.read_bytes() == b"content"
+  else:
+    with pytest.raises(FileExistsError):
+      place_file(source, target, link_mode)
+    assert target.read_bytes() == b"existing"
@@ -1,3 +1,12 @@
-from speech_dataset_parser.parse import parse_dataset
+from speech_dataset_parser.cache import ParseCache, get_default_cache_path
+from speech_dataset_parser.dataset import GenericDataset
+from speech_dataset_parser.grid_reader import probe_grid
+from speech_dataset_parser.lazy import LazyEntry
+from speech_dataset_parser.parse import create_speaker_filter, parse_dataset
+from speech_dataset_parser.parse_async import parse_dataset_async
+from speech_dataset_parser.scan import SpeakerSummary, scan_dataset
+from speech_dataset_parser.snapshot import ParseSnapshot
+from speech_dataset_parser.table import EntryTable, parse_dataset_table
 from speech_dataset_parser.types import (GENDER_FEMALE, GENDER_MALE, GENDER_NOT_APPLICABLE,
-                                         GENDER_UNKNOWN, Entry)
+                                         GENDER_UNKNOWN, CompactEntry, Entry)
+from speech_dataset_parser.vocabulary import SymbolVocabulary
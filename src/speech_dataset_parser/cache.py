@@ -0,0 +1,145 @@
+import json
+import sqlite3
+from array import array
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from speech_dataset_parser.types import GridContent
+
+DEFAULT_MAX_ENTRIES = 2_000_000
+CACHE_FILE_SUFFIX = ".parse-cache.sqlite"
+# number of added rows after which they are written to disk
+COMMIT_INTERVAL = 1000
+
+
+def get_default_cache_path(directory: Path) -> Path:
+  """returns the path of the cache file which is placed next to the dataset directory, e.g., 'ljs' -> 'ljs.parse-cache.sqlite'"""
+  return directory.parent / f"{directory.name}{CACHE_FILE_SUFFIX}"
+
+
+def get_key(grid_file: Path) -> str:
+  # the same grid has the same key independent of the working directory if it was given relative to it
+  return str(grid_file.absolute())
+
+
+class ParseCache():
+  """
+  Stores the parsed content of TextGrids in a SQLite database.
+  An entry is only valid as long as modification time and size of the grid file are unchanged.
+  If more than `max_entries` grids are stored, the oldest entries are removed.
+  """
+
+  def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+    if not isinstance(max_entries, int) or max_entries < 1:
+      raise ValueError("Parameter 'max_entries': Value needs to be an integer greater than zero!")
+    self.__path = path
+    self.__max_entries = max_entries
+    self.__connection: Optional[sqlite3.Connection] = None
+    self.__pending = 0
+
+  @property
+  def path(self) -> Path:
+    return self.__path
+
+  @property
+  def max_entries(self) -> int:
+    return self.__max_entries
+
+  def __reduce__(self):
+    # the connection can't be transferred to other processes, therefore each process opens its own
+    return get_process_cache, (self.__path, self.__max_entries)
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback) -> None:
+    self.close()
+
+  def __len__(self) -> int:
+    cursor = self.__get_connection().execute("SELECT COUNT(*) FROM grids")
+    count, = cursor.fetchone()
+    return count
+
+  def __get_connection(self) -> sqlite3.Connection:
+    if self.__connection is None:
+      self.__path.parent.mkdir(parents=True, exist_ok=True)
+      connection = sqlite3.connect(str(self.__path), timeout=60)
+      # allows reading from other processes while writing
+      connection.execute("PRAGMA journal_mode=WAL")
+      connection.execute("PRAGMA synchronous=NORMAL")
+      connection.execute(
+        "CREATE TABLE IF NOT EXISTS grids ("
+        "path TEXT NOT NULL, tier_name TEXT NOT NULL, n_digits INTEGER NOT NULL, "
+        "mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, "
+        "symbols TEXT NOT NULL, intervals BLOB NOT NULL, min_time REAL NOT NULL, max_time REAL NOT NULL, "
+        "PRIMARY KEY (path, tier_name, n_digits))"
+      )
+      connection.commit()
+      self.__connection = connection
+    return self.__connection
+
+  def get(self, grid_file_abs: Path, mtime_ns: int, size: int, tier_name: str, n_digits: int) -> Optional[GridContent]:
+    cursor = self.__get_connection().execute(
+      "SELECT symbols, intervals, min_time, max_time FROM grids "
+      "WHERE path = ? AND tier_name = ? AND n_digits = ? AND mtime_ns = ? AND size = ?",
+      (get_key(grid_file_abs), tier_name, n_digits, mtime_ns, size),
+    )
+    row = cursor.fetchone()
+    if row is None:
+      return None
+    symbols_json, intervals_bytes, min_time, max_time = row
+    symbols = tuple(json.loads(symbols_json))
+    intervals = array("d")
+    intervals.frombytes(intervals_bytes)
+    return symbols, tuple(intervals), min_time, max_time
+
+  def put(self, grid_file_abs: Path, mtime_ns: int, size: int, tier_name: str, n_digits: int, content: GridContent) -> None:
+    symbols, intervals, min_time, max_time = content
+    self.__get_connection().execute(
+      "INSERT OR REPLACE INTO grids VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+      (get_key(grid_file_abs), tier_name, n_digits, mtime_ns, size, json.dumps(symbols, ensure_ascii=False),
+       array("d", intervals).tobytes(), min_time, max_time),
+    )
+    self.__pending += 1
+    if self.__pending >= COMMIT_INTERVAL:
+      self.commit()
+
+  def commit(self) -> None:
+    if self.__connection is None:
+      return
+    connection = self.__connection
+    if self.__pending > 0:
+      # oldest entries have the lowest row ids
+      connection.execute(
+        "DELETE FROM grids WHERE rowid IN "
+        "(SELECT rowid FROM grids ORDER BY rowid ASC LIMIT MAX(0, (SELECT COUNT(*) FROM grids) - ?))",
+        (self.__max_entries,),
+      )
+      self.__pending = 0
+    connection.commit()
+
+  def invalidate(self, grid_file_abs: Optional[Path] = None) -> int:
+    """removes the entries of the given grid file or all entries if no file is given; returns the number of removed entries"""
+    connection = self.__get_connection()
+    if grid_file_abs is None:
+      cursor = connection.execute("DELETE FROM grids")
+    else:
+      cursor = connection.execute("DELETE FROM grids WHERE path = ?", (get_key(grid_file_abs),))
+    connection.commit()
+    return cursor.rowcount
+
+  def close(self) -> None:
+    if self.__connection is not None:
+      self.commit()
+      self.__connection.close()
+      self.__connection = None
+
+
+PROCESS_CACHES: Dict[Tuple[Path, int], ParseCache] = {}
+
+
+def get_process_cache(path: Path, max_entries: int) -> ParseCache:
+  key = (path, max_entries)
+  if key not in PROCESS_CACHES:
+    PROCESS_CACHES[key] = ParseCache(path, max_entries)
+  return PROCESS_CACHES[key]
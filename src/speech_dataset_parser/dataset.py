@@ -0,0 +1,123 @@
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Union, overload
+
+from speech_dataset_parser.cache import ParseCache
+from speech_dataset_parser.parse import (DEFAULT_AUDIO_FORMAT, DEFAULT_COMPACT, DEFAULT_ENCODING,
+                                         DEFAULT_N_DIGITS, DEFAULT_NUM_SHARDS, DEFAULT_SHARD_BY,
+                                         DEFAULT_SHARD_INDEX, DEFAULT_SILENT, DEFAULT_TIER_NAME,
+                                         DEFAULT_USE_INDEX, GridTask, SpeakerFilter, SpeakerInfo,
+                                         create_entry, get_tasks, load_grid_task,
+                                         validate_parameters, validate_shard_parameters,
+                                         validate_speaker_filter)
+from speech_dataset_parser.types import CompactEntry, Entry
+from speech_dataset_parser.vocabulary import SymbolVocabulary
+
+
+class GenericDataset():
+  """
+  Provides random access to the entries of a generic dataset.
+  On creation only the speaker directories (or the index) are scanned; a grid is parsed each time its entry is accessed.
+  Slices and speakers are returned as views which share the scanned files with this dataset.
+  The dataset can only be pickled (e.g., for worker processes) if no vocabulary or a frozen vocabulary is used.
+  """
+
+  def __init__(self, directory: Path, tier_name: str = DEFAULT_TIER_NAME, n_digits: int = DEFAULT_N_DIGITS, encoding: str = DEFAULT_ENCODING, audio_format: str = DEFAULT_AUDIO_FORMAT, silent: bool = DEFAULT_SILENT, cache: Optional[ParseCache] = None, compact: bool = DEFAULT_COMPACT, vocabulary: Optional[SymbolVocabulary] = None, use_index: bool = DEFAULT_USE_INDEX, shard_index: int = DEFAULT_SHARD_INDEX, num_shards: int = DEFAULT_NUM_SHARDS, shard_by: str = DEFAULT_SHARD_BY, speaker_filter: Optional[SpeakerFilter] = None) -> None:
+    validate_parameters(directory, tier_name, n_digits, encoding, cache, vocabulary)
+    validate_shard_parameters(shard_index, num_shards, shard_by)
+    validate_speaker_filter(speaker_filter)
+    self.__tier_name = tier_name
+    self.__n_digits = n_digits
+    self.__encoding = encoding
+    self.__cache = cache
+    self.__compact = compact
+    self.__vocabulary = vocabulary
+
+    # the speaker information and directory are stored once per speaker and each file refers to them by their position
+    self.__speakers: List[SpeakerInfo] = []
+    self.__speaker_dirs: List[Path] = []
+    self.__speaker_codes = array("I")
+    self.__grid_files: List[str] = []
+    self.__audio_files: List[str] = []
+    speaker_codes: Dict[Path, int] = {}
+    for speaker_info, speaker_dir, grid_file_rel, audio_file_rel in get_tasks(directory, audio_format, silent, use_index, shard_index, num_shards, shard_by, speaker_filter):
+      speaker_code = speaker_codes.get(speaker_dir)
+      if speaker_code is None:
+        speaker_code = len(self.__speakers)
+        speaker_codes[speaker_dir] = speaker_code
+        self.__speakers.append(speaker_info)
+        self.__speaker_dirs.append(speaker_dir)
+      self.__speaker_codes.append(speaker_code)
+      self.__grid_files.append(grid_file_rel)
+      self.__audio_files.append(audio_file_rel)
+
+    # positions of the files of this view
+    self.__indices: Sequence[int] = range(len(self.__grid_files))
+
+  def __len__(self) -> int:
+    return len(self.__indices)
+
+  @overload
+  def __getitem__(self, index: int) -> Union[Entry, CompactEntry]:
+    ...
+
+  @overload
+  def __getitem__(self, index: slice) -> "GenericDataset":
+    ...
+
+  def __getitem__(self, index: Union[int, slice]) -> Union[Entry, CompactEntry, "GenericDataset"]:
+    if isinstance(index, slice):
+      return self.__get_view(self.__indices[index])
+    # raises IndexError and supports negative indices
+    file_index = self.__indices[index]
+    task = self.__get_task(file_index)
+    content, grid_stat = load_grid_task(task, self.__tier_name, self.__n_digits, self.__encoding, self.__cache)
+    if content is None:
+      raise ValueError(f"{task[2]}: Tier '{self.__tier_name}' does not exist!")
+    if self.__cache is not None and grid_stat is not None:
+      mtime_ns, size = grid_stat
+      self.__cache.put(task[1] / task[2], mtime_ns, size, self.__tier_name, self.__n_digits, content)
+    return create_entry(task, content, self.__compact, self.__vocabulary)
+
+  def __getstate__(self) -> Dict:
+    if self.__vocabulary is not None and not self.__vocabulary.frozen:
+      # each copy (e.g., in a worker process of a data loader) would assign its own ids to new symbols
+      raise ValueError("Parameter 'vocabulary': Value needs to be frozen for transferring the dataset to other processes!")
+    return self.__dict__
+
+  def __iter__(self) -> Iterator[Union[Entry, CompactEntry]]:
+    for index in range(len(self)):
+      yield self[index]
+
+  def __get_task(self, file_index: int) -> GridTask:
+    speaker_code = self.__speaker_codes[file_index]
+    return self.__speakers[speaker_code], self.__speaker_dirs[speaker_code], self.__grid_files[file_index], self.__audio_files[file_index]
+
+  def __get_view(self, indices: Sequence[int]) -> "GenericDataset":
+    # not via `copy` because it uses `__getstate__`
+    result = GenericDataset.__new__(GenericDataset)
+    result.__dict__.update(self.__dict__)
+    result.__indices = indices
+    return result
+
+  def get_audio_file_abs(self, index: int) -> Path:
+    """returns the path of the audio file without parsing the grid"""
+    file_index = self.__indices[index]
+    return self.__speaker_dirs[self.__speaker_codes[file_index]] / self.__audio_files[file_index]
+
+  def get_speaker_names(self) -> List[str]:
+    """returns the names of the speakers of this view in order of their first entry"""
+    speaker_codes = dict.fromkeys(self.__speaker_codes[file_index] for file_index in self.__indices)
+    return list(dict.fromkeys(self.__speakers[speaker_code][0] for speaker_code in speaker_codes))
+
+  def get_speaker(self, speaker_name: str) -> "GenericDataset":
+    """returns a view on the entries of the speaker, it is empty if the speaker doesn't exist"""
+    speaker_codes = {
+      speaker_code for speaker_code, speaker_info in enumerate(self.__speakers)
+      if speaker_info[0] == speaker_name
+    }
+    indices = array("Q", (
+      file_index for file_index in self.__indices
+      if self.__speaker_codes[file_index] in speaker_codes
+    ))
+    return self.__get_view(indices)
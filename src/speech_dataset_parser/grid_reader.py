@@ -0,0 +1,236 @@
+import codecs
+import re
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+from textgrid.exceptions import TextGridError
+from textgrid.textgrid import detectEncoding
+
+from speech_dataset_parser.types import GridContent, GridHeader
+
+# contains the header and the first tier header of grids written by `TextGrid.write`
+DEFAULT_PROBE_SIZE = 512
+
+RE_HEADER = re.compile(r'File type = "([\w ]+)"')
+RE_LONG_STRING = re.compile(r'.+? = "(.*)"')
+RE_LONG_NUMBER = re.compile(r'.+? = (.*)')
+RE_LONG_MARK_START = re.compile(r'^\s*(text|mark) = "')
+RE_LONG_MARK = re.compile(r'^\s*(text|mark) = "(.*?)"\s*$', re.DOTALL)
+RE_SHORT_MARK = re.compile(r'^"(.*?)"\s*$', re.DOTALL)
+
+
+def read_tier(grid_file: Path, tier_name: str, n_digits: int, encoding: Optional[str] = None) -> Optional[GridContent]:
+  """
+  Reads marks and max-times of the first interval tier named `tier_name` from a TextGrid in long or short text format and the min- and max-time of the grid.
+  The lines are processed like in `TextGrid.read` of the `textgrid` package but other tiers are skipped and no objects are created for the intervals.
+  Returns `None` if the tier doesn't exist. Empty marks are returned as empty string.
+  """
+  if encoding is None:
+    encoding = detectEncoding(grid_file)
+  with open(grid_file, mode="r", encoding=encoding, newline="") as source:
+    content = source.read()
+  # same line breaks as `codecs.StreamReader.readline` which is used by `TextGrid.read`
+  lines = iter(content.splitlines(keepends=True))
+  return read_tier_from_lines(lines, tier_name, n_digits)
+
+
+def probe_grid(grid_file: Path, n_digits: int, encoding: Optional[str] = None, tier_names: bool = True, probe_size: int = DEFAULT_PROBE_SIZE) -> GridHeader:
+  """
+  Reads min-time, max-time, number of tiers and tier names of a TextGrid in long or short text format from its first `probe_size` bytes without reading the intervals.
+  The whole file is read if the header doesn't fit into `probe_size` bytes or if the tier names of a grid with more than one tier are requested (the name of each further tier follows the intervals of the previous tier).
+  """
+  if not isinstance(probe_size, int) or probe_size < 1:
+    raise ValueError("Parameter 'probe_size': Value needs to be an integer greater than zero!")
+  if encoding is None:
+    encoding = detectEncoding(grid_file)
+  with open(grid_file, mode="rb") as source:
+    data = source.read(probe_size)
+  if len(data) < probe_size:
+    # the file was read completely
+    content = data.decode(encoding)
+    return read_grid_header_from_lines(iter(content.splitlines(keepends=True)), n_digits, tier_names)
+
+  try:
+    # an incomplete character at the end is kept in the decoder
+    content = codecs.getincrementaldecoder(encoding)().decode(data, final=False)
+    lines = content.splitlines(keepends=True)
+    if lines and lines[-1].splitlines()[0] == lines[-1]:
+      # the last line is incomplete
+      lines.pop()
+    return read_grid_header_from_lines(iter(lines), n_digits, tier_names, max_tier_names=1)
+  except Exception:
+    # the header is longer than the probe or the names of further tiers are needed
+    pass
+
+  with open(grid_file, mode="r", encoding=encoding, newline="") as source:
+    content = source.read()
+  return read_grid_header_from_lines(iter(content.splitlines(keepends=True)), n_digits, tier_names)
+
+
+def read_grid_header_from_lines(lines: Iterator[str], n_digits: int, tier_names: bool, max_tier_names: Optional[int] = None) -> GridHeader:
+  """raises an `EOFError` if the names of more than `max_tier_names` tiers would need to be read"""
+  short, min_time, max_time, tier_count = read_header(lines, n_digits)
+  if not tier_names:
+    return min_time, max_time, tier_count, None
+  if max_tier_names is not None and tier_count > max_tier_names:
+    raise EOFError("Not all tier names are contained in the lines!")
+
+  names: List[str] = []
+  for tier_nr in range(tier_count):
+    is_interval_tier, name, _, _, count = read_tier_header(lines, short, n_digits)
+    names.append(name)
+    if tier_nr < tier_count - 1:
+      if is_interval_tier:
+        skip_intervals(lines, count, short)
+      else:
+        skip_points(lines, count, short)
+  return min_time, max_time, tier_count, tuple(names)
+
+
+def read_tier_from_lines(lines: Iterator[str], tier_name: str, n_digits: int) -> Optional[GridContent]:
+  short, min_time, max_time, tier_count = read_header(lines, n_digits)
+
+  result: Optional[GridContent] = None
+  for _ in range(tier_count):
+    is_interval_tier, name, tier_min_time, tier_max_time, count = read_tier_header(lines, short, n_digits)
+
+    if is_interval_tier:
+      if max_time is not None and tier_max_time is not None and tier_max_time > max_time:
+        raise ValueError(max_time)
+      if result is None and name == tier_name:
+        marks, max_times = read_intervals(lines, count, short, n_digits, tier_min_time, tier_max_time)
+        result = marks, max_times, min_time, max_time
+      else:
+        skip_intervals(lines, count, short)
+    else:
+      skip_points(lines, count, short)
+  return result
+
+
+def read_header(lines: Iterator[str], n_digits: int) -> Tuple[bool, float, float, int]:
+  """returns whether the grid is in short format, the min- and max-time of the grid and the number of tiers"""
+  header = next(lines, "")
+  match = RE_HEADER.match(header)
+  if match is None or not match.groups()[0].startswith("ooTextFile"):
+    raise TextGridError(
+      "The file could not be parsed as a Praat text file as it is lacking a proper header.")
+  short = "short" in match.groups()[0]
+  file_type = parse_string(next(lines, ""), short)
+  next(lines, "")
+  if file_type != "TextGrid":
+    raise TextGridError(
+      "The file could not be parsed as a TextGrid as it is lacking a proper header.")
+
+  first_line_beside_header = next(lines, "")
+  try:
+    parse_value(first_line_beside_header, short, n_digits)
+  except Exception:
+    short = True
+
+  min_time = parse_number(first_line_beside_header, short, n_digits)
+  max_time = parse_number(next(lines, ""), short, n_digits)
+  next(lines, "")
+  if short:
+    tier_count = int(next(lines, "").strip())
+  else:
+    tier_count = int(next(lines, "").strip().split()[2])
+    next(lines, "")
+  return short, min_time, max_time, tier_count
+
+
+def read_tier_header(lines: Iterator[str], short: bool, n_digits: int) -> Tuple[bool, str, float, float, int]:
+  """returns whether the tier is an interval tier, its name, min- and max-time and the number of intervals or points"""
+  if not short:
+    next(lines, "")
+  is_interval_tier = parse_value(next(lines, ""), short, n_digits) == "IntervalTier"
+  name = parse_value(next(lines, ""), short, n_digits)
+  tier_min_time = parse_value(next(lines, ""), short, n_digits)
+  tier_max_time = parse_value(next(lines, ""), short, n_digits)
+  count = int(parse_value(next(lines, ""), short, n_digits))
+  return is_interval_tier, name, tier_min_time, tier_max_time, count
+
+
+def read_intervals(lines: Iterator[str], count: int, short: bool, n_digits: int, tier_min_time: float, tier_max_time: float) -> Tuple[Tuple[str, ...], Tuple[float, ...]]:
+  marks: List[str] = []
+  max_times: List[float] = []
+  for _ in range(count):
+    if not short:
+      next(lines, "")
+    interval_min_time = parse_number(next(lines, ""), short, n_digits)
+    interval_max_time = parse_number(next(lines, ""), short, n_digits)
+    mark = read_mark(lines, short)
+    if interval_min_time < interval_max_time:
+      # same checks as in `IntervalTier.addInterval`
+      if interval_min_time < tier_min_time:
+        raise ValueError(tier_min_time)
+      if tier_max_time and interval_max_time > tier_max_time:
+        raise ValueError(tier_max_time)
+      marks.append(mark)
+      max_times.append(interval_max_time)
+  return tuple(marks), tuple(max_times)
+
+
+def skip_intervals(lines: Iterator[str], count: int, short: bool) -> None:
+  for _ in range(count):
+    if not short:
+      next(lines, "")
+    next(lines, "")
+    next(lines, "")
+    skip_mark(lines)
+
+
+def skip_points(lines: Iterator[str], count: int, short: bool) -> None:
+  for _ in range(count):
+    # `TextGrid.read` skips this line also in the short format
+    next(lines, "")
+    next(lines, "")
+    skip_mark(lines)
+
+
+def read_mark_lines(lines: Iterator[str], line: str) -> str:
+  """reads until the number of double-quotes is even because marks can contain line breaks"""
+  while line.count('"') % 2:
+    next_line = next(lines, "")
+    if not next_line:
+      raise EOFError('Bad entry: ' + line[:20] + '...')
+    line += next_line
+  return line
+
+
+def skip_mark(lines: Iterator[str]) -> None:
+  read_mark_lines(lines, next(lines, ""))
+
+
+def read_mark(lines: Iterator[str], short: bool) -> str:
+  line = next(lines, "")
+  if not short and not RE_LONG_MARK_START.match(line):
+    raise ValueError('Bad entry: ' + line)
+  line = read_mark_lines(lines, line)
+  if short:
+    entry = RE_SHORT_MARK.match(line)
+  else:
+    entry = RE_LONG_MARK.match(line)
+  # Praat escapes double-quotes by doubling them
+  return entry.groups()[-1].replace('""', '"')
+
+
+def parse_string(line: str, short: bool) -> str:
+  line = line.strip()
+  if short:
+    return line[1:-1]
+  match = RE_LONG_STRING.match(line)
+  return match.groups()[0]
+
+
+def parse_number(line: str, short: bool, n_digits: int) -> float:
+  line = line.strip()
+  if short:
+    return round(float(line), n_digits)
+  match = RE_LONG_NUMBER.match(line)
+  return round(float(match.groups()[0]), n_digits)
+
+
+def parse_value(line: str, short: bool, n_digits: int) -> Union[str, float]:
+  if '"' in line:
+    return parse_string(line, short)
+  return parse_number(line, short, n_digits)
@@ -0,0 +1,53 @@
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Generator, Iterable, Optional
+
+INDEX_FILE_NAME = "index.jsonl"
+
+
+@dataclass()
+class IndexEntry:
+  # name of the speaker directory
+  speaker_dir: str
+  speaker_name: str
+  speaker_gender: int
+  symbols_language: str
+  speaker_accent: Optional[str]
+  # relative to speaker directory
+  grid_file_rel: str
+  # relative to speaker directory
+  audio_file_rel: str
+  duration_s: float
+  symbols_count: int
+
+
+def get_index_path(directory: Path) -> Path:
+  return directory / INDEX_FILE_NAME
+
+
+def write_index(path: Path, entries: Iterable[IndexEntry]) -> None:
+  """writes the fields of each entry as one JSON array per line; paths are stored with forward slashes"""
+  path.parent.mkdir(parents=True, exist_ok=True)
+  with open(path, mode="w", encoding="UTF-8") as f:
+    for entry in entries:
+      f.write(json.dumps([
+        entry.speaker_dir, entry.speaker_name, entry.speaker_gender, entry.symbols_language, entry.speaker_accent,
+        Path(entry.grid_file_rel).as_posix(), Path(entry.audio_file_rel).as_posix(), entry.duration_s, entry.symbols_count,
+      ], ensure_ascii=False))
+      f.write("\n")
+
+
+def read_index(path: Path) -> Generator[IndexEntry, None, None]:
+  with open(path, mode="r", encoding="UTF-8") as f:
+    for line in f:
+      if line.strip() == "":
+        continue
+      speaker_dir, speaker_name, speaker_gender, symbols_language, speaker_accent, grid_file_rel, audio_file_rel, duration_s, symbols_count = json.loads(
+        line)
+      yield IndexEntry(
+        speaker_dir, speaker_name, speaker_gender, symbols_language, speaker_accent,
+        os.sep.join(PurePosixPath(grid_file_rel).parts), os.sep.join(PurePosixPath(audio_file_rel).parts),
+        duration_s, symbols_count,
+      )
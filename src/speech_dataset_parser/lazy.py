@@ -0,0 +1,142 @@
+import os
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+from typing import OrderedDict as ODType
+from typing import Tuple, Union
+
+from speech_dataset_parser.cache import ParseCache
+from speech_dataset_parser.grid_reader import read_tier
+from speech_dataset_parser.types import Entry, GridContent
+from speech_dataset_parser.vocabulary import SymbolVocabulary
+
+DEFAULT_LAZY_CACHE_SIZE = 16
+
+# same as `GridTask` in `parse`: speaker info (name, gender, language, accent), speaker directory, grid file and audio file (both relative to speaker directory)
+LazyTask = Tuple[Tuple[str, int, str, Optional[str]], Path, str, str]
+
+
+class LazyGridLoader():
+  """
+  Parses the grids of lazy entries and keeps the last `max_grids` parsed grids in memory (least recently used are removed first).
+  If `max_grids` is zero, each access parses the grid again.
+  """
+
+  def __init__(self, tier_name: str, n_digits: int, encoding: str, cache: Optional[ParseCache] = None, vocabulary: Optional[SymbolVocabulary] = None, max_grids: int = DEFAULT_LAZY_CACHE_SIZE) -> None:
+    if not isinstance(max_grids, int) or max_grids < 0:
+      raise ValueError("Parameter 'max_grids': Value needs to be an integer greater than or equal to zero!")
+    self.__tier_name = tier_name
+    self.__n_digits = n_digits
+    self.__encoding = encoding
+    self.__cache = cache
+    self.__vocabulary = vocabulary
+    self.__max_grids = max_grids
+    self.__grids: ODType[Path, GridContent] = OrderedDict()
+
+  def __len__(self) -> int:
+    return len(self.__grids)
+
+  def load(self, task: LazyTask) -> GridContent:
+    _, speaker_dir, grid_file_rel, _ = task
+    grid_file_abs = speaker_dir / grid_file_rel
+    content = self.__grids.get(grid_file_abs)
+    if content is not None:
+      self.__grids.move_to_end(grid_file_abs)
+      return content
+
+    content = self.__read(grid_file_abs)
+    if content is None:
+      raise ValueError(f"{grid_file_rel}: Tier '{self.__tier_name}' does not exist!")
+    if self.__vocabulary is not None:
+      symbols, intervals, min_time, max_time = content
+      content = self.__vocabulary.encode(symbols), intervals, min_time, max_time
+
+    if self.__max_grids > 0:
+      self.__grids[grid_file_abs] = content
+      if len(self.__grids) > self.__max_grids:
+        self.__grids.popitem(last=False)
+    return content
+
+  def __read(self, grid_file_abs: Path) -> Optional[GridContent]:
+    # same as `load_grid_task` in `parse` but the cache is written directly
+    if self.__cache is None:
+      return read_tier(grid_file_abs, self.__tier_name, self.__n_digits, self.__encoding)
+    stat = os.stat(grid_file_abs)
+    content = self.__cache.get(grid_file_abs, stat.st_mtime_ns, stat.st_size, self.__tier_name, self.__n_digits)
+    if content is None:
+      content = read_tier(grid_file_abs, self.__tier_name, self.__n_digits, self.__encoding)
+      if content is not None:
+        self.__cache.put(grid_file_abs, stat.st_mtime_ns, stat.st_size, self.__tier_name, self.__n_digits, content)
+    return content
+
+
+class LazyEntry():
+  """
+  Variant of `Entry` whose grid is parsed by the shared `LazyGridLoader` when `symbols`, `intervals`, `min_time` or `max_time` are accessed and the grid is not one of the recently parsed grids.
+  The speaker information and paths are available without parsing; a missing tier raises a `ValueError` on access.
+  """
+  __slots__ = (
+    "__task",
+    "__loader",
+  )
+
+  def __init__(self, task: LazyTask, loader: LazyGridLoader) -> None:
+    self.__task = task
+    self.__loader = loader
+
+  @property
+  def symbols(self) -> Union[Tuple[str, ...], array]:
+    return self.__loader.load(self.__task)[0]
+
+  @property
+  def intervals(self) -> Tuple[float, ...]:
+    return self.__loader.load(self.__task)[1]
+
+  @property
+  def min_time(self) -> float:
+    return self.__loader.load(self.__task)[2]
+
+  @property
+  def max_time(self) -> float:
+    return self.__loader.load(self.__task)[3]
+
+  @property
+  def symbols_language(self) -> str:
+    return self.__task[0][2]
+
+  @property
+  def speaker_name(self) -> str:
+    return self.__task[0][0]
+
+  @property
+  def speaker_accent(self) -> Optional[str]:
+    return self.__task[0][3]
+
+  @property
+  def speaker_gender(self) -> int:
+    return self.__task[0][1]
+
+  @property
+  def speaker_dir(self) -> Path:
+    return self.__task[1]
+
+  @property
+  def audio_file_rel(self) -> str:
+    return self.__task[3]
+
+  @property
+  def audio_file_abs(self) -> Path:
+    return self.__task[1] / self.__task[3]
+
+  @property
+  def grid_file_abs(self) -> Path:
+    return self.__task[1] / self.__task[2]
+
+  def __repr__(self) -> str:
+    return f"LazyEntry(speaker_name={self.speaker_name!r}, audio_file_abs={self.audio_file_abs!r})"
+
+  def to_entry(self) -> Entry:
+    symbols, intervals, min_time, max_time = self.__loader.load(self.__task)
+    return Entry(symbols, intervals, self.symbols_language, self.speaker_name,
+                 self.speaker_accent, self.speaker_gender, self.audio_file_abs, min_time, max_time)
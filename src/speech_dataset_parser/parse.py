@@ -1,12 +1,29 @@
+import os
+from collections import deque
+from contextlib import closing
+from functools import partial
 from logging import getLogger
+from multiprocessing import Pool
+from multiprocessing.pool import Pool as PoolType
 from pathlib import Path
-from typing import Generator, Iterable, Optional, cast
+from queue import Full, Queue
+from sys import intern
+from threading import Event, Semaphore, Thread
+from typing import (Any, Callable, Deque, Dict, FrozenSet, Generator, Iterable, List, Optional,
+                    Tuple, TypeVar, Union)
+from zlib import crc32
 
-from textgrid import Interval, IntervalTier, TextGrid
 from tqdm import tqdm
 
-from speech_dataset_parser.types import GENDERS, Entry
-from speech_dataset_parser.utils import get_files_dict, get_subfolders
+from speech_dataset_parser.cache import ParseCache
+from speech_dataset_parser.grid_reader import probe_grid, read_tier
+from speech_dataset_parser.index import get_index_path, read_index
+from speech_dataset_parser.lazy import DEFAULT_LAZY_CACHE_SIZE, LazyEntry, LazyGridLoader
+from speech_dataset_parser.snapshot import FileSnapshot, ParseSnapshot, SpeakerSnapshot
+from speech_dataset_parser.types import GENDERS, CompactEntry, Entry, GridContent
+from speech_dataset_parser.utils import (are_directory_mtimes_unchanged, get_directory_mtimes,
+                                         get_files_dicts, get_subfolders)
+from speech_dataset_parser.vocabulary import SymbolVocabulary
 
 PARTS_SEP = ";"
 DEFAULT_N_DIGITS = 16
@@ -14,9 +31,120 @@ DEFAULT_TIER_NAME = "transcription"
 DEFAULT_ENCODING = "UTF-8"
 DEFAULT_AUDIO_FORMAT = ".wav"
 DEFAULT_SILENT = False
+DEFAULT_N_JOBS = 1
+DEFAULT_CHUNKSIZE = 16
+DEFAULT_COMPACT = False
+DEFAULT_USE_INDEX = False
+DEFAULT_LAZY = False
+DEFAULT_PREFETCH = 0
+# seconds after which the prefetching thread checks again whether it should stop
+PREFETCH_STOP_CHECK_INTERVAL = 0.1
+SHARD_BY_SPEAKER = "speaker"
+SHARD_BY_UTTERANCE = "utterance"
+SHARD_BY = (SHARD_BY_SPEAKER, SHARD_BY_UTTERANCE)
+DEFAULT_SHARD_INDEX = 0
+DEFAULT_NUM_SHARDS = 1
+DEFAULT_SHARD_BY = SHARD_BY_UTTERANCE
 
+# name, gender, language, accent
+SpeakerInfo = Tuple[str, int, str, Optional[str]]
+# speaker info, speaker directory, grid file and audio file (both relative to speaker directory)
+GridTask = Tuple[SpeakerInfo, Path, str, str]
+# modification time (ns), size
+GridStat = Tuple[int, int]
+# content (None if the tier doesn't exist), stats of the grid (None if the content was taken from the cache)
+GridResult = Tuple[Optional[GridContent], Optional[GridStat]]
+# returns whether the speaker (directory name, info) is included
+SpeakerFilter = Callable[[str, SpeakerInfo], bool]
+# returns whether the file (speaker directory name, grid file relative to the speaker directory) is included
+FileFilter = Callable[[str, str], bool]
 
-def parse_dataset(directory: Path, tier_name: str = DEFAULT_TIER_NAME, n_digits: int = DEFAULT_N_DIGITS, encoding: str = DEFAULT_ENCODING, audio_format: str = DEFAULT_AUDIO_FORMAT, silent: bool = DEFAULT_SILENT) -> Generator[Entry, None, None]:
+T = TypeVar("T")
+
+
+def parse_dataset(directory: Path, tier_name: str = DEFAULT_TIER_NAME, n_digits: int = DEFAULT_N_DIGITS, encoding: str = DEFAULT_ENCODING, audio_format: str = DEFAULT_AUDIO_FORMAT, silent: bool = DEFAULT_SILENT, n_jobs: int = DEFAULT_N_JOBS, chunksize: int = DEFAULT_CHUNKSIZE, cache: Optional[ParseCache] = None, compact: bool = DEFAULT_COMPACT, vocabulary: Optional[SymbolVocabulary] = None, use_index: bool = DEFAULT_USE_INDEX, shard_index: int = DEFAULT_SHARD_INDEX, num_shards: int = DEFAULT_NUM_SHARDS, shard_by: str = DEFAULT_SHARD_BY, snapshot: Optional[ParseSnapshot] = None, speaker_filter: Optional[SpeakerFilter] = None, lazy: bool = DEFAULT_LAZY, lazy_cache_size: int = DEFAULT_LAZY_CACHE_SIZE, min_duration: Optional[float] = None, max_duration: Optional[float] = None, prefetch: int = DEFAULT_PREFETCH) -> Generator[Union[Entry, CompactEntry, LazyEntry], None, None]:
+  validate_parameters(directory, tier_name, n_digits, encoding, cache, vocabulary)
+
+  if not isinstance(n_jobs, int) or n_jobs < 1:
+    raise ValueError("Parameter 'n_jobs': Value needs to be an integer greater than zero!")
+
+  if not isinstance(chunksize, int) or chunksize < 1:
+    raise ValueError("Parameter 'chunksize': Value needs to be an integer greater than zero!")
+
+  if not isinstance(prefetch, int) or prefetch < 0:
+    raise ValueError("Parameter 'prefetch': Value needs to be an integer greater than or equal to zero!")
+
+  validate_shard_parameters(shard_index, num_shards, shard_by)
+  validate_speaker_filter(speaker_filter)
+  validate_duration_range(min_duration, max_duration)
+
+  if lazy and compact:
+    raise ValueError("Parameter 'lazy': Value can't be used together with 'compact'!")
+
+  if snapshot is not None and not isinstance(snapshot, ParseSnapshot):
+    raise ValueError("Parameter 'snapshot': Value needs to be of type 'ParseSnapshot'!")
+
+  if snapshot is not None and use_index:
+    raise ValueError("Parameter 'snapshot': Value can't be used together with 'use_index'!")
+
+  if snapshot is not None and (min_duration is not None or max_duration is not None):
+    # the snapshot would contain the grids which were excluded by their duration
+    raise ValueError("Parameter 'snapshot': Value can't be used together with 'min_duration' or 'max_duration'!")
+
+  if snapshot is None:
+    tasks = get_tasks(directory, audio_format, silent, use_index,
+                      shard_index, num_shards, shard_by, speaker_filter)
+  else:
+    tasks = get_snapshot_tasks(directory, tier_name, n_digits, audio_format, silent,
+                               snapshot, shard_index, num_shards, shard_by, speaker_filter)
+  if min_duration is not None or max_duration is not None:
+    tasks = get_tasks_in_duration_range(tasks, n_digits, encoding, min_duration, max_duration)
+  method = partial(load_grid_task, tier_name=tier_name,
+                   n_digits=n_digits, encoding=encoding, cache=cache)
+  close_prefetch_cache: Optional[Callable[[], None]] = None
+  if prefetch > 0 and n_jobs == 1 and cache is not None:
+    # the connection of the cache can only be used from the thread which opened it, therefore the prefetching thread reads from its own connection and only this thread writes
+    prefetch_cache = ParseCache(cache.path, cache.max_entries)
+    method = partial(load_grid_task, tier_name=tier_name,
+                     n_digits=n_digits, encoding=encoding, cache=prefetch_cache)
+    close_prefetch_cache = prefetch_cache.close
+
+  try:
+    if lazy:
+      # the grids are parsed on access of the entries, therefore `n_jobs` is not used and only the scanning is prefetched
+      loader = LazyGridLoader(tier_name, n_digits, encoding, cache, vocabulary, lazy_cache_size)
+      if prefetch > 0:
+        tasks = get_prefetched_items(tasks, prefetch)
+      with closing(tasks):
+        yield from (LazyEntry(task, loader) for task in tasks)
+    elif n_jobs == 1:
+      results = ((task, method(task)) for task in tasks)
+      if prefetch > 0:
+        results = get_prefetched_items(results, prefetch, close_prefetch_cache)
+      with closing(results):
+        yield from get_entries(results, tier_name, n_digits, cache, compact, vocabulary)
+    else:
+      # the pool is terminated if the generator is closed early
+      with Pool(processes=n_jobs) as pool:
+        if prefetch > 0:
+          # besides the prefetched entries, each process works on at most one chunk
+          results = get_pool_results(pool, method, tasks, chunksize, max_pending=n_jobs * chunksize)
+          results = get_prefetched_items(results, prefetch)
+        else:
+          results = get_pool_results(pool, method, tasks, chunksize)
+        # the prefetching thread is stopped before the pool is terminated
+        with closing(results):
+          yield from get_entries(results, tier_name, n_digits, cache, compact, vocabulary)
+  finally:
+    if cache is not None:
+      cache.commit()
+
+  # only reached if all entries were returned
+  if snapshot is not None:
+    snapshot.commit()
+
+
+def validate_parameters(directory: Path, tier_name: str, n_digits: int, encoding: str, cache: Optional[ParseCache], vocabulary: Optional[SymbolVocabulary]) -> None:
   if not directory.is_dir():
     raise ValueError("Parameter 'directory': Directory was not found!")
 
@@ -29,7 +157,278 @@ def parse_dataset(directory: Path, tier_name: str = DEFAULT_TIER_NAME, n_digits:
   if not isinstance(encoding, str):
     raise ValueError("Parameter 'encoding': Value needs to be of type 'str'!")
 
+  if cache is not None and not isinstance(cache, ParseCache):
+    raise ValueError("Parameter 'cache': Value needs to be of type 'ParseCache'!")
+
+  if vocabulary is not None and not isinstance(vocabulary, SymbolVocabulary):
+    raise ValueError("Parameter 'vocabulary': Value needs to be of type 'SymbolVocabulary'!")
+
+
+def validate_shard_parameters(shard_index: int, num_shards: int, shard_by: str) -> None:
+  if not isinstance(num_shards, int) or num_shards < 1:
+    raise ValueError("Parameter 'num_shards': Value needs to be an integer greater than zero!")
+
+  if not isinstance(shard_index, int) or shard_index not in range(num_shards):
+    raise ValueError("Parameter 'shard_index': Value needs to be in interval [0, num_shards)!")
+
+  if shard_by not in SHARD_BY:
+    raise ValueError(f"Parameter 'shard_by': Value needs to be one of {', '.join(SHARD_BY)}!")
+
+
+def validate_speaker_filter(speaker_filter: Optional[SpeakerFilter]) -> None:
+  if speaker_filter is not None and not callable(speaker_filter):
+    raise ValueError("Parameter 'speaker_filter': Value needs to be callable!")
+
+
+def validate_duration_range(min_duration: Optional[float], max_duration: Optional[float]) -> None:
+  for parameter_name, value in (("min_duration", min_duration), ("max_duration", max_duration)):
+    if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0):
+      raise ValueError(f"Parameter '{parameter_name}': Value needs to be a number greater than or equal to zero!")
+
+  if min_duration is not None and max_duration is not None and min_duration > max_duration:
+    raise ValueError("Parameter 'max_duration': Value needs to be greater than or equal to 'min_duration'!")
+
+
+def get_tasks_in_duration_range(tasks: Iterable[GridTask], n_digits: int, encoding: str, min_duration: Optional[float], max_duration: Optional[float]) -> Generator[GridTask, None, None]:
+  """yields the tasks whose grid duration (max-time minus min-time) is in [min_duration, max_duration]; only the header of each grid is read"""
+  for task in tasks:
+    _, speaker_dir, grid_file_rel, _ = task
+    min_time, max_time, _, _ = probe_grid(speaker_dir / grid_file_rel, n_digits, encoding, tier_names=False)
+    duration = max_time - min_time
+    if min_duration is not None and duration < min_duration:
+      continue
+    if max_duration is not None and duration > max_duration:
+      continue
+    yield task
+
+
+def get_tasks(directory: Path, audio_format: str, silent: bool, use_index: bool, shard_index: int = DEFAULT_SHARD_INDEX, num_shards: int = DEFAULT_NUM_SHARDS, shard_by: str = DEFAULT_SHARD_BY, speaker_filter: Optional[SpeakerFilter] = None) -> Generator[GridTask, None, None]:
+  include_speaker, include_file = get_shard_filters(shard_index, num_shards, shard_by, speaker_filter)
+  index_path = get_index_path(directory)
+  if use_index and index_path.is_file():
+    return get_index_tasks(directory, index_path, audio_format, silent, include_speaker, include_file)
+  if use_index:
+    getLogger(__name__).warning(f"Index file \"{index_path.absolute()}\" was not found! Scanning dataset instead.")
+  return get_grid_tasks(directory, audio_format, silent, include_speaker, include_file)
+
+
+def get_shard_filters(shard_index: int, num_shards: int, shard_by: str, speaker_filter: Optional[SpeakerFilter] = None) -> Tuple[Optional[SpeakerFilter], Optional[FileFilter]]:
+  """returns the filters of the shard combined with `speaker_filter`; the directories of excluded speakers are not scanned"""
+  include_speaker: Optional[SpeakerFilter] = speaker_filter
+  include_file: Optional[FileFilter] = None
+  if num_shards > 1:
+    # the files of other shards are neither scanned nor checked
+    if shard_by == SHARD_BY_SPEAKER:
+      include_shard_speaker = partial(is_speaker_in_shard, shard_index=shard_index, num_shards=num_shards)
+      if include_speaker is None:
+        include_speaker = include_shard_speaker
+      else:
+        include_speaker = partial(is_speaker_included_by_all, speaker_filters=(include_shard_speaker, include_speaker))
+    else:
+      include_file = partial(is_file_in_shard, shard_index=shard_index, num_shards=num_shards)
+  return include_speaker, include_file
+
+
+def is_speaker_included_by_all(speaker_dir_name: str, speaker_info: SpeakerInfo, speaker_filters: Tuple[SpeakerFilter, ...]) -> bool:
+  return all(speaker_filter(speaker_dir_name, speaker_info) for speaker_filter in speaker_filters)
+
+
+def create_speaker_filter(speaker_names: Optional[Iterable[str]] = None, languages: Optional[Iterable[str]] = None, genders: Optional[Iterable[int]] = None, accents: Optional[Iterable[Optional[str]]] = None) -> SpeakerFilter:
+  """returns a filter which includes only speakers whose name, language, gender and accent are in the given allow-lists; `None` allows all values and `None` in `accents` allows speakers without accent"""
+  return partial(
+    is_speaker_allowed,
+    speaker_names=get_allow_list(speaker_names, "speaker_names"),
+    languages=get_allow_list(languages, "languages"),
+    genders=get_allow_list(genders, "genders"),
+    accents=get_allow_list(accents, "accents"),
+  )
+
+
+def get_allow_list(values: Optional[Iterable], parameter_name: str) -> Optional[FrozenSet]:
+  if values is None:
+    return None
+  if isinstance(values, str):
+    raise ValueError(f"Parameter '{parameter_name}': Value needs to be a collection of values and not a single string!")
+  return frozenset(values)
+
+
+def is_speaker_allowed(speaker_dir_name: str, speaker_info: SpeakerInfo, speaker_names: Optional[FrozenSet[str]], languages: Optional[FrozenSet[str]], genders: Optional[FrozenSet[int]], accents: Optional[FrozenSet[Optional[str]]]) -> bool:
+  speaker_name, speaker_gender, speaker_lang, speaker_accent = speaker_info
+  return (
+    (speaker_names is None or speaker_name in speaker_names)
+    and (languages is None or speaker_lang in languages)
+    and (genders is None or speaker_gender in genders)
+    and (accents is None or speaker_accent in accents)
+  )
+
+
+def get_shard(key: str, num_shards: int) -> int:
+  # crc32 is the same on all platforms and for all processes in contrast to `hash`
+  return crc32(key.encode("UTF-8")) % num_shards
+
+
+def is_speaker_in_shard(speaker_dir_name: str, speaker_info: SpeakerInfo, shard_index: int, num_shards: int) -> bool:
+  return get_shard(speaker_dir_name, num_shards) == shard_index
+
+
+def is_file_in_shard(speaker_dir_name: str, grid_file_rel: str, shard_index: int, num_shards: int) -> bool:
+  key = f"{speaker_dir_name}/{grid_file_rel.replace(os.sep, '/')}"
+  return get_shard(key, num_shards) == shard_index
+
+
+def get_pool_results(pool: PoolType, method: Callable[[GridTask], GridResult], tasks: Iterable[GridTask], chunksize: int, max_pending: Optional[int] = None) -> Generator[Tuple[GridTask, GridResult], None, None]:
+  """returns the results in order of the tasks; if `max_pending` is given, at most this number of tasks is sent to the pool but not yet returned (needs to be at least `chunksize`)"""
+  # the tasks are not sent back from the workers, so that the speaker information is shared between all entries of a speaker
+  sent_tasks: Deque[GridTask] = deque()
+  pending = None if max_pending is None else Semaphore(max_pending)
+  stop = Event()
+
+  def register_tasks() -> Generator[GridTask, None, None]:
+    # is iterated in the task handler thread of the pool
+    for task in tasks:
+      if pending is not None:
+        # `imap` has no backpressure, therefore the task handler waits until the results were taken
+        while not pending.acquire(timeout=PREFETCH_STOP_CHECK_INTERVAL):
+          if stop.is_set():
+            return
+      sent_tasks.append(task)
+      yield task
+
+  try:
+    # imap keeps the order of the tasks
+    for result in pool.imap(method, register_tasks(), chunksize=chunksize):
+      if pending is not None:
+        pending.release()
+      yield sent_tasks.popleft(), result
+  finally:
+    # the task handler is not blocked anymore when the pool is terminated
+    stop.set()
+
+
+def get_prefetched_items(items: Iterable[T], prefetch: int, on_stop: Optional[Callable[[], None]] = None) -> Generator[T, None, None]:
+  """
+  Iterates `items` in a background thread which stays up to `prefetch` items ahead, so that scanning and reading overlap with the work of the consumer.
+  Exceptions of the thread are raised on the consumer side. If the generator is closed early, the thread finishes its current item and is stopped; `on_stop` is called in the thread when it stops.
+  """
+  # contains (is last, item or exception)
+  queue: Queue = Queue(maxsize=prefetch)
+  stop = Event()
+
+  def put(result: Tuple[bool, Any]) -> bool:
+    while not stop.is_set():
+      try:
+        queue.put(result, timeout=PREFETCH_STOP_CHECK_INTERVAL)
+        return True
+      except Full:
+        continue
+    return False
+
+  def produce() -> None:
+    try:
+      for item in items:
+        if not put((False, item)):
+          return
+      put((True, None))
+    except BaseException as ex:
+      put((True, ex))
+    finally:
+      if hasattr(items, "close"):
+        items.close()
+      if on_stop is not None:
+        on_stop()
+
+  thread = Thread(target=produce, name="parse_dataset-prefetch", daemon=True)
+  thread.start()
+  try:
+    while True:
+      is_last, result = queue.get()
+      if is_last:
+        if result is not None:
+          raise result
+        break
+      yield result
+  finally:
+    stop.set()
+    thread.join()
+
+
+def get_entries(results: Iterable[Tuple[GridTask, GridResult]], tier_name: str, n_digits: int, cache: Optional[ParseCache], compact: bool, vocabulary: Optional[SymbolVocabulary]) -> Generator[Union[Entry, CompactEntry], None, None]:
+  logger = getLogger(__name__)
+  for task, (content, grid_stat) in results:
+    _, speaker_dir, grid_file_rel, _ = task
+    if content is None:
+      logger.warning(f"{grid_file_rel}: Tier '{tier_name}' does not exist! Ignored.")
+      continue
+    if cache is not None and grid_stat is not None:
+      # only the main process writes to the cache
+      mtime_ns, size = grid_stat
+      cache.put(speaker_dir / grid_file_rel, mtime_ns, size, tier_name, n_digits, content)
+    yield create_entry(task, content, compact, vocabulary)
+
+
+def create_entry(task: GridTask, content: GridContent, compact: bool, vocabulary: Optional[SymbolVocabulary]) -> Union[Entry, CompactEntry]:
+  speaker_info, speaker_dir, _, audio_file_rel = task
+  speaker_name, speaker_gender, speaker_lang, speaker_accent = speaker_info
+  symbols, intervals, min_time, max_time = content
+  if vocabulary is not None:
+    symbols = vocabulary.encode(symbols)
+  if compact:
+    result = CompactEntry(symbols, intervals, speaker_lang, speaker_name, speaker_accent,
+                          speaker_gender, speaker_dir, audio_file_rel, min_time, max_time)
+  else:
+    result = Entry(symbols, intervals, speaker_lang, speaker_name, speaker_accent,
+                   speaker_gender, speaker_dir / audio_file_rel, min_time, max_time)
+  return result
+
+
+def get_grid_tasks(directory: Path, audio_format: str, silent: bool, include_speaker: Optional[SpeakerFilter] = None, include_file: Optional[FileFilter] = None) -> Generator[GridTask, None, None]:
+  speaker_dirs = get_subfolders(directory)
+  iterator = speaker_dirs
+  if not silent:
+    iterator = tqdm(speaker_dirs, desc="Parsing dataset", unit=" speaker(s)")
+
+  for speaker_dir in iterator:
+    yield from get_speaker_tasks(speaker_dir, directory, audio_format, include_speaker, include_file)
+
+
+def get_speaker_tasks(speaker_dir: Path, directory: Path, audio_format: str, include_speaker: Optional[SpeakerFilter], include_file: Optional[FileFilter]) -> List[GridTask]:
   logger = getLogger(__name__)
+  result: List[GridTask] = []
+
+  speaker_info = parse_speaker_dir_name(speaker_dir, directory)
+  if speaker_info is None:
+    return result
+
+  if include_speaker is not None and not include_speaker(speaker_dir.name, speaker_info):
+    return result
+
+  audio_files, grid_files = get_files_dicts(speaker_dir, ({audio_format}, {".TextGrid"}))
+
+  for file_stem, grid_file_rel in grid_files.items():
+    if include_file is not None and not include_file(speaker_dir.name, grid_file_rel):
+      continue
+
+    if file_stem not in audio_files:
+      logger.warning(f"{grid_file_rel}: Audio file was not found. Ignored.")
+      continue
+
+    result.append((speaker_info, speaker_dir, grid_file_rel, audio_files[file_stem]))
+  return result
+
+
+def get_snapshot_tasks(directory: Path, tier_name: str, n_digits: int, audio_format: str, silent: bool, snapshot: ParseSnapshot, shard_index: int = DEFAULT_SHARD_INDEX, num_shards: int = DEFAULT_NUM_SHARDS, shard_by: str = DEFAULT_SHARD_BY, speaker_filter: Optional[SpeakerFilter] = None) -> Generator[GridTask, None, None]:
+  """
+  yields the tasks of the grids which were added or modified since the last run in the same order as `get_grid_tasks`;
+  speaker directories whose modification times are unchanged are not listed again; the new state is staged in the snapshot after the last task
+  """
+  include_speaker, include_file = get_shard_filters(shard_index, num_shards, shard_by, speaker_filter)
+  # the snapshot of another shard or with other parameters is not used
+  parameters = tier_name, n_digits, audio_format, str(directory.absolute()), shard_index, num_shards, shard_by
+  previous_speakers = snapshot.get_speakers(parameters)
+  speakers: Dict[str, SpeakerSnapshot] = {}
+  added: List[Path] = []
+  modified: List[Path] = []
+  deleted: List[Path] = []
 
   speaker_dirs = get_subfolders(directory)
   iterator = speaker_dirs
@@ -37,56 +436,161 @@ def parse_dataset(directory: Path, tier_name: str = DEFAULT_TIER_NAME, n_digits:
     iterator = tqdm(speaker_dirs, desc="Parsing dataset", unit=" speaker(s)")
 
   for speaker_dir in iterator:
-    speaker_parts = speaker_dir.name.split(PARTS_SEP)
-    if len(speaker_parts) not in {3, 4}:
-      logger.warning(
-        f"{str(speaker_dir.relative_to(directory))}: Directory '{speaker_dir.name}' couldn't be parsed because not all information are provided in the name. Ignored.")
+    speaker_info = parse_speaker_dir_name(speaker_dir, directory)
+    if speaker_info is None:
       continue
-    speaker_name = speaker_parts[0]
-    speaker_gender = speaker_parts[1]
-    if not speaker_gender.isnumeric():
-      logger.warning(
-        f"{str(speaker_dir.relative_to(directory))}: Gender code '{speaker_gender}' needs to be a number. Ignored.")
+    if include_speaker is not None and not include_speaker(speaker_dir.name, speaker_info):
+      # the state of excluded speakers is kept, so that their files are neither reported as deleted now nor as added in a later run without filter
+      if speaker_dir.name in previous_speakers:
+        speakers[speaker_dir.name] = previous_speakers[speaker_dir.name]
       continue
-    speaker_gender = int(speaker_gender)
-    if not speaker_gender in GENDERS:
-      logger.warning(
-        f"{str(speaker_dir.relative_to(directory))}: Gender code '{speaker_gender}' not recognized. Ignored.")
+
+    previous_speaker = previous_speakers.get(speaker_dir.name)
+    previous_files: Dict[str, FileSnapshot] = {}
+    if previous_speaker is not None:
+      previous_directory_mtimes, previous_files = previous_speaker
+    if previous_speaker is not None and are_directory_mtimes_unchanged(speaker_dir, previous_directory_mtimes):
+      # no file was added, removed or renamed
+      directory_mtimes = previous_directory_mtimes
+      speaker_tasks = [
+        (speaker_info, speaker_dir, grid_file_rel, audio_file_rel)
+        for grid_file_rel, (audio_file_rel, _, _) in previous_files.items()
+      ]
+    else:
+      # the times are taken before listing, so that files added meanwhile are found in the next run
+      directory_mtimes = get_directory_mtimes(speaker_dir)
+      speaker_tasks = get_speaker_tasks(speaker_dir, directory, audio_format, None, include_file)
+
+    files: Dict[str, FileSnapshot] = {}
+    for task in speaker_tasks:
+      _, _, grid_file_rel, audio_file_rel = task
+      try:
+        stat = os.stat(speaker_dir / grid_file_rel)
+      except FileNotFoundError:
+        continue
+      files[grid_file_rel] = audio_file_rel, stat.st_mtime_ns, stat.st_size
+      previous_file = previous_files.get(grid_file_rel)
+      if previous_file is None:
+        added.append(speaker_dir / audio_file_rel)
+      elif previous_file != files[grid_file_rel]:
+        modified.append(speaker_dir / audio_file_rel)
+      else:
+        continue
+      yield task
+
+    deleted.extend(
+      speaker_dir / audio_file_rel
+      for grid_file_rel, (audio_file_rel, _, _) in previous_files.items()
+      if grid_file_rel not in files
+    )
+    speakers[speaker_dir.name] = directory_mtimes, files
+
+  for speaker_dir_name, (_, previous_files) in previous_speakers.items():
+    if speaker_dir_name not in speakers:
+      deleted.extend(
+        directory / speaker_dir_name / audio_file_rel
+        for audio_file_rel, _, _ in previous_files.values()
+      )
+
+  snapshot.stage(parameters, speakers, added, modified, deleted)
+
+
+def get_index_tasks(directory: Path, index_path: Path, audio_format: str, silent: bool, include_speaker: Optional[SpeakerFilter] = None, include_file: Optional[FileFilter] = None, check_files: bool = True) -> Generator[GridTask, None, None]:
+  """yields the tasks in the same order as `get_grid_tasks`; the files are checked only when their task is reached"""
+  index_entries = [
+    entry for entry in read_index(index_path)
+    if os.path.splitext(entry.audio_file_rel)[1].lower() == audio_format.lower()
+  ]
+  index_entries.sort(key=lambda entry: (entry.speaker_dir, os.path.splitext(entry.grid_file_rel)[0]))
+
+  iterator = index_entries
+  if not silent:
+    iterator = tqdm(index_entries, desc="Parsing dataset", unit=" file(s)")
+
+  speakers: Dict[str, Tuple[SpeakerInfo, Path, bool]] = {}
+  for entry in iterator:
+    if entry.speaker_dir not in speakers:
+      # the strings are shared between all entries of all speakers
+      speaker_info = (intern(entry.speaker_name), entry.speaker_gender, intern(entry.symbols_language),
+                      None if entry.speaker_accent is None else intern(entry.speaker_accent))
+      included = include_speaker is None or include_speaker(entry.speaker_dir, speaker_info)
+      speakers[entry.speaker_dir] = speaker_info, directory / entry.speaker_dir, included
+    speaker_info, speaker_dir, included = speakers[entry.speaker_dir]
+    if not included:
       continue
 
-    speaker_lang = speaker_parts[2]
-    # TODO check lang code better
-    if len(speaker_lang) != 3 or not speaker_lang.islower():
-      logger.warning(
-        f"{str(speaker_dir.relative_to(directory))}: Language code '{speaker_lang}' is not valid (needs to be three lower-case letters). Ignored.")
+    if include_file is not None and not include_file(entry.speaker_dir, entry.grid_file_rel):
       continue
 
-    speaker_accent = None
-    if len(speaker_parts) == 4:
-      speaker_accent = speaker_parts[3]
+    task = speaker_info, speaker_dir, entry.grid_file_rel, entry.audio_file_rel
+    if check_files and not index_task_files_exist(task):
+      continue
 
-    audio_files = get_files_dict(speaker_dir, {audio_format})
-    grid_files = get_files_dict(speaker_dir, {".TextGrid"})
+    yield task
 
-    for file_stem, grid_file_rel in grid_files.items():
-      if file_stem not in audio_files:
-        logger.warning(f"{str(grid_file_rel)}: Audio file was not found. Ignored.")
-        continue
 
-      grid_file_abs = speaker_dir / grid_file_rel
-      grid = TextGrid()
-      grid.read(grid_file_abs, n_digits, encoding)
-      tier = cast(Optional[IntervalTier], grid.getFirst(tier_name))
-      if tier is None:
-        logger.warning(f"{str(grid_file_rel)}: Tier '{tier_name}' does not exist! Ignored.")
-        continue
-      symbols = (interval.mark for interval in cast(Iterable[Interval], tier.intervals))
-      symbols = tuple(symbol if symbol is not None else "" for symbol in symbols)
-      intervals = tuple(interval.maxTime for interval in cast(Iterable[Interval], tier.intervals))
-      assert len(symbols) == len(intervals)
+def index_task_files_exist(task: GridTask) -> bool:
+  logger = getLogger(__name__)
+  _, speaker_dir, grid_file_rel, audio_file_rel = task
 
-      audio_path = speaker_dir / audio_files[file_stem]
+  if not os.path.isfile(speaker_dir / grid_file_rel):
+    logger.warning(f"{grid_file_rel}: Grid file was not found. Ignored.")
+    return False
 
-      result = Entry(symbols, intervals, speaker_lang, speaker_name,
-                     speaker_accent, speaker_gender, audio_path, grid.minTime, grid.maxTime)
-      yield result
+  if not os.path.isfile(speaker_dir / audio_file_rel):
+    logger.warning(f"{grid_file_rel}: Audio file was not found. Ignored.")
+    return False
+  return True
+
+
+def parse_speaker_dir_name(speaker_dir: Path, directory: Path) -> Optional[SpeakerInfo]:
+  logger = getLogger(__name__)
+
+  speaker_parts = speaker_dir.name.split(PARTS_SEP)
+  if len(speaker_parts) not in {3, 4}:
+    logger.warning(
+      f"{str(speaker_dir.relative_to(directory))}: Directory '{speaker_dir.name}' couldn't be parsed because not all information are provided in the name. Ignored.")
+    return None
+  speaker_name = speaker_parts[0]
+  speaker_gender = speaker_parts[1]
+  if not speaker_gender.isnumeric():
+    logger.warning(
+      f"{str(speaker_dir.relative_to(directory))}: Gender code '{speaker_gender}' needs to be a number. Ignored.")
+    return None
+  speaker_gender = int(speaker_gender)
+  if not speaker_gender in GENDERS:
+    logger.warning(
+      f"{str(speaker_dir.relative_to(directory))}: Gender code '{speaker_gender}' not recognized. Ignored.")
+    return None
+
+  speaker_lang = speaker_parts[2]
+  # TODO check lang code better
+  if len(speaker_lang) != 3 or not speaker_lang.islower():
+    logger.warning(
+      f"{str(speaker_dir.relative_to(directory))}: Language code '{speaker_lang}' is not valid (needs to be three lower-case letters). Ignored.")
+    return None
+
+  speaker_accent = None
+  if len(speaker_parts) == 4:
+    speaker_accent = intern(speaker_parts[3])
+
+  # the strings are shared between all entries of all speakers
+  return intern(speaker_name), speaker_gender, intern(speaker_lang), speaker_accent
+
+
+def load_grid_task(task: GridTask, tier_name: str, n_digits: int, encoding: str, cache: Optional[ParseCache]) -> GridResult:
+  _, speaker_dir, grid_file_rel, _ = task
+  grid_file_abs = speaker_dir / grid_file_rel
+  if cache is None:
+    content = load_grid(grid_file_abs, tier_name, n_digits, encoding)
+    return content, None
+  stat = grid_file_abs.stat()
+  content = cache.get(grid_file_abs, stat.st_mtime_ns, stat.st_size, tier_name, n_digits)
+  if content is not None:
+    return content, None
+  content = load_grid(grid_file_abs, tier_name, n_digits, encoding)
+  return content, (stat.st_mtime_ns, stat.st_size)
+
+
+def load_grid(grid_file_abs: Path, tier_name: str, n_digits: int, encoding: str) -> Optional[GridContent]:
+  return read_tier(grid_file_abs, tier_name, n_digits, encoding)
@@ -0,0 +1,147 @@
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from logging import getLogger
+from pathlib import Path
+from typing import AsyncGenerator, Awaitable, Callable, Deque, Optional, Set, Tuple, Union
+
+from tqdm import tqdm
+
+from speech_dataset_parser.cache import ParseCache
+from speech_dataset_parser.index import get_index_path
+from speech_dataset_parser.parse import (DEFAULT_AUDIO_FORMAT, DEFAULT_COMPACT, DEFAULT_ENCODING,
+                                         DEFAULT_N_DIGITS, DEFAULT_NUM_SHARDS, DEFAULT_SHARD_BY,
+                                         DEFAULT_SHARD_INDEX, DEFAULT_SILENT, DEFAULT_TIER_NAME,
+                                         DEFAULT_USE_INDEX, FileFilter, GridResult, GridTask,
+                                         SpeakerFilter, get_entries, get_index_tasks,
+                                         get_shard_filters, get_speaker_tasks,
+                                         index_task_files_exist, load_grid, validate_parameters,
+                                         validate_shard_parameters, validate_speaker_filter)
+from speech_dataset_parser.types import CompactEntry, Entry
+from speech_dataset_parser.utils import get_subfolders
+from speech_dataset_parser.vocabulary import SymbolVocabulary
+
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_ORDERED = True
+
+# runs a blocking function in the thread pool
+Run = Callable[..., Awaitable]
+# task and its result; None if the files of an index entry don't exist
+TaskResult = Optional[Tuple[GridTask, GridResult]]
+
+
+async def parse_dataset_async(directory: Path, tier_name: str = DEFAULT_TIER_NAME, n_digits: int = DEFAULT_N_DIGITS, encoding: str = DEFAULT_ENCODING, audio_format: str = DEFAULT_AUDIO_FORMAT, silent: bool = DEFAULT_SILENT, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, ordered: bool = DEFAULT_ORDERED, cache: Optional[ParseCache] = None, compact: bool = DEFAULT_COMPACT, vocabulary: Optional[SymbolVocabulary] = None, use_index: bool = DEFAULT_USE_INDEX, shard_index: int = DEFAULT_SHARD_INDEX, num_shards: int = DEFAULT_NUM_SHARDS, shard_by: str = DEFAULT_SHARD_BY, speaker_filter: Optional[SpeakerFilter] = None) -> AsyncGenerator[Union[Entry, CompactEntry], None]:
+  """
+  Same as `parse_dataset` but the speaker directories are listed and the grids are read in up to `max_concurrency` threads at once, which hides the latency of network storage.
+  If `ordered` is false, the entries are returned as soon as their grid is read instead of in the order of `parse_dataset`.
+  """
+  validate_parameters(directory, tier_name, n_digits, encoding, cache, vocabulary)
+  validate_shard_parameters(shard_index, num_shards, shard_by)
+  validate_speaker_filter(speaker_filter)
+
+  if not isinstance(max_concurrency, int) or max_concurrency < 1:
+    raise ValueError("Parameter 'max_concurrency': Value needs to be an integer greater than zero!")
+
+  loop = asyncio.get_running_loop()
+  executor = ThreadPoolExecutor(max_workers=max_concurrency)
+  run: Run = partial(loop.run_in_executor, executor)
+  include_speaker, include_file = get_shard_filters(shard_index, num_shards, shard_by, speaker_filter)
+  tasks = get_tasks_async(directory, audio_format, silent, use_index,
+                          include_speaker, include_file, run, max_concurrency)
+
+  ordered_jobs: Deque[asyncio.Future] = deque()
+  unordered_jobs: Set[asyncio.Future] = set()
+
+  async def get_finished_results() -> Tuple[TaskResult, ...]:
+    if ordered:
+      return await ordered_jobs.popleft(),
+    done, _ = await asyncio.wait(unordered_jobs, return_when=asyncio.FIRST_COMPLETED)
+    unordered_jobs.difference_update(done)
+    return tuple(job.result() for job in done)
+
+  try:
+    finished = False
+    while not finished or len(ordered_jobs) + len(unordered_jobs) > 0:
+      if not finished and len(ordered_jobs) + len(unordered_jobs) < max_concurrency:
+        try:
+          task, check_files = await tasks.__anext__()
+        except StopAsyncIteration:
+          finished = True
+          continue
+        job = asyncio.ensure_future(load_grid_task_async(
+          task, check_files, tier_name, n_digits, encoding, cache, run))
+        if ordered:
+          ordered_jobs.append(job)
+        else:
+          unordered_jobs.add(job)
+        continue
+
+      for task_result in await get_finished_results():
+        if task_result is None:
+          continue
+        # the cache is only written from the thread of the event loop
+        for entry in get_entries((task_result,), tier_name, n_digits, cache, compact, vocabulary):
+          yield entry
+  finally:
+    for job in (*ordered_jobs, *unordered_jobs):
+      job.cancel()
+    await tasks.aclose()
+    executor.shutdown(wait=False)
+    if cache is not None:
+      cache.commit()
+
+
+async def get_tasks_async(directory: Path, audio_format: str, silent: bool, use_index: bool, include_speaker: Optional[SpeakerFilter], include_file: Optional[FileFilter], run: Run, max_concurrency: int) -> AsyncGenerator[Tuple[GridTask, bool], None]:
+  """yields the tasks in the same order as `get_tasks` and whether their files need to be checked"""
+  index_path = get_index_path(directory)
+  if use_index and await run(index_path.is_file):
+    # the files are checked concurrently while loading the grids
+    tasks = await run(list, get_index_tasks(directory, index_path, audio_format, True,
+                                            include_speaker, include_file, False))
+    for task in tasks:
+      yield task, True
+    return
+
+  if use_index:
+    getLogger(__name__).warning(
+      f"Index file \"{index_path.absolute()}\" was not found! Scanning dataset instead.")
+
+  speaker_dirs = await run(get_subfolders, directory)
+  progress = tqdm(total=len(speaker_dirs), desc="Parsing dataset", unit=" speaker(s)", disable=silent)
+  # the speaker directories are listed concurrently but returned in order
+  listings: Deque[asyncio.Future] = deque()
+  try:
+    for speaker_dir in speaker_dirs:
+      listings.append(run(get_speaker_tasks, speaker_dir, directory,
+                      audio_format, include_speaker, include_file))
+      if len(listings) >= max_concurrency:
+        for task in await listings.popleft():
+          yield task, False
+        progress.update()
+    while len(listings) > 0:
+      for task in await listings.popleft():
+        yield task, False
+      progress.update()
+  finally:
+    for listing in listings:
+      listing.cancel()
+    progress.close()
+
+
+async def load_grid_task_async(task: GridTask, check_files: bool, tier_name: str, n_digits: int, encoding: str, cache: Optional[ParseCache], run: Run) -> TaskResult:
+  if check_files and not await run(index_task_files_exist, task):
+    return None
+  _, speaker_dir, grid_file_rel, _ = task
+  grid_file_abs = speaker_dir / grid_file_rel
+  if cache is None:
+    content = await run(load_grid, grid_file_abs, tier_name, n_digits, encoding)
+    return task, (content, None)
+  stat = await run(os.stat, grid_file_abs)
+  # the connection of the cache can only be used from the thread which created it
+  content = cache.get(grid_file_abs, stat.st_mtime_ns, stat.st_size, tier_name, n_digits)
+  if content is not None:
+    return task, (content, None)
+  content = await run(load_grid, grid_file_abs, tier_name, n_digits, encoding)
+  return task, (content, (stat.st_mtime_ns, stat.st_size))
@@ -0,0 +1,46 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from speech_dataset_parser.parse import (DEFAULT_AUDIO_FORMAT, DEFAULT_NUM_SHARDS, DEFAULT_SHARD_BY,
+                                         DEFAULT_SHARD_INDEX, DEFAULT_SILENT, DEFAULT_USE_INDEX,
+                                         SpeakerFilter, get_tasks, validate_shard_parameters,
+                                         validate_speaker_filter)
+
+
+@dataclass()
+class SpeakerSummary:
+  # name of the speaker directory
+  speaker_dir: str
+  speaker_name: str
+  speaker_gender: int
+  symbols_language: str
+  speaker_accent: Optional[str]
+  # audio file and grid file (both absolute) of each utterance
+  files: List[Tuple[Path, Path]] = field(default_factory=list)
+
+  @property
+  def utterance_count(self) -> int:
+    return len(self.files)
+
+
+def scan_dataset(directory: Path, audio_format: str = DEFAULT_AUDIO_FORMAT, silent: bool = DEFAULT_SILENT, use_index: bool = DEFAULT_USE_INDEX, shard_index: int = DEFAULT_SHARD_INDEX, num_shards: int = DEFAULT_NUM_SHARDS, shard_by: str = DEFAULT_SHARD_BY, speaker_filter: Optional[SpeakerFilter] = None) -> List[SpeakerSummary]:
+  """
+  Returns the speakers with their audio and grid files in the same order as `parse_dataset` without reading any grid.
+  Only the directories are scanned (or the index is read) and the speaker directory names are parsed.
+  """
+  if not directory.is_dir():
+    raise ValueError("Parameter 'directory': Directory was not found!")
+
+  validate_shard_parameters(shard_index, num_shards, shard_by)
+  validate_speaker_filter(speaker_filter)
+
+  speakers: Dict[Path, SpeakerSummary] = {}
+  for speaker_info, speaker_dir, grid_file_rel, audio_file_rel in get_tasks(directory, audio_format, silent, use_index, shard_index, num_shards, shard_by, speaker_filter):
+    speaker = speakers.get(speaker_dir)
+    if speaker is None:
+      speaker_name, speaker_gender, speaker_lang, speaker_accent = speaker_info
+      speaker = SpeakerSummary(speaker_dir.name, speaker_name, speaker_gender, speaker_lang, speaker_accent)
+      speakers[speaker_dir] = speaker
+    speaker.files.append((speaker_dir / audio_file_rel, speaker_dir / grid_file_rel))
+  return list(speakers.values())
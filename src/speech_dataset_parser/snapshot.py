@@ -0,0 +1,105 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# tier name, number of digits, audio format, absolute dataset directory, shard index, number of shards, shard by
+SnapshotParameters = Tuple[str, int, str, str, int, int, str]
+# audio file (relative to speaker directory), modification time (ns) and size of the grid
+FileSnapshot = Tuple[str, int, int]
+# modification times (ns) of the speaker directory and its subdirectories, files by grid file (relative to speaker directory)
+SpeakerSnapshot = Tuple[Dict[str, int], Dict[str, FileSnapshot]]
+
+SNAPSHOT_VERSION = 1
+
+
+class ParseSnapshot():
+  """
+  Stores the modification times of the speaker directories and the stats of the grids of the last complete run of `parse_dataset`.
+  If it is passed to `parse_dataset`, only speaker directories whose modification time changed are scanned again and only added or modified grids are parsed and returned.
+  After all entries were returned, `added`, `modified` and `deleted` contain the audio files of the changed entries and the snapshot is written to disk; it is left unchanged if the run is stopped early.
+  """
+
+  def __init__(self, path: Path) -> None:
+    self.__path = path
+    self.__parameters: Optional[SnapshotParameters] = None
+    self.__speakers: Dict[str, SpeakerSnapshot] = {}
+    self.__added: List[Path] = []
+    self.__modified: List[Path] = []
+    self.__deleted: List[Path] = []
+    self.__staged: Optional[Tuple[SnapshotParameters, Dict[str, SpeakerSnapshot], List[Path], List[Path], List[Path]]] = None
+    if path.is_file():
+      self.__load()
+
+  @property
+  def path(self) -> Path:
+    return self.__path
+
+  @property
+  def added(self) -> List[Path]:
+    return self.__added
+
+  @property
+  def modified(self) -> List[Path]:
+    return self.__modified
+
+  @property
+  def deleted(self) -> List[Path]:
+    return self.__deleted
+
+  def __len__(self) -> int:
+    return sum(len(files) for _, files in self.__speakers.values())
+
+  def __load(self) -> None:
+    with open(self.__path, mode="r", encoding="UTF-8") as f:
+      data = json.load(f)
+    if data.get("version") != SNAPSHOT_VERSION:
+      return
+    tier_name, n_digits, audio_format, directory, shard_index, num_shards, shard_by = data["parameters"]
+    self.__parameters = tier_name, n_digits, audio_format, directory, shard_index, num_shards, shard_by
+    self.__speakers = {
+      speaker_dir_name: (
+        dict(directory_mtimes),
+        {grid_file_rel: (audio_file_rel, mtime_ns, size)
+         for grid_file_rel, audio_file_rel, mtime_ns, size in files},
+      )
+      for speaker_dir_name, (directory_mtimes, files) in data["speakers"].items()
+    }
+
+  def stage(self, parameters: SnapshotParameters, speakers: Dict[str, SpeakerSnapshot], added: List[Path], modified: List[Path], deleted: List[Path]) -> None:
+    """keeps the state of the current run until it is committed"""
+    self.__staged = parameters, speakers, added, modified, deleted
+
+  def commit(self) -> None:
+    """applies the staged state and writes it to disk"""
+    if self.__staged is None:
+      return
+    self.__parameters, self.__speakers, self.__added, self.__modified, self.__deleted = self.__staged
+    self.__staged = None
+    self.__save()
+
+  def __save(self) -> None:
+    data = {
+      "version": SNAPSHOT_VERSION,
+      "parameters": self.__parameters,
+      "speakers": {
+        speaker_dir_name: [
+          directory_mtimes,
+          [[grid_file_rel, audio_file_rel, mtime_ns, size]
+           for grid_file_rel, (audio_file_rel, mtime_ns, size) in files.items()],
+        ]
+        for speaker_dir_name, (directory_mtimes, files) in self.__speakers.items()
+      },
+    }
+    self.__path.parent.mkdir(parents=True, exist_ok=True)
+    # the old snapshot stays intact if writing fails
+    tmp_path = self.__path.parent / f"{self.__path.name}.tmp"
+    with open(tmp_path, mode="w", encoding="UTF-8") as f:
+      json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, self.__path)
+
+  def get_speakers(self, parameters: SnapshotParameters) -> Dict[str, SpeakerSnapshot]:
+    """returns the speakers of the last run; it is empty if the last run was done with other parameters"""
+    if self.__parameters != parameters:
+      return {}
+    return self.__speakers
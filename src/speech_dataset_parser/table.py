@@ -0,0 +1,153 @@
+from array import array
+from io import StringIO
+from pathlib import Path
+from typing import Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+from speech_dataset_parser.cache import ParseCache
+from speech_dataset_parser.parse import (DEFAULT_AUDIO_FORMAT, DEFAULT_CHUNKSIZE, DEFAULT_ENCODING,
+                                         DEFAULT_N_DIGITS, DEFAULT_N_JOBS, DEFAULT_SILENT,
+                                         DEFAULT_TIER_NAME, DEFAULT_USE_INDEX, parse_dataset)
+from speech_dataset_parser.types import Entry
+
+T = TypeVar("T")
+
+
+class DictionaryColumn(Generic[T]):
+  """stores each distinct value once and one integer code per row"""
+
+  def __init__(self) -> None:
+    self.__values: List[T] = []
+    self.__value_codes: Dict[T, int] = {}
+    self.__codes = array("I")
+
+  @property
+  def values(self) -> List[T]:
+    return self.__values
+
+  @property
+  def codes(self) -> array:
+    return self.__codes
+
+  def append(self, value: T) -> None:
+    code = self.__value_codes.get(value)
+    if code is None:
+      code = len(self.__values)
+      self.__value_codes[value] = code
+      self.__values.append(value)
+    self.__codes.append(code)
+
+  def __len__(self) -> int:
+    return len(self.__codes)
+
+  def __getitem__(self, index: int) -> T:
+    return self.__values[self.__codes[index]]
+
+
+class EntryTable():
+  """
+  Stores entries column-wise: the marks of all intervals are concatenated into one string, the max-times of all intervals are stored in one flat `array('d')` and the speaker columns are dictionary-encoded.
+  Rows are returned as `Entry` instances which are created on access.
+  """
+
+  def __init__(self) -> None:
+    # the symbols are written into the writer while appending and are moved into one string on access, so that they are stored only once
+    self.__symbols_writer: Optional[StringIO] = None
+    self.__symbols_buffer = ""
+    self.__symbols_length = 0
+    # end offset of each symbol in the symbol buffer
+    self.symbol_ends = array("Q")
+    # offset of the first symbol/interval of each entry, the last value is the total count
+    self.entry_offsets = array("Q", [0])
+    self.intervals = array("d")
+    self.min_times = array("d")
+    self.max_times = array("d")
+    self.symbols_languages: DictionaryColumn[str] = DictionaryColumn()
+    self.speaker_names: DictionaryColumn[str] = DictionaryColumn()
+    self.speaker_accents: DictionaryColumn[Optional[str]] = DictionaryColumn()
+    self.speaker_genders: DictionaryColumn[int] = DictionaryColumn()
+    self.audio_dirs: DictionaryColumn[str] = DictionaryColumn()
+    self.audio_names: List[str] = []
+
+  @property
+  def symbols_buffer(self) -> str:
+    self.finalize()
+    return self.__symbols_buffer
+
+  def finalize(self) -> None:
+    """moves the appended symbols into the symbol buffer and releases the writer"""
+    if self.__symbols_writer is not None:
+      self.__symbols_buffer = self.__symbols_writer.getvalue()
+      self.__symbols_writer = None
+
+  def append(self, entry: Entry) -> None:
+    if self.__symbols_writer is None:
+      # the symbols of previous entries are copied once if entries are appended after an access
+      self.__symbols_writer = StringIO()
+      self.__symbols_writer.write(self.__symbols_buffer)
+      self.__symbols_buffer = ""
+    for symbol in entry.symbols:
+      self.__symbols_writer.write(symbol)
+      self.__symbols_length += len(symbol)
+      self.symbol_ends.append(self.__symbols_length)
+    self.intervals.extend(entry.intervals)
+    self.entry_offsets.append(len(self.intervals))
+    self.min_times.append(entry.min_time)
+    self.max_times.append(entry.max_time)
+    self.symbols_languages.append(entry.symbols_language)
+    self.speaker_names.append(entry.speaker_name)
+    self.speaker_accents.append(entry.speaker_accent)
+    self.speaker_genders.append(entry.speaker_gender)
+    self.audio_dirs.append(str(entry.audio_file_abs.parent))
+    self.audio_names.append(entry.audio_file_abs.name)
+
+  def __len__(self) -> int:
+    return len(self.min_times)
+
+  def get_symbols(self, index: int) -> Tuple[str, ...]:
+    start, end = self.entry_offsets[index], self.entry_offsets[index + 1]
+    buffer = self.symbols_buffer
+    symbol_start = self.symbol_ends[start - 1] if start > 0 else 0
+    result = []
+    for symbol_end in self.symbol_ends[start:end]:
+      result.append(buffer[symbol_start:symbol_end])
+      symbol_start = symbol_end
+    return tuple(result)
+
+  def get_intervals(self, index: int) -> Tuple[float, ...]:
+    start, end = self.entry_offsets[index], self.entry_offsets[index + 1]
+    return tuple(self.intervals[start:end])
+
+  def get_audio_file_abs(self, index: int) -> Path:
+    return Path(self.audio_dirs[index]) / self.audio_names[index]
+
+  def __getitem__(self, index: int) -> Entry:
+    if index < 0:
+      index += len(self)
+    if not 0 <= index < len(self):
+      raise IndexError("Index out of range!")
+    result = Entry(
+      self.get_symbols(index),
+      self.get_intervals(index),
+      self.symbols_languages[index],
+      self.speaker_names[index],
+      self.speaker_accents[index],
+      self.speaker_genders[index],
+      self.get_audio_file_abs(index),
+      self.min_times[index],
+      self.max_times[index],
+    )
+    return result
+
+  def __iter__(self) -> Iterator[Entry]:
+    for index in range(len(self)):
+      yield self[index]
+
+
+def parse_dataset_table(directory: Path, tier_name: str = DEFAULT_TIER_NAME, n_digits: int = DEFAULT_N_DIGITS, encoding: str = DEFAULT_ENCODING, audio_format: str = DEFAULT_AUDIO_FORMAT, silent: bool = DEFAULT_SILENT, n_jobs: int = DEFAULT_N_JOBS, chunksize: int = DEFAULT_CHUNKSIZE, cache: Optional[ParseCache] = None, use_index: bool = DEFAULT_USE_INDEX) -> EntryTable:
+  result = EntryTable()
+  entries = parse_dataset(directory, tier_name, n_digits, encoding, audio_format,
+                          silent, n_jobs, chunksize, cache, use_index=use_index)
+  for entry in entries:
+    result.append(entry)
+  result.finalize()
+  return result
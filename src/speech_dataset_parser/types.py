@@ -1,6 +1,7 @@
+from array import array
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple, Union
 
 GENDER_UNKNOWN = 0
 GENDER_MALE = 1
@@ -17,7 +18,8 @@ GENDERS = {
 
 @dataclass()
 class Entry:
-  symbols: Tuple[str, ...]
+  # ids of the symbols (array of typecode 'H' or 'I') if a vocabulary is used for parsing
+  symbols: Union[Tuple[str, ...], array]
   intervals: Tuple[float, ...]
   symbols_language: str
   speaker_name: str
@@ -27,3 +29,79 @@ class Entry:
   audio_file_abs: Path
   min_time: float
   max_time: float
+
+
+# symbols, intervals, min time, max time
+GridContent = Tuple[Tuple[str, ...], Tuple[float, ...], float, float]
+
+# min time, max time, number of tiers, tier names (None if they were not requested)
+GridHeader = Tuple[float, float, int, Optional[Tuple[str, ...]]]
+
+
+class CompactEntry():
+  """
+  Immutable variant of `Entry` without a per-instance `__dict__`.
+  The speaker directory is shared between all entries of a speaker and only the path of the audio file relative to it is stored per entry.
+  """
+  __slots__ = (
+    "symbols",
+    "intervals",
+    "symbols_language",
+    "speaker_name",
+    "speaker_accent",
+    "speaker_gender",
+    "speaker_dir",
+    "audio_file_rel",
+    "min_time",
+    "max_time",
+  )
+
+  # ids of the symbols (array of typecode 'H' or 'I') if a vocabulary is used for parsing
+  symbols: Union[Tuple[str, ...], array]
+  intervals: Tuple[float, ...]
+  symbols_language: str
+  speaker_name: str
+  speaker_accent: Optional[str]
+  speaker_gender: int
+  # absolute path
+  speaker_dir: Path
+  # relative to speaker_dir
+  audio_file_rel: str
+  min_time: float
+  max_time: float
+
+  def __init__(self, symbols: Union[Tuple[str, ...], array], intervals: Tuple[float, ...], symbols_language: str, speaker_name: str, speaker_accent: Optional[str], speaker_gender: int, speaker_dir: Path, audio_file_rel: str, min_time: float, max_time: float) -> None:
+    values = (symbols, intervals, symbols_language, speaker_name, speaker_accent,
+              speaker_gender, speaker_dir, audio_file_rel, min_time, max_time)
+    for name, value in zip(CompactEntry.__slots__, values):
+      object.__setattr__(self, name, value)
+
+  def __setattr__(self, name: str, value) -> None:
+    raise AttributeError(f"Attribute '{name}' can't be set because the entry is immutable!")
+
+  def __delattr__(self, name: str) -> None:
+    raise AttributeError(f"Attribute '{name}' can't be deleted because the entry is immutable!")
+
+  @property
+  def audio_file_abs(self) -> Path:
+    return self.speaker_dir / self.audio_file_rel
+
+  def __get_values(self) -> Tuple:
+    return tuple(getattr(self, name) for name in CompactEntry.__slots__)
+
+  def __eq__(self, other) -> bool:
+    if not isinstance(other, CompactEntry):
+      return NotImplemented
+    return self.__get_values() == other.__get_values()
+
+  def __hash__(self) -> int:
+    # arrays of symbol ids are not hashable
+    return hash((tuple(self.symbols),) + self.__get_values()[1:])
+
+  def __repr__(self) -> str:
+    values = ", ".join(f"{name}={getattr(self, name)!r}" for name in CompactEntry.__slots__)
+    return f"CompactEntry({values})"
+
+  def to_entry(self) -> Entry:
+    return Entry(self.symbols, self.intervals, self.symbols_language, self.speaker_name,
+                 self.speaker_accent, self.speaker_gender, self.audio_file_abs, self.min_time, self.max_time)
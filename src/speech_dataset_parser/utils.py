@@ -1,31 +1,48 @@
 import os
 from collections import OrderedDict
 from pathlib import Path
-from typing import Generator, List
+from typing import Dict, Generator, List
 from typing import OrderedDict as ODType
 from typing import Set, Tuple
 
 
-def get_files_dict(directory: Path, filetypes: Set[str]) -> ODType[str, Path]:
-  result = OrderedDict(sorted(get_files_tuples(directory, filetypes)))
-  return result
-
+def get_files_dicts(directory: Path, filetypes: Tuple[Set[str], ...]) -> Tuple[ODType[str, str], ...]:
+  """
+  Collects the files of all given groups of filetypes in one walk through `directory`.
+  Returns one dict per group which maps the relative path without suffix to the relative path, both as `str`.
+  """
+  filetypes_lower = tuple({ft.lower() for ft in group} for group in filetypes)
+  results = tuple([] for _ in filetypes)
+  for rel_dir, name in get_all_file_names_in_all_subfolders(directory):
+    stem, suffix = os.path.splitext(name)
+    suffix = suffix.lower()
+    for group, result in zip(filetypes_lower, results):
+      if suffix in group:
+        if rel_dir == "":
+          result.append((stem, name))
+        else:
+          result.append((rel_dir + os.sep + stem, rel_dir + os.sep + name))
+  return tuple(OrderedDict(sorted(result)) for result in results)
 
-def get_files_tuples(directory: Path, filetypes: Set[str]) -> Generator[Tuple[str, Path], None, None]:
-  filetypes_lower = {ft.lower() for ft in filetypes}
-  all_files = get_all_files_in_all_subfolders(directory)
-  resulting_files = (
-    (str(file.relative_to(directory).parent / file.stem), file.relative_to(directory))
-      for file in all_files if file.suffix.lower() in filetypes_lower
-  )
-  return resulting_files
 
-
-def get_all_files_in_all_subfolders(directory: Path) -> Generator[Path, None, None]:
-  for root, _, files in os.walk(directory):
-    for name in files:
-      file_path = Path(root) / name
-      yield file_path
+def get_all_file_names_in_all_subfolders(directory: Path) -> Generator[Tuple[str, str], None, None]:
+  """yields the directory (relative to `directory`) and name of each file; symbolic links to directories are not followed like in `os.walk`"""
+  pending = [""]
+  while len(pending) > 0:
+    rel_dir = pending.pop()
+    abs_dir = os.path.join(directory, rel_dir) if rel_dir != "" else directory
+    try:
+      scanner = os.scandir(abs_dir)
+    except OSError:
+      # unreadable directories are skipped like in `os.walk`
+      continue
+    with scanner as entries:
+      for entry in entries:
+        if entry.is_dir():
+          if not entry.is_symlink():
+            pending.append(entry.name if rel_dir == "" else rel_dir + os.sep + entry.name)
+        else:
+          yield rel_dir, entry.name
 
 
 def get_subfolders(parent_dir: Path) -> List[Path]:
@@ -39,3 +56,34 @@ def get_subfolder_names(parent_dir: Path) -> List[str]:
   _, subfolder_names, _ = next(os.walk(parent_dir))
   subfolder_names.sort()
   return subfolder_names
+
+
+def get_directory_mtimes(directory: Path) -> Dict[str, int]:
+  """returns the modification time (ns) of `directory` (as '') and of all its subdirectories by their relative path; symbolic links to directories are not followed"""
+  result: Dict[str, int] = {}
+  pending = [""]
+  while len(pending) > 0:
+    rel_dir = pending.pop()
+    abs_dir = os.path.join(directory, rel_dir) if rel_dir != "" else directory
+    try:
+      # the time is taken before the listing, so that later changes are detected in the next run
+      result[rel_dir] = os.stat(abs_dir).st_mtime_ns
+      scanner = os.scandir(abs_dir)
+    except OSError:
+      continue
+    with scanner as entries:
+      for entry in entries:
+        if entry.is_dir() and not entry.is_symlink():
+          pending.append(entry.name if rel_dir == "" else rel_dir + os.sep + entry.name)
+  return result
+
+
+def are_directory_mtimes_unchanged(directory: Path, mtimes: Dict[str, int]) -> bool:
+  for rel_dir, mtime_ns in mtimes.items():
+    abs_dir = os.path.join(directory, rel_dir) if rel_dir != "" else directory
+    try:
+      if os.stat(abs_dir).st_mtime_ns != mtime_ns:
+        return False
+    except OSError:
+      return False
+  return True
@@ -0,0 +1,53 @@
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+# largest id which can be stored with typecode 'H'
+MAX_SHORT_ID = 2**16 - 1
+
+
+class SymbolVocabulary():
+  """assigns consecutive ids to symbols in the order of their first occurrence; a frozen vocabulary doesn't add symbols and raises a `ValueError` for unknown symbols"""
+
+  def __init__(self, symbols: Iterable[str] = (), frozen: bool = False) -> None:
+    self.__symbols: List[str] = []
+    self.__symbol_ids: Dict[str, int] = {}
+    self.__frozen = False
+    for symbol in symbols:
+      self.get_id(symbol)
+    self.__frozen = frozen
+
+  @property
+  def symbols(self) -> Tuple[str, ...]:
+    return tuple(self.__symbols)
+
+  @property
+  def frozen(self) -> bool:
+    return self.__frozen
+
+  def freeze(self) -> None:
+    self.__frozen = True
+
+  def __len__(self) -> int:
+    return len(self.__symbols)
+
+  def __contains__(self, symbol: str) -> bool:
+    return symbol in self.__symbol_ids
+
+  def get_id(self, symbol: str) -> int:
+    symbol_id = self.__symbol_ids.get(symbol)
+    if symbol_id is None:
+      if self.__frozen:
+        raise ValueError(f"Symbol {symbol!r} is not contained in the frozen vocabulary!")
+      symbol_id = len(self.__symbols)
+      self.__symbol_ids[symbol] = symbol_id
+      self.__symbols.append(symbol)
+    return symbol_id
+
+  def encode(self, symbols: Iterable[str]) -> array:
+    """returns the ids as array of typecode 'H' as long as all ids fit into it, otherwise of typecode 'I'; unknown symbols are added if the vocabulary is not frozen"""
+    ids = [self.get_id(symbol) for symbol in symbols]
+    typecode = "H" if len(self.__symbols) - 1 <= MAX_SHORT_ID else "I"
+    return array(typecode, ids)
+
+  def decode(self, symbol_ids: Iterable[int]) -> Tuple[str, ...]:
+    return tuple(self.__symbols[symbol_id] for symbol_id in symbol_ids)
@@ -0,0 +1,52 @@
+import codecs
+from pathlib import Path
+from typing import List, Tuple
+
+from textgrid import Interval, IntervalTier, TextGrid
+
+from speech_dataset_parser.index import IndexEntry, get_index_path, write_index
+
+TEST_TIER_NAME = "Symbols"
+TEST_SPEAKER_DIRS = (
+  "A;1;eng;North American",
+  "B;2;eng",
+  "C;2;ger;Bavarian",
+)
+
+
+def write_grid(path: Path, text: str, tier_name: str = TEST_TIER_NAME, duration_s: float = 1.5) -> None:
+  grid = TextGrid(None, 0, duration_s)
+  tier = IntervalTier(tier_name, 0, duration_s)
+  for i, symbol in enumerate(text):
+    tier.addInterval(Interval(i / len(text) * duration_s, (i + 1) / len(text) * duration_s, symbol))
+  grid.append(tier)
+  path.parent.mkdir(parents=True, exist_ok=True)
+  with codecs.open(path, 'w', "UTF-8") as file:
+    grid.write(file)
+
+
+def create_dataset(directory: Path, files_per_speaker: int = 3, speaker_dirs: Tuple[str, ...] = TEST_SPEAKER_DIRS) -> List[Path]:
+  """creates a generic dataset with empty audio files and returns the audio paths in parsing order"""
+  audio_paths = []
+  for speaker_dir_name in speaker_dirs:
+    speaker_dir = directory / speaker_dir_name
+    for file_nr in range(1, files_per_speaker + 1):
+      stem = str(file_nr).zfill(3)
+      write_grid(speaker_dir / f"{stem}.TextGrid", f"Text {speaker_dir_name[0]}{file_nr}.",
+                 duration_s=file_nr / 2)
+      audio_path = speaker_dir / f"{stem}.wav"
+      audio_path.write_bytes(b"")
+      audio_paths.append(audio_path)
+  return audio_paths
+
+
+def create_index(directory: Path) -> None:
+  """writes the index of a dataset created with `create_dataset` in reversed order"""
+  entries = []
+  for speaker_dir_name in TEST_SPEAKER_DIRS:
+    parts = speaker_dir_name.split(";")
+    accent = parts[3] if len(parts) == 4 else None
+    for audio_file in sorted((directory / speaker_dir_name).glob("*.wav")):
+      entries.append(IndexEntry(speaker_dir_name, parts[0], int(parts[1]), parts[2], accent,
+                                f"{audio_file.stem}.TextGrid", audio_file.name, 1.0, 8))
+  write_index(get_index_path(directory), reversed(entries))
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+from speech_dataset_parser import parse_dataset
+from speech_dataset_parser.cache import ParseCache
+from speech_dataset_parser_tests.helper import TEST_TIER_NAME, create_dataset, write_grid
+
+
+def test_warm_call_returns_same_entries(tmp_path: Path):
+  dataset_dir = tmp_path / "dataset"
+  create_dataset(dataset_dir)
+  expected = list(parse_dataset(dataset_dir, TEST_TIER_NAME, silent=True))
+
+  with ParseCache(tmp_path / "cache.sqlite") as cache:
+    cold = list(parse_dataset(dataset_dir, TEST_TIER_NAME, silent=True, cache=cache))
+    assert len(cache) == 9
+    warm = list(parse_dataset(dataset_dir, TEST_TIER_NAME, silent=True, cache=cache))
+
+  assert cold == expected
+  assert warm == expected
+
+
+def test_warm_call_with_n_jobs_returns_same_entries(tmp_path: Path):
+  dataset_dir = tmp_path / "dataset"
+  create_dataset(dataset_dir)
+  expected = list(parse_dataset(dataset_dir, TEST_TIER_NAME, silent=True))
+
+  with ParseCache(tmp_path / "cache.sqlite") as cache:
+    list(parse_dataset(dataset_dir, TEST_TIER_NAME, silent=True, cache=cache))
+    warm = list(parse_dataset(dataset_dir, TEST_TIER_NAME, silent=True, cache=cache, n_jobs=2))
+
+  assert warm == expected
+
+
+def test_warm_call_with_prefetch_returns_same_entries(tmp_path: Path):
+  dataset_dir = tmp_path / "dataset"
+  create_dataset(dataset_dir)
+  expected = list(parse_dataset(dataset_dir, TEST_TIER_NAME, silent=True))
+
+  with ParseCache(tmp_path / "cache.sqlite") as cache:
+    cold = list(parse_dataset(dataset_dir, TEST_TIER_NAME, silent=True, cache=cache, prefetch=2))
+    assert len(cache) == 9
+    warm = list(parse_dataset(dataset_dir, TEST_TIER_NAME, silent=True, cache=cache, prefetch=2))
+
+  assert cold == expected
+  assert warm == expected
+
+
+def test_changed_grid_is_parsed_again(tmp_path: Path):
+  dataset_dir = tmp_path / "dataset"
+  create_dataset(dataset_dir)
+
+  with ParseCache(tmp_path / "cache.sqlite") as cache:
+    list(parse_dataset(dataset_dir, TEST_TIER_NAME, silent=True, cache=cache))
+    write_grid(dataset_dir / "B;2;eng" / "001.TextGrid", "changed text")
+    res = list(parse_dataset(dataset_dir, TEST_TIER_NAME, silent=True, cache=cache))
+    assert len(cache) == 9
+
+  assert res[3].symbols == tuple("changed text")
+
+
+def test_max_entries_and_invalidate(tmp_path: Path):
+  dataset_dir = tmp_path / "dataset"
+  audio_paths = create_dataset(dataset_dir)
+
+  with ParseCache(tmp_path / "cache.sqlite", max_entries=5) as cache:
+    list(parse_dataset(dataset_dir, TEST_TIER_NAME, silent=True, cache=cache))
+    assert len(cache) == 5
+
+    removed = cache.invalidate(audio_paths[-1].parent / "003.TextGrid")
+    assert removed == 1
+    assert len(cache) == 4
+
+    removed = cache.invalidate()
+    assert removed == 4
+    assert len(cache) == 0
+
+
+def test_relative_directory_uses_same_entries(tmp_path: Path, monkeypatch):
+  dataset_dir = tmp_path / "dataset"
+  create_dataset(dataset_dir)
+
+  with ParseCache(tmp_path / "cache.sqlite") as cache:
+    list(parse_dataset(dataset_dir, TEST_TIER_NAME, silent=True, cache=cache))
+    monkeypatch.chdir(tmp_path)
+    res = list(parse_dataset(Path("dataset"), TEST_TIER_NAME, silent=True, cache=cache))
+    assert len(cache) == 9
+    assert cache.invalidate(Path("dataset") / "B;2;eng" / "001.TextGrid") == 1
+
+  assert len(res) == 9
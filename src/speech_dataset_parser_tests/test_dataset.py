@@ -0,0 +1,130 @@
+import pickle
+from pathlib import Path
+
+import pytest
+from textgrid.exceptions import TextGridError
+
+from speech_dataset_parser.cache import ParseCache
+from speech_dataset_parser.dataset import GenericDataset
+from speech_dataset_parser.parse import parse_dataset
+from speech_dataset_parser.types import CompactEntry
+from speech_dataset_parser.vocabulary import SymbolVocabulary
+from speech_dataset_parser_tests.helper import TEST_TIER_NAME, create_dataset, write_grid
+
+
+def test_len_and_getitem_same_as_parse_dataset(tmp_path: Path):
+  create_dataset(tmp_path / "dataset", files_per_speaker=4)
+  expected = list(parse_dataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True))
+
+  dataset = GenericDataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True)
+
+  assert len(dataset) == 12
+  assert [dataset[index] for index in range(len(dataset))] == expected
+  assert dataset[-1] == expected[-1]
+  assert list(dataset) == expected
+
+
+def test_getitem_out_of_range_raises_index_error(tmp_path: Path):
+  create_dataset(tmp_path / "dataset")
+  dataset = GenericDataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True)
+
+  with pytest.raises(IndexError):
+    dataset[9]
+
+
+def test_getitem_parses_only_accessed_grid(tmp_path: Path):
+  audio_paths = create_dataset(tmp_path / "dataset")
+  dataset = GenericDataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True)
+  (audio_paths[0].parent / "001.TextGrid").write_text("invalid")
+
+  result = dataset[5]
+
+  assert result.audio_file_abs == audio_paths[5]
+  with pytest.raises(TextGridError):
+    dataset[0]
+
+
+def test_getitem_missing_tier_raises_value_error(tmp_path: Path):
+  audio_paths = create_dataset(tmp_path / "dataset")
+  write_grid(audio_paths[1].parent / "002.TextGrid", "abc", tier_name="other")
+  dataset = GenericDataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True)
+
+  with pytest.raises(ValueError):
+    dataset[1]
+
+
+def test_slice_returns_view(tmp_path: Path):
+  audio_paths = create_dataset(tmp_path / "dataset")
+  dataset = GenericDataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True)
+
+  view = dataset[2:8:2]
+
+  assert len(view) == 3
+  assert [entry.audio_file_abs for entry in view] == audio_paths[2:8:2]
+  assert view[::-1].get_audio_file_abs(0) == audio_paths[6]
+  assert len(dataset) == 9
+
+
+def test_get_speaker(tmp_path: Path):
+  audio_paths = create_dataset(tmp_path / "dataset")
+  dataset = GenericDataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True)
+
+  speaker_b = dataset.get_speaker("B")
+
+  assert dataset.get_speaker_names() == ["A", "B", "C"]
+  assert [entry.audio_file_abs for entry in speaker_b] == audio_paths[3:6]
+  assert all(entry.speaker_name == "B" for entry in speaker_b)
+  assert len(dataset[4:].get_speaker("B")) == 2
+  assert dataset[4:].get_speaker_names() == ["B", "C"]
+  assert len(dataset.get_speaker("X")) == 0
+
+
+def test_compact_and_cache(tmp_path: Path):
+  create_dataset(tmp_path / "dataset")
+  with ParseCache(tmp_path / "cache.sqlite") as cache:
+    dataset = GenericDataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True, cache=cache, compact=True)
+    first = dataset[3]
+    second = dataset[3]
+    cache.commit()
+    assert len(cache) == 1
+
+  assert isinstance(first, CompactEntry)
+  assert first == second
+
+
+def test_can_be_pickled(tmp_path: Path):
+  create_dataset(tmp_path / "dataset")
+  dataset = GenericDataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True)
+
+  result = pickle.loads(pickle.dumps(dataset[1:]))
+
+  assert len(result) == 8
+  assert result[0] == dataset[1]
+
+
+def test_can_be_pickled_only_with_frozen_vocabulary(tmp_path: Path):
+  create_dataset(tmp_path / "dataset")
+  vocabulary = SymbolVocabulary()
+  dataset = GenericDataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True, vocabulary=vocabulary)
+
+  assert len(dataset[1:]) == 8
+  with pytest.raises(ValueError):
+    pickle.dumps(dataset)
+
+  for entry in dataset:
+    pass
+  vocabulary.freeze()
+  copies = [pickle.loads(pickle.dumps(dataset)) for _ in range(2)]
+
+  assert copies[0][8].symbols == copies[1][8].symbols == dataset[8].symbols
+  assert vocabulary.decode(copies[1][8].symbols) == tuple("Text C3.")
+
+
+def test_shards_contain_all_entries(tmp_path: Path):
+  audio_paths = create_dataset(tmp_path / "dataset", files_per_speaker=5)
+
+  shards = [GenericDataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True, shard_index=shard_index, num_shards=2)
+            for shard_index in range(2)]
+
+  assert len(shards[0]) + len(shards[1]) == len(audio_paths)
+  assert sorted(shard.get_audio_file_abs(index) for shard in shards for index in range(len(shard))) == audio_paths
@@ -0,0 +1,122 @@
+import codecs
+from pathlib import Path
+
+from textgrid import Interval, IntervalTier, PointTier, TextGrid
+
+from speech_dataset_parser.grid_reader import probe_grid, read_tier
+from speech_dataset_parser_tests.helper import write_grid
+
+
+def get_expected(path: Path, tier_name: str, n_digits: int):
+  grid = TextGrid()
+  grid.read(path, n_digits, "UTF-8")
+  tier = grid.getFirst(tier_name)
+  if tier is None:
+    return None
+  symbols = tuple(interval.mark for interval in tier.intervals)
+  intervals = tuple(interval.maxTime for interval in tier.intervals)
+  return symbols, intervals, grid.minTime, grid.maxTime
+
+
+def write_multi_tier_grid(path: Path) -> None:
+  grid = TextGrid(None, 0, 3.3333333333333335)
+  points = PointTier("points", 0, 3.3333333333333335)
+  points.add(1.0, "a \"point\"")
+  grid.append(points)
+  words = IntervalTier("words", 0, 3.3333333333333335)
+  words.add(0, 1.1111111111111112, "first\nline")
+  words.add(1.1111111111111112, 3.3333333333333335, "")
+  grid.append(words)
+  symbols = IntervalTier("symbols", 0, 3.3333333333333335)
+  symbols.add(0, 0.3333333333333333, "\"")
+  symbols.add(0.3333333333333333, 0.6666666666666666, "multi\n\"line\"\nmark")
+  symbols.add(0.6666666666666666, 3.3333333333333335, "b")
+  grid.append(symbols)
+  with codecs.open(path, 'w', "UTF-8") as file:
+    grid.write(file)
+
+
+def write_short_grid(path: Path) -> None:
+  path.write_text("\n".join((
+    'File type = "ooTextFile short"',
+    '"TextGrid"',
+    '',
+    '0',
+    '2.123456789',
+    '<exists>',
+    '2',
+    '"IntervalTier"',
+    '"other"',
+    '0',
+    '2.123456789',
+    '1',
+    '0',
+    '2.123456789',
+    '"x"',
+    '"IntervalTier"',
+    '"symbols"',
+    '0',
+    '2.123456789',
+    '3',
+    '0',
+    '1.00000004',
+    '"a"',
+    '1.00000004',
+    '1.00000004',
+    '"null interval"',
+    '1.00000004',
+    '2.123456789',
+    '""',
+    '',
+  )), "UTF-8")
+
+
+def test_long_format_matches_textgrid(tmp_path: Path):
+  path = tmp_path / "grid.TextGrid"
+  write_multi_tier_grid(path)
+
+  for tier_name in ("symbols", "words", "missing"):
+    for n_digits in (1, 3, 16):
+      assert read_tier(path, tier_name, n_digits, "UTF-8") == get_expected(path, tier_name, n_digits)
+
+
+def test_short_format_matches_textgrid(tmp_path: Path):
+  path = tmp_path / "grid.TextGrid"
+  write_short_grid(path)
+
+  for n_digits in (2, 5, 16):
+    assert read_tier(path, "symbols", n_digits, "UTF-8") == get_expected(path, "symbols", n_digits)
+  assert read_tier(path, "symbols", 16) == (("a", ""), (1.00000004, 2.123456789), 0, 2.123456789)
+
+
+def test_probe_grid_long_format_reads_all_tier_names(tmp_path: Path):
+  path = tmp_path / "grid.TextGrid"
+  write_multi_tier_grid(path)
+
+  assert probe_grid(path, 16, "UTF-8") == (0, 3.3333333333333335, 3, ("points", "words", "symbols"))
+  assert probe_grid(path, 2, "UTF-8", tier_names=False) == (0, 3.33, 3, None)
+
+
+def test_probe_grid_short_format(tmp_path: Path):
+  path = tmp_path / "grid.TextGrid"
+  write_short_grid(path)
+
+  assert probe_grid(path, 16) == (0, 2.123456789, 2, ("other", "symbols"))
+
+
+def test_probe_grid_reads_only_header(tmp_path: Path):
+  path = tmp_path / "grid.TextGrid"
+  write_grid(path, "abc", tier_name="words", duration_s=2.5)
+  # the rest of the file is not read, otherwise the invalid bytes would raise an error on decoding
+  content = path.read_bytes()
+  path.write_bytes(content[:content.index(b"intervals [1]")] + b"x" * 1000 + b"\xff")
+
+  assert probe_grid(path, 16, "UTF-8") == (0, 2.5, 1, ("words",))
+
+
+def test_probe_grid_small_probe_size_reads_whole_file(tmp_path: Path):
+  path = tmp_path / "grid.TextGrid"
+  write_grid(path, "äöü", tier_name="wörter", duration_s=2.5)
+
+  assert probe_grid(path, 16, "UTF-8", probe_size=10) == (0, 2.5, 1, ("wörter",))
+  assert probe_grid(path, 16, "UTF-8", probe_size=160) == (0, 2.5, 1, ("wörter",))
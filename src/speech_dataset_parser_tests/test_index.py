@@ -0,0 +1,60 @@
+import os
+from pathlib import Path
+
+from speech_dataset_parser.index import IndexEntry, read_index, write_index
+from speech_dataset_parser.parse import parse_dataset
+from speech_dataset_parser_tests.helper import TEST_TIER_NAME, create_dataset, create_index
+
+
+def test_write_and_read_index(tmp_path: Path):
+  entries = [
+    IndexEntry("A;1;eng;North American", "A", 1, "eng", "North American",
+               os.path.join("sub", "001.TextGrid"), os.path.join("sub", "001.wav"), 1.25, 3),
+    IndexEntry("绿;2;chi", "绿", 2, "chi", None, "002.TextGrid", "002.wav", 0.5, 10),
+  ]
+
+  write_index(tmp_path / "index.jsonl", entries)
+  result = list(read_index(tmp_path / "index.jsonl"))
+
+  assert result == entries
+
+
+def test_parse_dataset_use_index_same_as_scan(tmp_path: Path):
+  create_dataset(tmp_path / "dataset")
+  create_index(tmp_path / "dataset")
+  expected = list(parse_dataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True))
+
+  result = list(parse_dataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True, use_index=True))
+
+  assert result == expected
+
+
+def test_parse_dataset_use_index_ignores_missing_files(tmp_path: Path):
+  audio_paths = create_dataset(tmp_path / "dataset")
+  create_index(tmp_path / "dataset")
+  audio_paths[1].unlink()
+  (audio_paths[4].parent / f"{audio_paths[4].stem}.TextGrid").unlink()
+  expected_audio_paths = [path for nr, path in enumerate(audio_paths) if nr not in {1, 4}]
+
+  result = list(parse_dataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True, use_index=True))
+
+  assert [entry.audio_file_abs for entry in result] == expected_audio_paths
+
+
+def test_parse_dataset_use_index_does_not_scan_unindexed_files(tmp_path: Path):
+  create_dataset(tmp_path / "dataset")
+  create_index(tmp_path / "dataset")
+  create_dataset(tmp_path / "dataset", speaker_dirs=("D;1;eng",))
+
+  result = list(parse_dataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True, use_index=True))
+
+  assert len(result) == 9
+  assert all(entry.speaker_name != "D" for entry in result)
+
+
+def test_parse_dataset_use_index_without_index_scans_dataset(tmp_path: Path):
+  audio_paths = create_dataset(tmp_path / "dataset")
+
+  result = list(parse_dataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True, use_index=True))
+
+  assert [entry.audio_file_abs for entry in result] == audio_paths
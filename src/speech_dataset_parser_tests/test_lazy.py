@@ -0,0 +1,85 @@
+from pathlib import Path
+
+import pytest
+
+from speech_dataset_parser import lazy
+from speech_dataset_parser.parse import parse_dataset
+from speech_dataset_parser.vocabulary import SymbolVocabulary
+from speech_dataset_parser_tests.helper import TEST_TIER_NAME, create_dataset, write_grid
+
+
+def count_reads(monkeypatch) -> list:
+  reads = []
+  read_tier = lazy.read_tier
+
+  def read_tier_and_register(grid_file, *args):
+    reads.append(grid_file)
+    return read_tier(grid_file, *args)
+  monkeypatch.setattr(lazy, "read_tier", read_tier_and_register)
+  return reads
+
+
+def test_lazy_entries_same_as_entries(tmp_path: Path):
+  create_dataset(tmp_path)
+
+  expected = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True))
+  result = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, lazy=True))
+
+  assert [entry.to_entry() for entry in result] == expected
+
+
+def test_lazy_entries_parse_only_accessed_grids(tmp_path: Path, monkeypatch):
+  audio_paths = create_dataset(tmp_path)
+  reads = count_reads(monkeypatch)
+
+  entries = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, lazy=True))
+  assert [entry.audio_file_abs for entry in entries] == audio_paths
+  assert [entry.speaker_name for entry in entries] == ["A"] * 3 + ["B"] * 3 + ["C"] * 3
+  assert reads == []
+
+  assert entries[4].symbols == tuple("Text B2.")
+  assert entries[4].intervals[-1] == entries[4].max_time == 1.0
+  assert entries[4].min_time == 0
+  assert reads == [audio_paths[4].with_suffix(".TextGrid")]
+
+
+def test_lazy_cache_size_limits_kept_grids(tmp_path: Path, monkeypatch):
+  create_dataset(tmp_path)
+  reads = count_reads(monkeypatch)
+  entries = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, lazy=True, lazy_cache_size=2))
+
+  for entry in (entries[0], entries[1], entries[0], entries[2], entries[0], entries[1]):
+    entry.symbols
+
+  # entries[1] was removed as least recently used when entries[2] was parsed
+  assert len(reads) == 4
+
+
+def test_lazy_cache_size_zero_parses_on_each_access(tmp_path: Path, monkeypatch):
+  create_dataset(tmp_path)
+  reads = count_reads(monkeypatch)
+  entry = next(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, lazy=True, lazy_cache_size=0))
+
+  entry.symbols
+  entry.intervals
+
+  assert len(reads) == 2
+
+
+def test_lazy_entry_with_vocabulary_and_missing_tier(tmp_path: Path):
+  audio_paths = create_dataset(tmp_path, files_per_speaker=1)
+  write_grid(audio_paths[1].with_suffix(".TextGrid"), "Text", tier_name="other")
+  vocabulary = SymbolVocabulary()
+
+  entries = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, lazy=True, vocabulary=vocabulary))
+
+  assert vocabulary.decode(entries[0].symbols) == tuple("Text A1.")
+  with pytest.raises(ValueError):
+    entries[1].symbols
+
+
+def test_lazy_and_compact_raise_error(tmp_path: Path):
+  create_dataset(tmp_path)
+
+  with pytest.raises(ValueError):
+    list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, lazy=True, compact=True))
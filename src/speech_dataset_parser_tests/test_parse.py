@@ -1,7 +1,14 @@
+import threading
+import time
 from itertools import islice
 from pathlib import Path
 
-from speech_dataset_parser import parse_dataset
+import pytest
+
+from speech_dataset_parser import (GENDER_FEMALE, GENDER_MALE, ParseSnapshot, create_speaker_filter,
+                                   parse, parse_dataset)
+from speech_dataset_parser_tests.helper import (TEST_TIER_NAME, create_dataset, create_index,
+                                                write_grid)
 
 
 def test_parse_ljs_from_local_path():
@@ -65,3 +72,261 @@ def test_parse_thchs_from_local_path():
   assert len(first_entry.symbols) == 50
   assert first_entry.intervals[:3] == (0.156, 0.312, 0.468)
   assert first_entry.symbols[:6] == ('绿', ' ', '是', ' ', '阳', '春')
+
+
+def test_parse_synthetic_dataset(tmp_path: Path):
+  audio_paths = create_dataset(tmp_path)
+  res = list(parse_dataset(tmp_path, TEST_TIER_NAME, 16, silent=True))
+
+  assert [entry.audio_file_abs for entry in res] == audio_paths
+  first_entry = res[0]
+  assert first_entry.speaker_name == "A"
+  assert first_entry.speaker_gender == 1
+  assert first_entry.symbols_language == "eng"
+  assert first_entry.speaker_accent == "North American"
+  assert first_entry.symbols == ('T', 'e', 'x', 't', ' ', 'A', '1', '.')
+  assert first_entry.min_time == 0
+  assert first_entry.max_time == 0.5
+  assert first_entry.intervals[-1] == 0.5
+  assert res[3].speaker_accent is None
+
+
+def test_parse_with_n_jobs_keeps_order(tmp_path: Path):
+  create_dataset(tmp_path, files_per_speaker=10)
+  expected = list(parse_dataset(tmp_path, TEST_TIER_NAME, 16, silent=True))
+  res = list(parse_dataset(tmp_path, TEST_TIER_NAME, 16, silent=True, n_jobs=2, chunksize=3))
+
+  assert res == expected
+
+
+def test_parse_with_n_jobs_reports_missing_tier_and_audio(tmp_path: Path, caplog):
+  create_dataset(tmp_path)
+  (tmp_path / "A;1;eng;North American" / "002.wav").unlink()
+  write_grid(tmp_path / "B;2;eng" / "001.TextGrid", "abc", tier_name="other")
+
+  res = list(parse_dataset(tmp_path, TEST_TIER_NAME, 16, silent=True, n_jobs=2))
+
+  assert len(res) == 7
+  assert "002.TextGrid: Audio file was not found. Ignored." in caplog.text
+  assert f"001.TextGrid: Tier '{TEST_TIER_NAME}' does not exist! Ignored." in caplog.text
+
+
+def test_parse_invalid_n_jobs_raises_error(tmp_path: Path):
+  with pytest.raises(ValueError):
+    list(parse_dataset(tmp_path, n_jobs=0))
+
+
+def test_parse_compact_entries(tmp_path: Path):
+  create_dataset(tmp_path)
+  expected = list(parse_dataset(tmp_path, TEST_TIER_NAME, 16, silent=True))
+
+  res = list(parse_dataset(tmp_path, TEST_TIER_NAME, 16, silent=True, compact=True))
+
+  assert [entry.to_entry() for entry in res] == expected
+  assert not hasattr(res[0], "__dict__")
+  assert res[0].speaker_dir is res[1].speaker_dir
+  assert res[0].symbols_language is res[3].symbols_language
+  assert res[0].audio_file_rel == "001.wav"
+  with pytest.raises(AttributeError):
+    res[0].speaker_name = "other"
+
+
+def test_parse_compact_entries_with_n_jobs_share_speaker_information(tmp_path: Path):
+  create_dataset(tmp_path)
+
+  res = list(parse_dataset(tmp_path, TEST_TIER_NAME, 16, silent=True, compact=True, n_jobs=2))
+
+  assert res[0].speaker_dir is res[1].speaker_dir
+  assert res[0].speaker_name is res[2].speaker_name
+
+
+@pytest.mark.parametrize("shard_by", ("speaker", "utterance"))
+def test_parse_shards_are_disjoint_and_keep_order(tmp_path: Path, shard_by: str):
+  speaker_dirs = tuple(f"S{nr};1;eng" for nr in range(8))
+  audio_paths = create_dataset(tmp_path / "dataset", files_per_speaker=4, speaker_dirs=speaker_dirs)
+
+  shards = [
+    [entry.audio_file_abs for entry in parse_dataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True,
+                                                       shard_index=shard_index, num_shards=3, shard_by=shard_by)]
+    for shard_index in range(3)
+  ]
+
+  assert sorted(path for shard in shards for path in shard) == audio_paths
+  assert all(shard == sorted(shard) for shard in shards)
+  if shard_by == "speaker":
+    speakers_per_shard = [{path.parent for path in shard} for shard in shards]
+    assert sum(len(speakers) for speakers in speakers_per_shard) == len(speaker_dirs)
+
+
+def test_parse_shard_by_speaker_does_not_scan_other_speakers(tmp_path: Path, monkeypatch):
+  speaker_dirs = tuple(f"S{nr};1;eng" for nr in range(6))
+  create_dataset(tmp_path / "dataset", files_per_speaker=2, speaker_dirs=speaker_dirs)
+  scanned = []
+  original_get_files_dicts = parse.get_files_dicts
+
+  def get_files_dicts(directory, filetypes):
+    scanned.append(directory)
+    return original_get_files_dicts(directory, filetypes)
+  monkeypatch.setattr(parse, "get_files_dicts", get_files_dicts)
+
+  result = list(parse_dataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True,
+                              shard_index=1, num_shards=2, shard_by="speaker"))
+
+  assert {entry.audio_file_abs.parent for entry in result} == set(scanned)
+  assert len(scanned) < len(speaker_dirs)
+
+
+@pytest.mark.parametrize("shard_index, num_shards, shard_by", ((2, 2, "speaker"), (0, 0, "speaker"), (0, 2, "file")))
+def test_parse_invalid_shard_parameters_raise_error(tmp_path: Path, shard_index: int, num_shards: int, shard_by: str):
+  create_dataset(tmp_path / "dataset")
+
+  with pytest.raises(ValueError):
+    list(parse_dataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True,
+                       shard_index=shard_index, num_shards=num_shards, shard_by=shard_by))
+
+
+def test_speaker_filter_skips_scanning_of_other_speakers(tmp_path: Path, monkeypatch):
+  audio_paths = create_dataset(tmp_path)
+  scanned_dirs = []
+  get_files_dicts = parse.get_files_dicts
+
+  def get_files_dicts_and_register(directory, filetypes):
+    scanned_dirs.append(directory.name)
+    return get_files_dicts(directory, filetypes)
+  monkeypatch.setattr(parse, "get_files_dicts", get_files_dicts_and_register)
+
+  entries = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True,
+                               speaker_filter=create_speaker_filter(languages={"eng"}, genders={GENDER_FEMALE})))
+
+  assert [entry.audio_file_abs for entry in entries] == audio_paths[3:6]
+  assert scanned_dirs == ["B;2;eng"]
+
+
+@pytest.mark.parametrize("kwargs, expected_speakers", (
+  ({"speaker_names": ["A", "C"]}, ["A", "C"]),
+  ({"accents": [None, "Bavarian"]}, ["B", "C"]),
+  ({"languages": ["eng"], "accents": ["North American"]}, ["A"]),
+  ({"genders": [GENDER_MALE], "languages": ["ger"]}, []),
+))
+def test_create_speaker_filter_uses_all_allow_lists(tmp_path: Path, kwargs, expected_speakers):
+  create_dataset(tmp_path, files_per_speaker=1)
+
+  entries = parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, speaker_filter=create_speaker_filter(**kwargs))
+
+  assert [entry.speaker_name for entry in entries] == expected_speakers
+
+
+def test_speaker_filter_is_combined_with_shards(tmp_path: Path):
+  create_dataset(tmp_path, files_per_speaker=1)
+  speaker_filter = create_speaker_filter(speaker_names=["A", "B"])
+
+  sharded = [
+    entry.speaker_name
+    for shard_index in range(2)
+    for entry in parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, shard_index=shard_index, num_shards=2,
+                               shard_by="speaker", speaker_filter=lambda name, info: speaker_filter(name, info))
+  ]
+
+  assert sorted(sharded) == ["A", "B"]
+
+
+def test_single_string_allow_list_raises_error():
+  with pytest.raises(ValueError):
+    create_speaker_filter(languages="eng")
+
+
+def test_parse_dataset_duration_range(tmp_path: Path):
+  audio_paths = create_dataset(tmp_path)
+
+  result = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, min_duration=0.75, max_duration=1.0))
+
+  assert [entry.audio_file_abs for entry in result] == audio_paths[1::3]
+
+
+def test_parse_dataset_only_max_duration(tmp_path: Path):
+  audio_paths = create_dataset(tmp_path)
+
+  result = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, max_duration=0.5))
+
+  assert [entry.audio_file_abs for entry in result] == audio_paths[::3]
+
+
+def test_parse_dataset_invalid_duration_range_raises_error(tmp_path: Path):
+  create_dataset(tmp_path)
+
+  for min_duration, max_duration in ((-1, None), (None, "1"), (2, 1)):
+    with pytest.raises(ValueError):
+      list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, min_duration=min_duration, max_duration=max_duration))
+  with pytest.raises(ValueError):
+    list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, max_duration=1,
+                       snapshot=ParseSnapshot(tmp_path / "snapshot.json")))
+
+
+def is_prefetch_thread_alive() -> bool:
+  return any(thread.name == "parse_dataset-prefetch" for thread in threading.enumerate())
+
+
+@pytest.mark.parametrize("kwargs", ({}, {"n_jobs": 2}, {"compact": True}, {"use_index": True}))
+def test_parse_with_prefetch_returns_same_entries(tmp_path: Path, kwargs):
+  create_dataset(tmp_path)
+  create_index(tmp_path)
+  expected = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, **kwargs))
+
+  result = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, prefetch=2, **kwargs))
+
+  assert result == expected
+  assert not is_prefetch_thread_alive()
+
+
+@pytest.mark.parametrize("kwargs", ({}, {"n_jobs": 2}, {"lazy": True}))
+def test_parse_with_prefetch_stops_thread_if_closed_early(tmp_path: Path, kwargs):
+  audio_paths = create_dataset(tmp_path)
+
+  entries = parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, prefetch=1, **kwargs)
+  result = list(islice(entries, 2))
+  assert is_prefetch_thread_alive()
+  entries.close()
+
+  assert [entry.audio_file_abs for entry in result] == audio_paths[:2]
+  assert not is_prefetch_thread_alive()
+
+
+def test_parse_with_prefetch_raises_error_of_thread(tmp_path: Path, monkeypatch):
+  create_dataset(tmp_path)
+
+  def read_tier_and_fail(grid_file_abs: Path, *args):
+    raise ValueError(grid_file_abs)
+  monkeypatch.setattr(parse, "read_tier", read_tier_and_fail)
+
+  with pytest.raises(ValueError):
+    list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, prefetch=2))
+  assert not is_prefetch_thread_alive()
+
+
+def test_parse_invalid_prefetch_raises_error(tmp_path: Path):
+  create_dataset(tmp_path)
+
+  with pytest.raises(ValueError):
+    list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, prefetch=-1))
+
+
+def test_parse_with_prefetch_and_n_jobs_bounds_sent_tasks(tmp_path: Path, monkeypatch):
+  create_dataset(tmp_path, files_per_speaker=20)
+  taken_tasks = []
+  get_tasks = parse.get_tasks
+
+  def get_tasks_and_register(*args):
+    for task in get_tasks(*args):
+      taken_tasks.append(task)
+      yield task
+  monkeypatch.setattr(parse, "get_tasks", get_tasks_and_register)
+
+  entries = parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, n_jobs=2, chunksize=1, prefetch=1)
+  next(entries)
+  time.sleep(0.5)
+  taken_count = len(taken_tasks)
+  rest = list(entries)
+
+  # taken entry, prefetched entry, entry waiting in the thread, one chunk per process and the task waiting for the pool
+  assert taken_count <= 1 + 1 + 1 + 2 + 1
+  assert len(rest) == 59
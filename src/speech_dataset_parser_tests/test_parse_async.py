@@ -0,0 +1,83 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from speech_dataset_parser.cache import ParseCache
+from speech_dataset_parser.parse import parse_dataset
+from speech_dataset_parser.parse_async import parse_dataset_async
+from speech_dataset_parser_tests.helper import (TEST_TIER_NAME, create_dataset, create_index,
+                                                write_grid)
+
+
+async def collect(directory: Path, **kwargs):
+  return [entry async for entry in parse_dataset_async(directory, TEST_TIER_NAME, silent=True, **kwargs)]
+
+
+@pytest.mark.parametrize("max_concurrency", (1, 2, 32))
+def test_ordered_same_as_parse_dataset(tmp_path: Path, max_concurrency: int):
+  create_dataset(tmp_path / "dataset", files_per_speaker=5)
+  expected = list(parse_dataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True))
+
+  result = asyncio.run(collect(tmp_path / "dataset", max_concurrency=max_concurrency))
+
+  assert result == expected
+
+
+def test_unordered_returns_all_entries(tmp_path: Path):
+  audio_paths = create_dataset(tmp_path / "dataset", files_per_speaker=5)
+
+  result = asyncio.run(collect(tmp_path / "dataset", max_concurrency=4, ordered=False))
+
+  assert sorted(entry.audio_file_abs for entry in result) == audio_paths
+
+
+def test_missing_tier_is_ignored(tmp_path: Path, caplog):
+  audio_paths = create_dataset(tmp_path / "dataset")
+  write_grid(audio_paths[2].parent / "003.TextGrid", "abc", tier_name="other")
+
+  result = asyncio.run(collect(tmp_path / "dataset"))
+
+  assert [entry.audio_file_abs for entry in result] == audio_paths[:2] + audio_paths[3:]
+  assert "Tier 'Symbols' does not exist! Ignored." in caplog.text
+
+
+def test_cache_is_used(tmp_path: Path):
+  create_dataset(tmp_path / "dataset")
+  with ParseCache(tmp_path / "cache.sqlite") as cache:
+    first = asyncio.run(collect(tmp_path / "dataset", cache=cache))
+    assert len(cache) == 9
+    second = asyncio.run(collect(tmp_path / "dataset", cache=cache))
+
+  assert first == second
+
+
+def test_closing_early_stops_parsing(tmp_path: Path):
+  create_dataset(tmp_path / "dataset", files_per_speaker=20)
+
+  async def take_two():
+    entries = parse_dataset_async(tmp_path / "dataset", TEST_TIER_NAME, silent=True, max_concurrency=4)
+    result = [await entries.__anext__(), await entries.__anext__()]
+    await entries.aclose()
+    return result
+
+  result = asyncio.run(take_two())
+
+  assert len(result) == 2
+
+
+def test_invalid_max_concurrency_raises_error(tmp_path: Path):
+  create_dataset(tmp_path / "dataset")
+
+  with pytest.raises(ValueError):
+    asyncio.run(collect(tmp_path / "dataset", max_concurrency=0))
+
+
+def test_use_index_checks_files(tmp_path: Path):
+  audio_paths = create_dataset(tmp_path / "dataset")
+  create_index(tmp_path / "dataset")
+  audio_paths[4].unlink()
+
+  result = asyncio.run(collect(tmp_path / "dataset", use_index=True, max_concurrency=3))
+
+  assert [entry.audio_file_abs for entry in result] == audio_paths[:4] + audio_paths[5:]
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from speech_dataset_parser import parse
+from speech_dataset_parser.parse import parse_dataset
+from speech_dataset_parser.scan import scan_dataset
+from speech_dataset_parser.types import GENDER_FEMALE, GENDER_MALE
+from speech_dataset_parser_tests.helper import TEST_TIER_NAME, create_dataset, create_index
+
+
+def test_scan_dataset_returns_speakers_and_files_in_parsing_order(tmp_path: Path):
+  audio_paths = create_dataset(tmp_path)
+
+  speakers = scan_dataset(tmp_path, silent=True)
+
+  assert [(speaker.speaker_dir, speaker.speaker_name, speaker.speaker_gender, speaker.symbols_language, speaker.speaker_accent) for speaker in speakers] == [
+    ("A;1;eng;North American", "A", GENDER_MALE, "eng", "North American"),
+    ("B;2;eng", "B", GENDER_FEMALE, "eng", None),
+    ("C;2;ger;Bavarian", "C", GENDER_FEMALE, "ger", "Bavarian"),
+  ]
+  assert [speaker.utterance_count for speaker in speakers] == [3, 3, 3]
+  files = [file for speaker in speakers for file in speaker.files]
+  assert [audio_file for audio_file, _ in files] == audio_paths
+  assert [grid_file for _, grid_file in files] == [audio_path.with_suffix(".TextGrid") for audio_path in audio_paths]
+
+
+def test_scan_dataset_does_not_read_grids(tmp_path: Path, monkeypatch):
+  create_dataset(tmp_path)
+
+  def fail(*args, **kwargs):
+    raise AssertionError("Grid was read!")
+  monkeypatch.setattr(parse, "read_tier", fail)
+
+  speakers = scan_dataset(tmp_path, silent=True)
+
+  assert sum(speaker.utterance_count for speaker in speakers) == 9
+
+
+def test_scan_dataset_same_files_as_parse_dataset_with_index_and_shards(tmp_path: Path):
+  create_dataset(tmp_path)
+  create_index(tmp_path)
+
+  speakers = scan_dataset(tmp_path, silent=True, use_index=True, shard_index=1, num_shards=2)
+  entries = parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, use_index=True, shard_index=1, num_shards=2)
+
+  assert [audio_file for speaker in speakers for audio_file, _ in speaker.files] == [entry.audio_file_abs for entry in entries]
@@ -0,0 +1,156 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from speech_dataset_parser import create_speaker_filter, parse
+from speech_dataset_parser.parse import parse_dataset
+from speech_dataset_parser.snapshot import ParseSnapshot
+from speech_dataset_parser_tests.helper import (TEST_SPEAKER_DIRS, TEST_TIER_NAME, create_dataset,
+                                                write_grid)
+
+
+def parse_changes(directory: Path, snapshot_path: Path):
+  snapshot = ParseSnapshot(snapshot_path)
+  entries = list(parse_dataset(directory, TEST_TIER_NAME, silent=True, snapshot=snapshot))
+  return entries, snapshot
+
+
+def test_first_run_returns_all_entries(tmp_path: Path):
+  audio_paths = create_dataset(tmp_path / "dataset")
+
+  entries, snapshot = parse_changes(tmp_path / "dataset", tmp_path / "snapshot.json")
+
+  assert [entry.audio_file_abs for entry in entries] == audio_paths
+  assert snapshot.added == audio_paths
+  assert snapshot.modified == []
+  assert snapshot.deleted == []
+  assert len(snapshot) == 9
+  assert snapshot.path.is_file()
+
+
+def test_unchanged_dataset_is_not_listed_again(tmp_path: Path, monkeypatch):
+  create_dataset(tmp_path / "dataset")
+  parse_changes(tmp_path / "dataset", tmp_path / "snapshot.json")
+
+  def fail(*args, **kwargs):
+    raise AssertionError("Speaker directory was listed!")
+  monkeypatch.setattr(parse, "get_files_dicts", fail)
+
+  entries, snapshot = parse_changes(tmp_path / "dataset", tmp_path / "snapshot.json")
+
+  assert entries == []
+  assert snapshot.added == snapshot.modified == snapshot.deleted == []
+  assert len(snapshot) == 9
+
+
+def test_added_modified_and_deleted_files_are_detected(tmp_path: Path):
+  directory = tmp_path / "dataset"
+  audio_paths = create_dataset(directory)
+  parse_changes(directory, tmp_path / "snapshot.json")
+
+  speaker_a = directory / TEST_SPEAKER_DIRS[0]
+  write_grid(speaker_a / "004.TextGrid", "New.")
+  (speaker_a / "004.wav").write_bytes(b"")
+  modified_grid = directory / TEST_SPEAKER_DIRS[1] / "002.TextGrid"
+  write_grid(modified_grid, "Changed text.")
+  stat = modified_grid.stat()
+  os.utime(modified_grid, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+  (directory / TEST_SPEAKER_DIRS[2] / "003.TextGrid").unlink()
+
+  entries, snapshot = parse_changes(directory, tmp_path / "snapshot.json")
+
+  assert [entry.audio_file_abs for entry in entries] == [speaker_a / "004.wav", audio_paths[4]]
+  assert entries[1].symbols == tuple("Changed text.")
+  assert snapshot.added == [speaker_a / "004.wav"]
+  assert snapshot.modified == [audio_paths[4]]
+  assert snapshot.deleted == [audio_paths[8]]
+  assert len(snapshot) == 9
+
+
+def test_deleted_speaker_is_reported(tmp_path: Path):
+  directory = tmp_path / "dataset"
+  audio_paths = create_dataset(directory)
+  parse_changes(directory, tmp_path / "snapshot.json")
+
+  speaker_c = directory / TEST_SPEAKER_DIRS[2]
+  for path in list(speaker_c.iterdir()):
+    path.unlink()
+  speaker_c.rmdir()
+
+  entries, snapshot = parse_changes(directory, tmp_path / "snapshot.json")
+
+  assert entries == []
+  assert snapshot.deleted == audio_paths[6:]
+
+
+def test_other_parameters_parse_all_entries(tmp_path: Path):
+  directory = tmp_path / "dataset"
+  create_dataset(directory)
+  parse_changes(directory, tmp_path / "snapshot.json")
+
+  snapshot = ParseSnapshot(tmp_path / "snapshot.json")
+  entries = list(parse_dataset(directory, TEST_TIER_NAME, n_digits=2, silent=True, snapshot=snapshot))
+
+  assert len(entries) == 9
+
+
+def test_snapshot_is_not_committed_if_stopped_early(tmp_path: Path):
+  directory = tmp_path / "dataset"
+  create_dataset(directory)
+  snapshot = ParseSnapshot(tmp_path / "snapshot.json")
+
+  entries = parse_dataset(directory, TEST_TIER_NAME, silent=True, snapshot=snapshot)
+  next(entries)
+  entries.close()
+
+  assert not snapshot.path.exists()
+  assert len(snapshot) == 0
+  entries, _ = parse_changes(directory, tmp_path / "snapshot.json")
+  assert len(entries) == 9
+
+
+def test_snapshot_and_use_index_raise_error(tmp_path: Path):
+  create_dataset(tmp_path / "dataset")
+  snapshot = ParseSnapshot(tmp_path / "snapshot.json")
+
+  with pytest.raises(ValueError):
+    list(parse_dataset(tmp_path / "dataset", TEST_TIER_NAME, silent=True, snapshot=snapshot, use_index=True))
+
+
+def test_speaker_filter_keeps_excluded_speakers(tmp_path: Path):
+  directory = tmp_path / "dataset"
+  audio_paths = create_dataset(directory)
+  parse_changes(directory, tmp_path / "snapshot.json")
+  write_grid(audio_paths[7].with_suffix(".TextGrid"), "Changed text.")
+
+  snapshot = ParseSnapshot(tmp_path / "snapshot.json")
+  speaker_filter = create_speaker_filter(languages=["eng"])
+  entries = list(parse_dataset(directory, TEST_TIER_NAME, silent=True, snapshot=snapshot, speaker_filter=speaker_filter))
+
+  assert entries == []
+  assert snapshot.added == snapshot.modified == snapshot.deleted == []
+  assert len(snapshot) == 9
+
+  entries, snapshot = parse_changes(directory, tmp_path / "snapshot.json")
+
+  assert [entry.audio_file_abs for entry in entries] == [audio_paths[7]]
+  assert snapshot.added == snapshot.deleted == []
+  assert snapshot.modified == [audio_paths[7]]
+
+
+def test_speaker_filter_on_first_run_reports_excluded_speakers_as_added_later(tmp_path: Path):
+  directory = tmp_path / "dataset"
+  audio_paths = create_dataset(directory)
+
+  snapshot = ParseSnapshot(tmp_path / "snapshot.json")
+  speaker_filter = create_speaker_filter(languages=["eng"])
+  list(parse_dataset(directory, TEST_TIER_NAME, silent=True, snapshot=snapshot, speaker_filter=speaker_filter))
+  assert snapshot.added == audio_paths[:6]
+  assert snapshot.deleted == []
+
+  entries, snapshot = parse_changes(directory, tmp_path / "snapshot.json")
+
+  assert [entry.audio_file_abs for entry in entries] == audio_paths[6:]
+  assert snapshot.added == audio_paths[6:]
+  assert snapshot.deleted == []
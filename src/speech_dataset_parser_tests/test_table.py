@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pytest
+
+from speech_dataset_parser import parse_dataset
+from speech_dataset_parser.table import EntryTable, parse_dataset_table
+from speech_dataset_parser_tests.helper import TEST_TIER_NAME, create_dataset, write_grid
+
+
+def test_rows_equal_entries(tmp_path: Path):
+  create_dataset(tmp_path)
+  write_grid(tmp_path / "B;2;eng" / "002.TextGrid", ("ab", "", "c"))
+  expected = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True))
+
+  table = parse_dataset_table(tmp_path, TEST_TIER_NAME, silent=True)
+
+  assert len(table) == len(expected)
+  assert list(table) == expected
+  assert table[-1] == expected[-1]
+  assert table.get_symbols(4) == ("ab", "", "c")
+
+
+def test_columns_are_dictionary_encoded(tmp_path: Path):
+  create_dataset(tmp_path)
+
+  table = parse_dataset_table(tmp_path, TEST_TIER_NAME, silent=True)
+
+  assert table.speaker_names.values == ["A", "B", "C"]
+  assert list(table.speaker_names.codes) == [0, 0, 0, 1, 1, 1, 2, 2, 2]
+  assert table.symbols_languages.values == ["eng", "ger"]
+  assert table.speaker_accents.values == ["North American", None, "Bavarian"]
+  assert len(table.intervals) == table.entry_offsets[-1] == len(table.symbol_ends)
+
+
+def test_index_out_of_range_raises_error(tmp_path: Path):
+  create_dataset(tmp_path)
+  table = parse_dataset_table(tmp_path, TEST_TIER_NAME, silent=True)
+
+  with pytest.raises(IndexError):
+    table[9]
+
+
+def test_append_after_access(tmp_path: Path):
+  create_dataset(tmp_path)
+  expected = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True))
+
+  table = EntryTable()
+  for entry in expected:
+    table.append(entry)
+    assert table[-1] == entry
+
+  assert list(table) == expected
+  assert table.symbols_buffer == "".join("".join(entry.symbols) for entry in expected)
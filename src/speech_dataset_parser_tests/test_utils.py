@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from speech_dataset_parser.utils import get_files_dicts
+
+
+def test_get_files_dicts(tmp_path: Path):
+  for rel_path in ["b.wav", "b.TextGrid", "a.WAV", "sub/c.wav", "sub/c.TextGrid", "sub/deeper/d.textgrid", "e.txt", ".hidden", "x.y.wav"]:
+    path = tmp_path / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("")
+  (tmp_path / "linked").symlink_to(tmp_path / "sub", target_is_directory=True)
+
+  audio_files, grid_files = get_files_dicts(tmp_path, ({".wav"}, {".TextGrid"}))
+
+  assert list(audio_files.items()) == [
+    ("a", "a.WAV"),
+    ("b", "b.wav"),
+    ("sub/c", "sub/c.wav"),
+    ("x.y", "x.y.wav"),
+  ]
+  assert list(grid_files.items()) == [
+    ("b", "b.TextGrid"),
+    ("sub/c", "sub/c.TextGrid"),
+    ("sub/deeper/d", "sub/deeper/d.textgrid"),
+  ]
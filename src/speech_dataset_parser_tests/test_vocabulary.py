@@ -0,0 +1,48 @@
+from array import array
+from pathlib import Path
+
+import pytest
+
+from speech_dataset_parser import parse_dataset
+from speech_dataset_parser.vocabulary import SymbolVocabulary
+from speech_dataset_parser_tests.helper import TEST_TIER_NAME, create_dataset
+
+
+def test_parse_with_vocabulary_returns_symbol_ids(tmp_path: Path):
+  create_dataset(tmp_path)
+  expected = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True))
+  vocabulary = SymbolVocabulary()
+
+  res = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, vocabulary=vocabulary))
+
+  assert vocabulary.symbols[:6] == ('T', 'e', 'x', 't', ' ', 'A')
+  assert res[0].symbols == array("H", [0, 1, 2, 3, 4, 5, 6, 7])
+  assert [vocabulary.decode(entry.symbols) for entry in res] == [entry.symbols for entry in expected]
+
+
+def test_parse_compact_with_vocabulary_entries_are_hashable(tmp_path: Path):
+  create_dataset(tmp_path)
+  res = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, compact=True, vocabulary=SymbolVocabulary()))
+  same = list(parse_dataset(tmp_path, TEST_TIER_NAME, silent=True, compact=True, vocabulary=SymbolVocabulary()))
+
+  assert isinstance(res[0].symbols, array)
+  assert hash(res[0]) == hash(same[0])
+  assert len(set(res + same)) == len(res)
+
+
+def test_encode_switches_to_larger_typecode():
+  vocabulary = SymbolVocabulary(str(i) for i in range(2**16))
+
+  assert vocabulary.encode(["0"]).typecode == "H"
+  assert vocabulary.encode(["new"]) == array("I", [2**16])
+  assert len(vocabulary) == 2**16 + 1
+  assert "new" in vocabulary
+
+
+def test_frozen_vocabulary_raises_error_on_unknown_symbol():
+  vocabulary = SymbolVocabulary("ab", frozen=True)
+
+  assert vocabulary.encode("ba") == array("H", [1, 0])
+  with pytest.raises(ValueError):
+    vocabulary.encode("abc")
+  assert len(vocabulary) == 2